@@ -22,6 +22,7 @@ import sys
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 import csv
+from collections import deque
 from datetime import datetime, timedelta
 
 # Extend import path so CTC can load sibling packages
@@ -37,9 +38,12 @@ LINE_SPEED_LIMIT_MPS = BLOCK_LEN_M / BLOCK_TRAVEL_TIME_S  # ≈ 7.14 m/s
 # ------------------------------------------------------------
 # Core dependencies
 # ------------------------------------------------------------
-from universal.global_clock import clock
+from universal.block_bits import iter_bits
+from universal.controller_registry import controller_registry
+from universal.global_clock import SimPhase, clock
 
 # Track Model
+from trackModel.layout_cache import load_layout
 from trackModel.track_model_backend import TrackNetwork, TrackSwitch
 
 # Train
@@ -334,6 +338,68 @@ class ScheduleManager:
 # ------------------------------------------------------------
 # TrackState — the CTC backend interface
 # ------------------------------------------------------------
+class RoutingIndex:
+    """Shortest block paths over one routing state of the track graph.
+
+    The graph follows each segment's next, diverging and previous links, so
+    it only changes when the layout changes, a switch moves or a block is
+    closed/opened. The index is tagged with that state (``key``) and keeps
+    one BFS parent tree per start block, built the first time the block is
+    routed from, so a path is rebuilt in O(path length).
+
+    Attributes:
+        key: (topology_version, routing_version) the index was built for.
+        yard_block: Block of the "Yard" station, or None.
+    """
+
+    def __init__(self, segments: Dict, key: Tuple[int, int]):
+        self.key = key
+        self.yard_block = next(
+            (b for b, seg in segments.items()
+             if (getattr(seg, "station_name", "") or "").lower() == "yard"),
+            None,
+        )
+        self._neighbors: Dict[int, Tuple[int, ...]] = {}
+        for b, seg in segments.items():
+            neighbors = []
+            if seg.next_segment:
+                neighbors.append(seg.next_segment.block_id)
+            if getattr(seg, "diverging_segment", None):
+                neighbors.append(seg.diverging_segment.block_id)
+            if getattr(seg, "previous_segment", None):
+                neighbors.append(seg.previous_segment.block_id)
+            # Do not allow yard-as-0 to ever enter the search
+            self._neighbors[b] = tuple(63 if nb == 0 else nb for nb in neighbors)
+        self._parents: Dict[int, Dict[int, Optional[int]]] = {}
+
+    def path(self, start_block: int, dest_block: int) -> List[int]:
+        """Return the fewest-blocks path from start to dest, or []."""
+        if start_block == dest_block:
+            return [start_block]
+        parents = self._parents.get(start_block)
+        if parents is None:
+            parents = self._parents[start_block] = self._search(start_block)
+        if dest_block not in parents:
+            return []
+        path = [dest_block]
+        while path[-1] != start_block:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def _search(self, start_block: int) -> Dict[int, Optional[int]]:
+        """BFS from start_block; returns block -> parent for reached blocks."""
+        parents: Dict[int, Optional[int]] = {start_block: None}
+        queue = deque([start_block])
+        while queue:
+            block = queue.popleft()
+            for nb in self._neighbors.get(block, ()):
+                if nb not in parents:
+                    parents[nb] = block
+                    queue.append(nb)
+        return parents
+
+
 class TrackState:
     """Centralized Traffic Control (CTC) backend state manager.
 
@@ -352,13 +418,16 @@ class TrackState:
     (e.g., "Green Line" or "Red Line").
     """
 
-    def __init__(self, line_name: str = "Green Line",  network: TrackNetwork = None):
+    def __init__(self, line_name: str = "Green Line",  network: TrackNetwork = None,
+                 live_link: bool = True):
         """Initialize full CTC backend state for a single transit line.
 
     Args:
         line_name: Human-readable line name ("Green Line", "Red Line").
         network: Optional pre-built TrackNetwork. If None, the track
             layout CSV for the line is loaded automatically.
+        live_link: Start the controllers' background polling. Headless
+            runs pass False and tick the controllers themselves.
 
     Behavior:
         - Loads the TrackModel (physical layout and segments).
@@ -380,6 +449,7 @@ class TrackState:
         if network is not None:
             self.track_model = network
             self.section_map = self._load_section_letters()
+            self._assign_territories()
             print(f"[CTC Backend] Using provided TrackNetwork for {network.line_name}")
         else:
             self.track_model = TrackNetwork()
@@ -395,43 +465,32 @@ class TrackState:
 
                 print(f"[CTC Backend] Loaded track layout from {layout_path}")
                
-                all_blocks = sorted(self.track_model.segments.keys())
-
-                if self.line_name == "Green Line":
-                    # Original mapping (confirmed)
-                    self.sw_ranges = set(list(range(1, 63)) + list(range(122, 151)))
-                    self.hw_ranges = set(all_blocks) - self.sw_ranges
-
-                elif self.line_name == "Red Line":
-                    # From your controller team: SW = 1–32
-                    self.sw_ranges = set(range(1, 33))
-                    self.hw_ranges = set(all_blocks) - self.sw_ranges
-
-                else:
-                    # Fallback for unknown lines
-                    mid = len(all_blocks) // 2
-                    self.sw_ranges = set(all_blocks[:mid])
-                    self.hw_ranges = set(all_blocks[mid:])
+                self._assign_territories()
 
             except Exception as e:
                 print(f"[CTC Backend] Warning: failed to load layout → {e}")
 
         self._train_destinations: Dict[str, int] = {}
+        self._routing: Optional[RoutingIndex] = None
 
-        #Build Track Controller backend and link both sides
-        self.track_controller = TrackControllerBackend(self.track_model, line_name)
+        #Get (or build) the line's Track Controller backends and link both sides.
+        #The registry reuses controllers main.py already made for this network.
+        self.track_controller = controller_registry.get_or_create(
+            self.track_model, line_name, "SW", TrackControllerBackend)
         self.track_controller.set_ctc_backend(self)  # Enables CTC ←→ Controller communication
-        self.track_controller.start_live_link(poll_interval=1.0)
+        if live_link:
+            controller_registry.start(self.track_controller, poll_interval=1.0)
 
-        #Build Track Controller HW backend and link both times 
-        self.track_controller_hw = HardwareTrackControllerBackend(self.track_model, line_name)
+        self.track_controller_hw = controller_registry.get_or_create(
+            self.track_model, line_name, "HW", HardwareTrackControllerBackend)
         self.track_controller_hw.set_ctc_backend(self)
-        self.track_controller_hw.start_live_link(poll_interval=1.0)
+        if live_link:
+            controller_registry.start(self.track_controller_hw, poll_interval=1.0)
         self.passenger_throughput_hour = 0
         self._last_throughput_reset = clock.get_time()
 
         #Register Track Model as a clock listener (optional redundancy)
-        clock.register_listener(self.track_model.set_time)
+        clock.register_phase(SimPhase.PHYSICS, self.track_model.on_sim_step)
 
         #CTC operation mode
         self.mode = "manual"
@@ -449,6 +508,12 @@ class TrackState:
         #UI mirror of blocks
         self._lines: Dict[str, List[Block]] = {}
         self._by_key: Dict[str, Block] = {}
+        # Packed occupancy last copied into the UI mirror, and the block
+        # list / (routing, topology) versions it was copied under
+        self._last_block_occupancy: Optional[int] = None
+        self._mirror_blocks: Optional[List[Block]] = None
+        self._mirror_versions: Optional[Tuple] = None
+        self._mirror_by_id: Dict[int, Block] = {}
 
         self.set_line(line_name)
         self.schedule = ScheduleManager()
@@ -458,6 +523,26 @@ class TrackState:
 
         print(f"[CTC Backend] Initialized for {self.line_name}")
 
+    def _assign_territories(self):
+        """Split the line's blocks into SW (sw_ranges) and HW (hw_ranges)."""
+        all_blocks = sorted(self.track_model.segments.keys())
+
+        if self.line_name == "Green Line":
+            # Original mapping (confirmed)
+            self.sw_ranges = set(list(range(1, 63)) + list(range(122, 151)))
+            self.hw_ranges = set(all_blocks) - self.sw_ranges
+
+        elif self.line_name == "Red Line":
+            # From your controller team: SW = 1–32
+            self.sw_ranges = set(range(1, 33))
+            self.hw_ranges = set(all_blocks) - self.sw_ranges
+
+        else:
+            # Fallback for unknown lines
+            mid = len(all_blocks) // 2
+            self.sw_ranges = set(all_blocks[:mid])
+            self.hw_ranges = set(all_blocks[mid:])
+
     def set_mode(self, mode: str):
         """Set CTC operation mode.
 
@@ -638,6 +723,9 @@ class TrackState:
         • Avoids re-introducing block 0 into the graph.
         • Handles switches by adding diverging paths to the BFS queue.
 
+    Searches are cached in a RoutingIndex until the layout, a switch
+    position or a block closure changes.
+
     Args:
         start_block: Block where the train begins.
         dest_block: Block the train is trying to reach.
@@ -646,66 +734,27 @@ class TrackState:
         A list of block IDs forming a valid path, or an empty list if
         no route exists.
     """
-        from collections import deque
-        
-        yard_block = None
-        for b, seg in self.track_model.segments.items():
-            if hasattr(seg, "station_name") and seg.station_name and seg.station_name.lower() == "yard":
-                yard_block = b
-                break
+        routing = self.routing_index()
 
         # Map block 0 → yard only if yard exists
-        if start_block == 0 and yard_block is not None:
-            start_block = yard_block
-        if dest_block == 0 and yard_block is not None:
-            dest_block = yard_block
-
-        
-        tm = self.track_model.segments
-        visited = set()
-        queue = deque([(start_block, [start_block])])
+        if start_block == 0 and routing.yard_block is not None:
+            start_block = routing.yard_block
+        if dest_block == 0 and routing.yard_block is not None:
+            dest_block = routing.yard_block
 
-        while queue:
-            block, path = queue.popleft()
-            if block == dest_block:
-                return path
-
-            if block in visited:
-                continue
-            visited.add(block)
+        return routing.path(start_block, dest_block)
 
-            seg = tm.get(block)
-            if not seg:
-                continue
-
-            neighbors = []
-
-            # Straight next
-            if seg.next_segment:
-                neighbors.append(seg.next_segment.block_id)
-
-            # Diverging path (switch)
-            if hasattr(seg, "diverging_segment") and seg.diverging_segment:
-                neighbors.append(seg.diverging_segment.block_id)
+    def routing_index(self) -> RoutingIndex:
+        """Return the RoutingIndex for the current track graph.
 
-            # Previous (reverse direction)
-            if hasattr(seg, "previous_segment") and seg.previous_segment:
-                neighbors.append(seg.previous_segment.block_id)
-
-            for nb in neighbors:
-                # 🔥 Do not allow yard-as-0 to ever enter the BFS
-                if nb == 0:
-                    nb = 63
-
-                if nb not in visited:
-                    queue.append((nb, path + [nb]))
-
-
-            
-
-        
-
-        return []  # no path found
+    Rebuilt when the TrackModel's topology_version or routing_version
+    (switch moves, block closures) changes.
+    """
+        key = (self.track_model.topology_version,
+               self.track_model.routing_version)
+        if self._routing is None or self._routing.key != key:
+            self._routing = RoutingIndex(self.track_model.segments, key)
+        return self._routing
 
     def schedule_manual_dispatch(self, train_id, start_block, dest_block,
                                 departure_seconds, speed_mph, auth_yd):
@@ -752,27 +801,22 @@ class TrackState:
         section_map = {}
 
         # Path to the same CSV TrackNetwork loads
-        layout_file = f"{self.line_name.lower().replace(' ', '_')}.csv"
-        layout_path = os.path.join(
-            os.path.dirname(__file__),
-            "..", "trackModel", layout_file
-        )
-        layout_path = os.path.abspath(layout_path)
-
-        import csv
-        with open(layout_path, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                name = row.get("name", "").strip()  # e.g. "A1", "B4", "C12"
-                if not name:
-                    continue
-
-                # Extract section: letters only
-                section = "".join([c for c in name if c.isalpha()])
-                # block_id stored separately
-                block_id = int(row["block_id"])
+        layout_path = getattr(self.track_model, "layout_file", None)
+        if layout_path is None:
+            layout_file = f"{self.line_name.lower().replace(' ', '_')}.csv"
+            layout_path = os.path.join(
+                os.path.dirname(__file__),
+                "..", "trackModel", layout_file
+            )
+            layout_path = os.path.abspath(layout_path)
+        if not os.path.exists(layout_path):
+            # hand-built network with no layout file: no section letters
+            return section_map
 
-                section_map[block_id] = section
+        # Compiled once per CSV and shared with TrackNetwork.load_track_layout
+        for block_id, name in load_layout(layout_path).section_names().items():
+            # Extract section: letters only, e.g. "A1" → "A"
+            section_map[block_id] = "".join([c for c in name if c.isalpha()])
 
         return section_map
 
@@ -840,6 +884,42 @@ class TrackState:
         self._lines[name] = blocks
         self._rebuild_index()
 
+    def _sync_block_mirror(self):
+        """Copy TrackModel occupancy and closures into the UI blocks.
+
+    Only blocks whose bit differs between the network's packed occupancy
+    and the copy taken last tick (one XOR) are revisited. A new block list,
+    or any closure / switch change (routing_version), refreshes every row.
+    """
+        blocks = self._lines[self.line_name]
+        segments = self.track_model.segments
+        occupancy = getattr(self.track_model, "occupancy_bits", None)
+        versions = (
+            getattr(self.track_model, "routing_version", None),
+            getattr(self.track_model, "topology_version", None),
+        )
+
+        if (occupancy is None or self._last_block_occupancy is None
+                or blocks is not self._mirror_blocks
+                or versions != self._mirror_versions):
+            self._mirror_by_id = {b.block_id: b for b in blocks}
+            targets = blocks
+        else:
+            changed = occupancy ^ self._last_block_occupancy
+            targets = [self._mirror_by_id[b] for b in iter_bits(changed)
+                       if b in self._mirror_by_id]
+
+        for ui_block in targets:
+            tm_segment = segments.get(ui_block.block_id)
+            if tm_segment:
+                ui_block.set_occupancy(tm_segment.occupied)
+                if tm_segment.closed:
+                    ui_block.status = "closed"
+
+        self._last_block_occupancy = occupancy
+        self._mirror_blocks = blocks
+        self._mirror_versions = versions
+
     def _rebuild_index(self):
         """Rebuild the lookup table mapping section+block_id → Block.
 
@@ -938,8 +1018,10 @@ class TrackState:
             print(f"[CTC] Maintenance toggle failed: {e}")
             # NEW: When block is reopened, recalc pending train suggestions
         # --- When a block is reopened, resume any train waiting before it ---
+        # (only trains on a block directly upstream can be waiting for it)
         if not closed:
-            for train_id, train in self.track_model.trains.items():
+            for _, train in self.track_model.trains_upstream(block_id, 1):
+                train_id = train.train_id
                 seg = train.current_segment
                 if not seg:
                     continue
@@ -1068,11 +1150,13 @@ class TrackState:
         return self.passenger_throughput_hour
   
     def update_block_occupancy(self, line_name, block_id, occupied):
-        """Apply occupancy changes reported by wayside controllers.
+        """Accept occupancy changes reported by wayside controllers.
 
-        Updates the TrackModel block state as well as the UI-facing mirrored
-        Block object. Occupancy updates for other lines are ignored because
-        a TrackState instance manages exactly one line.
+        The TrackNetwork's packed occupancy vector is the single source of
+        truth, so nothing is copied here; the UI-facing Block objects pick
+        the change up from it on the next tick (see _sync_block_mirror).
+        Occupancy updates for other lines are ignored because a TrackState
+        instance manages exactly one line.
 
         Args:
             line_name: Name of line sending the update.
@@ -1082,19 +1166,6 @@ class TrackState:
         if line_name != self.line_name:
             return
 
-        try:
-            block = self.track_model.get_block(block_id)
-        except Exception:
-            return
-
-        block.occupied = occupied
-
-        if block_id in self._by_key:
-            self._by_key[block_id].occupied = occupied
-
-        # Save last occupancy (for dwell timing etc.)
-        self._last_block_occupancy[block_id] = occupied
-
     def update_signal_state(self, line_name, block_id, signal_state):
         """Apply signal state updates for switch blocks.
 
@@ -1147,7 +1218,7 @@ class TrackState:
         total_passengers = 0
 
         # count boardings OR exits at all stations
-        for block_id, seg in self.track_model.segments.items():
+        for seg in self.track_model.stations():
             if hasattr(seg, "station_name"):
                 # Option A: use boarded passengers
                 total_passengers += seg.passengers_boarded_total
@@ -1206,15 +1277,15 @@ class TrackState:
         
         # If user typed 'Yard', find the yard dynamically
         if station_name.lower() == "yard":
-            for block, seg in self.track_model.segments.items():
+            for seg in self.track_model.stations():
                 if hasattr(seg, "station_name") and seg.station_name and seg.station_name.lower() == "yard":
-                    return block
+                    return seg.block_id
             return None
 
-        for block, seg in self.track_model.segments.items():
+        for seg in self.track_model.stations():
             if hasattr(seg, "station_name"):
                 if seg.station_name.lower().replace(" ", "") == station_name.lower().replace(" ", ""):
-                    return block
+                    return seg.block_id
 
         return None
 
@@ -1239,22 +1310,18 @@ class TrackState:
         line_blocks = sorted(self.track_model.segments.keys())
 
         
-        speed_map = {bid: 0.0 for bid in line_blocks}
-        auth_map  = {bid: 0.0 for bid in line_blocks}
+        suggestions = {bid: (0.0, 0.0) for bid in line_blocks}
 
         
         for train_id, (speed, auth) in self._train_suggestions.items():
-            train = self.track_model.trains.get(train_id)
-            if not train or not train.current_segment:
+            block_id = self.track_model.get_train_block(train_id)
+            if block_id is None:
                 continue
-            block = train.current_segment.block_id
-            speed_map[block] = speed
-            auth_map[block] = auth
+            suggestions[block_id] = (speed, auth)
 
-        
-        for bid in line_blocks:
-            self.track_controller.receive_ctc_suggestion(bid, speed_map[bid], auth_map[bid])
-            self.track_controller_hw.receive_ctc_suggestion(bid, speed_map[bid], auth_map[bid])
+        # One batch per controller; each applies only the changed blocks
+        self.track_controller.receive_ctc_suggestions_bulk(suggestions)
+        self.track_controller_hw.receive_ctc_suggestions_bulk(suggestions)
 
     def tick_all_modules(self):
         """Advance the entire CTC system by one simulation tick.
@@ -1292,9 +1359,18 @@ class TrackState:
         Notes:
             This loop is the heartbeat of the entire CTC simulation.
             Every subsystem depends on this method being called once per
-            frame/tick in the UI.
+            frame/tick in the UI. With several lines, LineTickCoordinator
+            calls begin_tick()/finish_tick() for each line around a single
+            clock.tick() instead.
+        """
+        self.begin_tick()
+        self.finish_tick(clock.tick())
+
+    def begin_tick(self):
+        """First half of a tick, before the clock advances.
+
+        Spawns the scheduled trains whose departure time has arrived.
         """
-            
         current_seconds = clock.get_seconds_since_midnight()
 
         to_dispatch = []
@@ -1317,8 +1393,16 @@ class TrackState:
         if not hasattr(self, "_last_time"):
             self._last_time = clock.get_time()
 
+    def finish_tick(self, current_time):
+        """Second half of a tick, once the clock reads `current_time`.
+
+        Updates this line's Track Model, controllers, occupancy mirror,
+        throughput and (in manual mode) train suggestions. Touches only
+        this line's objects, so different lines can finish in parallel.
+        """
+        if not hasattr(self, "_last_time"):
+            self._last_time = current_time
         prev_time = self._last_time
-        current_time = clock.tick()
         self._last_time = current_time
 
         delta_s = (current_time - prev_time).total_seconds()
@@ -1343,13 +1427,7 @@ class TrackState:
 
        
         try:
-            blocks = self._lines[self.line_name]
-            for ui_block in blocks:
-                tm_segment = self.track_model.segments.get(ui_block.block_id)
-                if tm_segment:
-                    ui_block.set_occupancy(tm_segment.occupied)
-                    if tm_segment.closed:
-                        ui_block.status = "closed"
+            self._sync_block_mirror()
         except Exception as e:
             print(f"[CTC] Occupancy sync error: {e}")
         
@@ -1359,6 +1437,7 @@ class TrackState:
             print("[CTC] Throughput update error:", e)
 
         if self.mode == "manual":
+            push_suggestions = False
             for train_id, (speed_mps, auth_m) in list(self._train_suggestions.items()):
 
                
@@ -1489,6 +1568,10 @@ class TrackState:
                 print(f"[CTC] Suggestion → Train {train_id} in block {block}: "
                     f"{speed_mps:.2f} m/s, {new_auth:.1f} m authority")
                 
+                push_suggestions = True
+
+            # One full-line push per tick rather than one per train
+            if push_suggestions:
                 self.push_full_block_suggestions()
 
     def reset_all(self):
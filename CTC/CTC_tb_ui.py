@@ -2,6 +2,7 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 from .CTC_backend import TrackState
 from universal.global_clock import clock
+from universal.refresh_bus import refresh_bus
 
 
 # Keep UI-side constants in sync with backend policy for display/convert
@@ -298,6 +299,7 @@ class CTCWindow(QtWidgets.QMainWindow):
         layout.addWidget(self.tabs, stretch=2)
 
         # === Simulation Timer ===
+        refresh_bus.start()
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self._tick)
         self.timer.start(1000)   # 1s per tick
@@ -697,6 +699,9 @@ class CTCWindow(QtWidgets.QMainWindow):
     # ---------- simulation tick ----------
     def _tick(self):
         self.state.stub_tick()
+        refresh_bus.mark_dirty(self._refresh_views)
+
+    def _refresh_views(self):
         self._reload_line(self.state.line_name)
         self.clockLabel.setText(f"Sim Time: {clock.get_time_string()}")
 
@@ -9,14 +9,19 @@
         • Global simulation clock controls
 
     The UI communicates directly with TrackState, which manages the CTC backend,
-    TrackModel, and TrackControllers. The UI refreshes at a rate determined by
-    the global simulation clock speed.
+    TrackModel, and TrackControllers. The simulation is stepped by a
+    TimeWarpEngine worker at the global clock's speed; the UI repaints at its
+    own frame rate from the refresh bus.
     """
 
 from PyQt6 import QtWidgets, QtCore, QtGui
 from CTC_backend import TrackState
+from line_coordinator import LineTickCoordinator
+from block_table_model import BlockTableModel
 from universal.global_clock import clock
-from trackModel.track_model_backend import TrackSwitch
+from universal.refresh_bus import refresh_bus
+from universal.time_warp import TimeWarpEngine
+from universal.controller_registry import poller
 import datetime
 
 
@@ -127,11 +132,10 @@ class CTCWindow(QtWidgets.QMainWindow):
         selectorRow.addStretch(1)
         occLayout.addLayout(selectorRow)
 
-        self.mapTable = QtWidgets.QTableWidget(0, 9)
-        self.mapTable.setHorizontalHeaderLabels([
-            "Section", "Block", "Status", "Station", "Station Side",
-            "Switch", "Signal Light", "Crossing", "Speed Limit"
-        ])
+        # model keeps rendered rows and only redraws blocks that changed
+        self.blockModel = BlockTableModel(parent=self)
+        self.mapTable = QtWidgets.QTableView()
+        self.mapTable.setModel(self.blockModel)
         self.mapTable.verticalHeader().setVisible(False)
         self.mapTable.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
         self.mapTable.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
@@ -185,9 +189,13 @@ class CTCWindow(QtWidgets.QMainWindow):
 
         layout.addWidget(self.tabs, stretch=2)
 
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._tick)
-        self.timer.start(1000)  #
+        refresh_bus.start()
+        # every line ticks each step, not just the one on screen
+        self.coordinator = LineTickCoordinator(self.backend_by_line)
+        self.warp = TimeWarpEngine(self._tick)
+        poller.lock = self.warp.lock    # wayside polls never run mid-step
+        self.warp.add_frame_listener(refresh_bus.listener(self._refresh_views))
+        self.warp.start()
 
         self._apply_clock_speed()
 
@@ -212,28 +220,21 @@ class CTCWindow(QtWidgets.QMainWindow):
             self.mode_toggle_button.setText("Auto Mode (Active)")
             self.mode_toggle_button.setStyleSheet("background-color: lightblue; font-weight: bold;")
 
-        self.state.set_mode(self.mode)
+        with self.warp.lock:
+            self.state.set_mode(self.mode)
         self.dispatchBtn.setEnabled(self.mode == "manual")
         self.uploadBtn.setEnabled(self.mode == "auto")
        
         print(f"[CTC UI] Switched to {self.mode.upper()} mode.")
 
     def _apply_clock_speed(self):
-        """Update UI timer interval according to simulation speed.
+        """Report the new simulation speed.
 
-        The global simulation clock multiplier determines how often the UI should
-        call _tick(). Faster simulation ⇒ shorter UI timer intervals.
-
-        Ensures a minimum interval of 10ms to avoid UI overload.
+        The TimeWarpEngine reads clock.time_multiplier every frame, so the
+        new speed is already in effect; the UI repaint rate does not change.
         """
-
-       
-        multiplier = max(0.1, clock.time_multiplier)
-
-        interval_ms = max(10, int(1000 / multiplier))  # min 10ms to stay safe
-
-        self.timer.start(interval_ms)
-        print(f"[UI] Timer interval set to {interval_ms} ms (speed={multiplier}×)")
+        multiplier = self.warp.requested_warp
+        print(f"[UI] Simulation speed set to {multiplier}×")
 
     def _reload_line(self, line_name: str):
         """Reload block table and backend reference when a new line is selected.
@@ -243,80 +244,19 @@ class CTCWindow(QtWidgets.QMainWindow):
 
         Behavior:
             • Switches self.state to the chosen backend
-            • Reconstructs & repopulates the occupancy table
-            • Updates switch position, signals, crossings, and metadata
+            • Repopulates the occupancy table on a line change; otherwise
+              only redraws rows whose occupancy, switch position or
+              signals changed since the last refresh
             • Refreshes train info table if currently displayed
         """
         
        
         self.state = self.backend_by_line[line_name]
+        if self.blockModel.state is not self.state:
+            self.blockModel.set_state(self.state)
+        else:
+            self.blockModel.refresh()
 
-        
-        blocks = self.state.get_blocks()
-        self.mapTable.setRowCount(len(blocks))
-
-       
-        for r, b in enumerate(blocks):
-            seg = self.state.track_model.segments.get(b.block_id)
-
-           
-            if isinstance(seg, TrackSwitch):
-                switch_text = "Straight" if seg.current_position == 0 else "Diverging"
-            else:
-                switch_text = ""
-
-            rowdata = [
-                b.section,
-                b.block_id,
-                b.status,
-                b.station,
-                b.station_side,
-                switch_text,
-                "--",
-                ("Yes" if b.crossing else ""),
-                f"{b.speed_limit:.0f} mph"
-            ]
-
-            for c, value in enumerate(rowdata):
-                item = QtWidgets.QTableWidgetItem(str(value))
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-
-               
-                if c == 2:  # Status column
-                    if b.status == "occupied":
-                        item.setBackground(QtGui.QColor("#2ecc71"))  # green
-                        item.setForeground(QtGui.QColor("black"))
-                    elif b.status == "unoccupied":
-                        item.setBackground(QtGui.QColor("#e74c3c"))  # red
-                        item.setForeground(QtGui.QColor("white"))
-                    elif b.status == "closed":
-                        item.setBackground(QtGui.QColor("gray"))
-                        item.setForeground(QtGui.QColor("white"))
-
-                
-                if c == 6:
-                    if isinstance(seg, TrackSwitch):
-                        prev_sig = seg.previous_signal_state.name
-                        straight_sig = seg.straight_signal_state.name
-                        diverging_sig = seg.diverging_signal_state.name
-                        text = f"P:{prev_sig}  S:{straight_sig}  D:{diverging_sig}"
-                        item.setText(text)
-
-                        if "RED" in [prev_sig, straight_sig, diverging_sig]:
-                            item.setBackground(QtGui.QColor("#b00020"))
-                            item.setForeground(QtGui.QColor("white"))
-                        elif "YELLOW" in [prev_sig, straight_sig, diverging_sig]:
-                            item.setBackground(QtGui.QColor("#d7b600"))
-                            item.setForeground(QtGui.QColor("black"))
-                        else:
-                            item.setBackground(QtGui.QColor("#1b5e20"))
-                            item.setForeground(QtGui.QColor("white"))
-                    else:
-                        item.setText("")
-
-                self.mapTable.setItem(r, c, item)
-
-       
         if self._trainInfoPage and self.actionArea.currentWidget() is self._trainInfoPage:
             self._populate_train_info_table()
 
@@ -412,7 +352,8 @@ class CTCWindow(QtWidgets.QMainWindow):
             auth_yd = auth_m / 0.9144
 
           
-            self.state.dispatch_train(train_id, start_block, dest_block, speed_mph, auth_yd)
+            with self.warp.lock:
+                self.state.dispatch_train(train_id, start_block, dest_block, speed_mph, auth_yd)
 
 
             QtWidgets.QMessageBox.information(
@@ -534,14 +475,15 @@ class CTCWindow(QtWidgets.QMainWindow):
             dep_dt = midnight + datetime.timedelta(seconds=departure_seconds)
             departure_time_str = dep_dt.strftime("%H:%M:%S")
 
-            self.state.schedule_manual_dispatch(
-                train_id,
-                start_block,
-                dest_block,
-                departure_seconds,
-                speed_mph,
-                auth_yd
-            )
+            with self.warp.lock:
+                self.state.schedule_manual_dispatch(
+                    train_id,
+                    start_block,
+                    dest_block,
+                    departure_seconds,
+                    speed_mph,
+                    auth_yd
+                )
 
             QtWidgets.QMessageBox.information(
                 self, "Scheduled Train Added",
@@ -590,16 +532,16 @@ class CTCWindow(QtWidgets.QMainWindow):
         self.maintBtn.setEnabled(enabled)
 
     def _pause_sim(self):
-        """Pause simulation clock and UI updates."""
+        """Pause simulation stepping."""
         print("[UI] Simulation paused")
-        self.timer.stop()
+        self.warp.pause()
         clock.running = False
 
     def _resume_sim(self):
-        """Resume simulation clock and restart periodic UI timer."""
+        """Resume simulation stepping at the current speed."""
         print("[UI] Simulation resumed")
         clock.running = True
-        self.timer.start(1000)
+        self.warp.resume()
 
     def _train_info(self):
         """Open the Train Information panel displaying live telemetry.
@@ -630,9 +572,15 @@ class CTCWindow(QtWidgets.QMainWindow):
         self.actionArea.setCurrentWidget(page)
         self._populate_train_info_table()
 
-    def _populate_train_info_table(self):
-        """Fill the Train Information table with latest data from TrackState."""
-        trains = self.state.get_trains()
+    def _populate_train_info_table(self, trains=None):
+        """Fill the Train Information table with latest data from TrackState.
+
+        Args:
+            trains: Rows from TrackState.get_trains() already read by the
+                caller; read now if None.
+        """
+        if trains is None:
+            trains = self.state.get_trains()
         self.trainInfoTable.setRowCount(len(trains))
 
         for r, t in enumerate(trains):
@@ -722,12 +670,12 @@ class CTCWindow(QtWidgets.QMainWindow):
             )
             return
 
-        row = self.mapTable.currentRow()
+        row = self.mapTable.currentIndex().row()
         if row < 0:
             QtWidgets.QMessageBox.warning(self, "No Selection", "Select a block first.")
             return
 
-        blk_id = int(self.mapTable.item(row, 1).text())
+        blk_id = self.blockModel.block_id_at(row)
 
        
         seg = self.state.track_model.segments.get(blk_id)
@@ -779,7 +727,8 @@ class CTCWindow(QtWidgets.QMainWindow):
 
         if ok:
             closed = "Closed" in choice
-            self.state.set_block_closed(blk_id, closed)
+            with self.warp.lock:
+                self.state.set_block_closed(blk_id, closed)
             self._reload_line(self.state.line_name)
 
     def _upload_schedule(self):
@@ -837,39 +786,73 @@ class CTCWindow(QtWidgets.QMainWindow):
             return
 
         print(f"[UI] Loading schedule CSV: {filepath}")
-        self.state.schedule.load_route_csv(filepath, self.state)
+        with self.warp.lock:
+            self.state.schedule.load_route_csv(filepath, self.state)
         self._refresh_schedule_table()
 
+    def closeEvent(self, event):
+        """Stop the simulation worker and the line coordinator on close."""
+        self.warp.stop()
+        self.coordinator.close()
+        super().closeEvent(event)
+
     def _tick(self):
         
-        """Main UI tick — called once per timer interval.
+        """One simulation step — run by the TimeWarpEngine worker.
 
     Responsibilities:
-        • Advance backend logic via TrackState.tick_all_modules()
-        • Update simulation time label
-        • Update throughput label
-        • Refresh block table
-        • Refresh train info panel (if visible)
+        • Advance every line's TrackState through the LineTickCoordinator
+          (the UI only shows the selected one)
+
+    Views are refreshed separately, once per UI frame, whatever the speed.
     """
         try:
         
-            self.state.tick_all_modules()
-               
-            self.clockLabel.setText(f"Sim Time: {clock.get_time_string()}")
-
-            throughput = self.state.get_throughput_per_hour()
-            self.throughputLabel.setText(
-                f"Throughput: {throughput} passengers/hour"
-            )
+            self.coordinator.step()
 
-            self._reload_line(self.state.line_name)
-            if self._trainInfoPage and self.actionArea.currentWidget() is self._trainInfoPage:
-                self._populate_train_info_table()
+        except Exception as e:
+            print(f"[CTC UI] Tick error: {e}")
 
-            self.clockLabel.setText(f"Sim Time: {clock.get_time_string()}")
+    def _refresh_views(self):
+        """Redraw the time/throughput labels, block table and train panel.
 
+        Only copying the data out holds the simulation lock; the widgets
+        are updated after it is released, so the worker doesn't wait on
+        the repaint.
+        """
+        try:
+            with self.warp.lock:
+                frame = self._sample_views()
+            self._draw_views(frame)
         except Exception as e:
-            print(f"[CTC UI] Tick error: {e}")
+            print(f"[CTC UI] Refresh error: {e}")
+
+    def _sample_views(self):
+        """Copy what _draw_views shows out of the simulation (lock held)."""
+        show_trains = (self._trainInfoPage is not None and
+                       self.actionArea.currentWidget() is self._trainInfoPage)
+        return {
+            "time": clock.get_time_string(),
+            "throughput": self.state.get_throughput_per_hour(),
+            "all_lines": self.coordinator.throughput_per_hour(),
+            "blocks": self.blockModel.collect(self.state),
+            "trains": self.state.get_trains() if show_trains else None,
+        }
+
+    def _draw_views(self, frame):
+        """Show a frame from _sample_views (lock released)."""
+        stats = self.warp.stats()
+        self.clockLabel.setText(
+            f"Sim Time: {frame['time']}  "
+            f"(speed {stats['achieved_warp']:.1f}× of {stats['requested_warp']:.1f}×)"
+        )
+        self.throughputLabel.setText(
+            f"Throughput: {frame['throughput']} passengers/hour  "
+            f"(all lines: {frame['all_lines']})"
+        )
+        self.blockModel.apply(frame["blocks"])
+        if frame["trains"] is not None:
+            self._populate_train_info_table(frame["trains"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,260 @@
+"""Qt table model for the CTC block occupancy table.
+
+CTCWindow used to rebuild its QTableWidget on every refresh: setRowCount,
+nine new QTableWidgetItems per block, the status/signal colours and an
+isinstance(seg, TrackSwitch) check for every row. BlockTableModel keeps
+each row's rendered cells between refreshes and only re-renders the
+blocks TrackNetwork reports as changed since the status version it last
+saw (occupancy, closures, switch positions and signal aspects all bump
+it), emitting dataChanged for the rows whose cells actually differ. A
+refresh with nothing changed costs one version check.
+
+Reading the simulation (collect) and touching Qt (apply) are separate
+steps, so a caller can hold the simulation lock for the first only.
+
+This file is formatted per Google Python Style Guide.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+
+from trackModel.track_model_backend import TrackSwitch
+
+COLUMNS = ["Section", "Block", "Status", "Station", "Station Side",
+           "Switch", "Signal Light", "Crossing", "Speed Limit"]
+
+# (text, background, foreground); colours are QColor names or None
+Cell = Tuple[str, Optional[str], Optional[str]]
+
+_STATUS_COLOURS = {
+    "occupied": ("#2ecc71", "black"),
+    "unoccupied": ("#e74c3c", "white"),
+    "closed": ("gray", "white"),
+}
+
+
+def _signal_cell(seg: TrackSwitch) -> Cell:
+    """Signal Light cell for a switch: all three aspects, worst colour."""
+    aspects = (seg.previous_signal_state.name,
+               seg.straight_signal_state.name,
+               seg.diverging_signal_state.name)
+    text = f"P:{aspects[0]}  S:{aspects[1]}  D:{aspects[2]}"
+    if "RED" in aspects:
+        return text, "#b00020", "white"
+    if "YELLOW" in aspects:
+        return text, "#d7b600", "black"
+    return text, "#1b5e20", "white"
+
+
+def format_block_row(block: Any, seg: Any) -> List[Cell]:
+    """Render one CTC Block (and its Track Model segment) as table cells.
+
+    Args:
+        block: The CTC Block mirror.
+        seg: The TrackNetwork segment with the same block ID, or None.
+
+    Returns:
+        One Cell per COLUMNS entry.
+    """
+    is_switch = isinstance(seg, TrackSwitch)
+    switch_text = ""
+    if is_switch:
+        switch_text = "Straight" if seg.current_position == 0 else "Diverging"
+    # same rule as TrackState._sync_block_mirror, read from the segment so
+    # a row re-rendered before the next mirror sync isn't left stale
+    status = block.status
+    if seg is not None:
+        status = "closed" if seg.closed else (
+            "occupied" if seg.occupied else "unoccupied")
+    background, foreground = _STATUS_COLOURS.get(status, (None, None))
+    return [
+        (str(block.section), None, None),
+        (str(block.block_id), None, None),
+        (status, background, foreground),
+        (str(block.station), None, None),
+        (str(block.station_side), None, None),
+        (switch_text, None, None),
+        _signal_cell(seg) if is_switch else ("", None, None),
+        ("Yes" if block.crossing else "", None, None),
+        (f"{block.speed_limit:.0f} mph", None, None),
+    ]
+
+
+@dataclass
+class BlockTableUpdate:
+    """Rows read from the simulation by collect(), not yet shown.
+
+    Attributes:
+        state: TrackState the rows belong to.
+        version: Network status_version the rows were read at.
+        rows: (row, cells) for each re-rendered block row.
+        reset: Rebuild the whole table; `rows` then covers every block.
+        key: Layout key of a reset.
+        blocks: Block list of a reset.
+    """
+    state: Any
+    version: int
+    rows: List[Tuple[int, List[Cell]]]
+    reset: bool = False
+    key: Any = None
+    blocks: Optional[List[Any]] = None
+
+
+class BlockTableModel(QAbstractTableModel):
+    """Block rows for one CTC TrackState, refreshed per changed block."""
+
+    def __init__(self, state=None, parent=None):
+        """Initialize the model.
+
+        Args:
+            state: The TrackState whose line to display (optional).
+            parent: Parent QObject (optional).
+        """
+        super().__init__(parent)
+        self._state = None
+        self._blocks: List[Any] = []
+        self._key = None
+        self._version = 0
+        self._row_of: Dict[int, int] = {}
+        self._rows: List[List[Cell]] = []
+        if state is not None:
+            self.set_state(state)
+
+    # ---- Qt model interface ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        text, background, foreground = self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.BackgroundRole and background is not None:
+            return QColor(background)
+        if role == Qt.ItemDataRole.ForegroundRole and foreground is not None:
+            return QColor(foreground)
+        return None
+
+    def headerData(self, section, orientation,
+                   role=Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole and
+                orientation == Qt.Orientation.Horizontal):
+            return COLUMNS[section]
+        return None
+
+    # ---- updates ----
+    @property
+    def state(self):
+        """The TrackState being displayed."""
+        return self._state
+
+    def block_id_at(self, row: int) -> Optional[int]:
+        """Block ID shown in `row`, or None if out of range."""
+        if 0 <= row < len(self._blocks):
+            return self._blocks[row].block_id
+        return None
+
+    def set_state(self, state) -> None:
+        """Show a (possibly different) line, rebuilding every row.
+
+        Args:
+            state: The TrackState to display.
+        """
+        self.apply(self._collect_reset(state))
+
+    def refresh(self) -> int:
+        """Bring the model up to date with its TrackState.
+
+        Returns:
+            Number of rows whose display changed (-1 after a full rebuild).
+        """
+        return self.apply(self.collect())
+
+    def collect(self, state=None) -> Optional[BlockTableUpdate]:
+        """Read what the next refresh needs from the simulation.
+
+        Rebuilds everything if the line, its block list or topology
+        changed, otherwise re-renders only the blocks changed since the
+        status version the model last saw. Does no Qt work, so it is the
+        only part that needs the simulation locked.
+
+        Args:
+            state: TrackState to show; defaults to the current one.
+
+        Returns:
+            An update for apply(), or None if nothing changed.
+        """
+        state = state if state is not None else self._state
+        if state is None:
+            return None
+        if state is not self._state or self._key != self._layout_key(state):
+            return self._collect_reset(state)
+        network = state.track_model
+        if network.status_version == self._version:
+            return None
+        version, changes = network.get_changes_since(self._version)
+        segments = network.segments
+        rows = []
+        for block_id in changes:
+            row = self._row_of.get(block_id)
+            if row is not None:
+                rows.append((row, format_block_row(self._blocks[row],
+                                                   segments.get(block_id))))
+        return BlockTableUpdate(state, version, rows)
+
+    def apply(self, update: Optional[BlockTableUpdate]) -> int:
+        """Show an update from collect().
+
+        Returns:
+            Number of rows whose display changed (-1 after a full rebuild).
+        """
+        if update is None:
+            return 0
+        if update.reset:
+            self.beginResetModel()
+            self._state = update.state
+            self._key = update.key
+            self._version = update.version
+            self._blocks = update.blocks
+            self._row_of = {b.block_id: row
+                            for row, b in enumerate(self._blocks)}
+            self._rows = [cells for _, cells in update.rows]
+            self.endResetModel()
+            return -1
+
+        self._version = update.version
+        changed = 0
+        last_col = len(COLUMNS) - 1
+        for row, cells in update.rows:
+            if cells == self._rows[row]:
+                continue
+            self._rows[row] = cells
+            changed += 1
+            self.dataChanged.emit(self.index(row, 0),
+                                  self.index(row, last_col))
+        return changed
+
+    def _collect_reset(self, state) -> BlockTableUpdate:
+        network = state.track_model
+        blocks = list(state.get_blocks())
+        segments = network.segments
+        rows = [(row, format_block_row(b, segments.get(b.block_id)))
+                for row, b in enumerate(blocks)]
+        return BlockTableUpdate(state, network.status_version, rows,
+                                reset=True, key=self._layout_key(state),
+                                blocks=blocks)
+
+    def _layout_key(self, state=None):
+        state = state if state is not None else self._state
+        network = state.track_model
+        return (id(state.get_blocks()), network.topology_version,
+                len(network.segments))
@@ -0,0 +1,353 @@
+"""Checkpoint and restore of a running simulation.
+
+A checkpoint holds the mutable state of one CTC ``TrackState`` and
+everything it owns: the TrackNetwork (per-block occupancy, failures,
+switches, crossings, stations and passengers), every Train and its
+TrainModelBackend, both wayside controllers, the CTC's suggestions, dwell
+timers and schedule, and the global clock time.
+
+Layout, PLC programs and callbacks are not saved. A checkpoint is
+restored in place onto a stack built for the same line and layout, which
+is what makes it cheap: a restore is a few thousand attribute writes, not
+a CSV load. Restoring a rush-hour checkpoint therefore replaces a replay
+from the start of the day.
+
+File format: a 16-byte header (magic, format version, payload CRC-32,
+payload length) followed by a zlib-compressed pickle of plain values.
+Loading only resolves datetime types and the repo's own enums and
+dataclasses, so a checkpoint cannot name arbitrary classes.
+
+Example:
+    data = save_checkpoint(sim.state)
+    ...
+    restore_checkpoint(sim.state, data)
+
+This file is formatted per Google Python Style Guide.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import enum
+import io
+import pickle
+import struct
+import sys
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from universal.block_bits import BlockBits, BlockBitsOverlay, iter_bits
+from universal.global_clock import GlobalClock, clock
+
+CHECKPOINT_MAGIC = b"TCKP"
+CHECKPOINT_VERSION = 1
+HEADER = struct.Struct("!4sHxxII")
+
+_PRIMITIVES = (type(None), bool, int, float, str, bytes,
+               datetime.datetime, datetime.date, datetime.timedelta)
+
+# Modules checkpoints may name classes from (enums and dataclasses only).
+_PROJECT_PACKAGES = ("CTC", "trackModel", "trainModel", "trackControllerSW",
+                     "trackControllerHW", "universal")
+
+# Wiring between modules; an empty list or None here is not state either.
+_ALWAYS_SKIP = frozenset({"_listeners", "_subscribers", "ctc_backend",
+                          "track_model", "network"})
+
+# Attributes that are caches, thread flags or wiring rather than state.
+_SKIP = {
+    "TrackState": {"_by_key", "_mirror_blocks", "_mirror_versions",
+                   "_mirror_by_id", "_last_block_occupancy",
+                   "on_train_created"},
+    "TrackNetwork": {"_dirty_version", "_segment_versions", "_status_cache",
+                     "_status_cache_topology", "_snapshot", "_segment_table",
+                     "layout_file", "topology_version", "routing_version",
+                     "status_version", "_train_keys", "_trains_by_block",
+                     "_train_blocks", "_predecessors", "_upstream_cache",
+                     "_upstream_topology"},
+    "controller": {"_event_feed", "_event_feed_synced", "_territory_index",
+                   "_territory_key", "_live_thread_running",
+                   "_guard_thread_running"},
+    "Train": set(),
+    "TrainModelBackend": {"_row", "_clock_driven"},
+    "segment": set(),
+}
+
+_CLOCK_FIELDS = ("current_time", "_step_count")
+
+
+class CheckpointError(ValueError):
+    """Raised for checkpoints that cannot be read or don't fit the target."""
+
+
+def _is_plain(value: Any) -> bool:
+    """Whether `value` is made only of primitives, enums and dataclasses."""
+    if isinstance(value, (_PRIMITIVES, enum.Enum)):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(_is_plain(k) and _is_plain(v) for k, v in value.items())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return all(_is_plain(getattr(value, f.name))
+                   for f in dataclasses.fields(value))
+    return False
+
+
+def _attributes(obj: Any) -> Iterator[tuple]:
+    """(name, value) of every instance attribute, __slots__ included."""
+    if hasattr(obj, "__dict__"):
+        yield from vars(obj).items()
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if hasattr(obj, name):
+                yield name, getattr(obj, name)
+
+
+def _capture(obj: Any, skip: Iterable[str]) -> Dict[str, Any]:
+    """Plain instance attributes of `obj`, BlockBits as (known, bits).
+
+    A BlockBitsOverlay is a view of the network's occupancy, which is
+    saved with the network; only its overrides are kept, in the same form.
+    """
+    skip = _ALWAYS_SKIP.union(skip)
+    fields: Dict[str, Any] = {}
+    bits: Dict[str, tuple] = {}
+    for name, value in _attributes(obj):
+        if name in skip:
+            continue
+        if isinstance(value, BlockBits):
+            bits[name] = (value.known, value.bits)
+        elif isinstance(value, BlockBitsOverlay):
+            bits[name] = (value.overridden, value.bits & value.overridden)
+        elif _is_plain(value):
+            fields[name] = value
+    return {"fields": fields, "bits": bits}
+
+
+def _apply(obj: Any, captured: Dict[str, Any]) -> None:
+    """Write back what _capture() took; BlockBits are updated in place."""
+    for name, value in captured["fields"].items():
+        setattr(obj, name, value)
+    for name, (known, bits) in captured["bits"].items():
+        current = getattr(obj, name, None)
+        if isinstance(current, BlockBitsOverlay):
+            # restored after the network, so only real overrides stick
+            current.release(-1)
+            for block_id in iter_bits(known):
+                current[block_id] = bool(bits >> block_id & 1)
+            continue
+        if not isinstance(current, BlockBits):
+            current = BlockBits()
+            setattr(obj, name, current)
+        current.known = known
+        current.bits = bits
+
+
+def _layout_key(network: Any) -> int:
+    """CRC of the block IDs and segment types, to catch a wrong layout."""
+    key = ";".join(f"{block_id}:{type(seg).__name__}"
+                   for block_id, seg in sorted(network.segments.items()))
+    return zlib.crc32(key.encode("utf-8"))
+
+
+def _capture_train(train: Any) -> Dict[str, Any]:
+    tm = train.tm
+    fleet = tm._fleet
+    columns = {name: getattr(tm, name)
+               for name in fleet._FLOAT_COLUMNS + fleet._FLAG_COLUMNS}
+    segment = train.current_segment
+    return {
+        "train_id": train.train_id,
+        "block_id": segment.block_id if segment is not None else None,
+        "train": _capture(train, _SKIP["Train"]),
+        "backend": _capture(tm, _SKIP["TrainModelBackend"]),
+        "columns": columns,
+    }
+
+
+def _restore_trains(network: Any, saved: list) -> None:
+    from trainModel.train_model_backend import Train
+
+    wanted = {entry["train_id"] for entry in saved}
+    for train_id in [t for t in network.trains if t not in wanted]:
+        network.remove_train(train_id)
+
+    for entry in saved:
+        train = network.trains.get(entry["train_id"])
+        if train is None:
+            train = Train(entry["train_id"])
+            network.add_train(train)
+        block_id = entry["block_id"]
+        train.current_segment = (network.segments[block_id]
+                                 if block_id is not None else None)
+        _apply(train, entry["train"])
+        _apply(train.tm, entry["backend"])
+        for name, value in entry["columns"].items():
+            setattr(train.tm, name, value)
+    network.reindex_trains()
+
+
+def _capture_state(state: Any, sim_clock: Optional[GlobalClock] = None
+                  ) -> Dict[str, Any]:
+    """Collect the checkpointed state of a TrackState as plain values.
+
+    Args:
+        state: The CTC TrackState owning the stack.
+        sim_clock: Clock to record (defaults to the shared clock).
+
+    Returns:
+        A dict of plain values; see save_checkpoint() for the bytes form.
+    """
+    sim_clock = sim_clock if sim_clock is not None else clock
+    network = state.track_model
+    return {
+        "line_name": state.line_name,
+        "layout": _layout_key(network),
+        "clock": {name: getattr(sim_clock, name) for name in _CLOCK_FIELDS},
+        "ctc": _capture(state, _SKIP["TrackState"]),
+        "schedule": _capture(state.schedule, ()),
+        "sw": _capture(state.track_controller, _SKIP["controller"]),
+        "hw": _capture(state.track_controller_hw, _SKIP["controller"]),
+        "network": _capture(network, _SKIP["TrackNetwork"]),
+        "segments": {block_id: _capture(seg, _SKIP["segment"])
+                     for block_id, seg in network.segments.items()},
+        "trains": [_capture_train(t) for t in network.trains.values()],
+    }
+
+
+def _apply_state(state: Any, saved: Dict[str, Any],
+                sim_clock: Optional[GlobalClock] = None) -> None:
+    """Restore what _capture_state() collected onto a live TrackState.
+
+    Args:
+        state: TrackState built for the same line and layout.
+        saved: Result of _capture_state().
+        sim_clock: Clock to rewind (defaults to the shared clock).
+
+    Raises:
+        CheckpointError: If the line or the layout differs.
+    """
+    sim_clock = sim_clock if sim_clock is not None else clock
+    network = state.track_model
+    if saved["line_name"] != state.line_name:
+        raise CheckpointError(
+            f"checkpoint is for {saved['line_name']!r}, not {state.line_name!r}")
+    if saved["layout"] != _layout_key(network):
+        raise CheckpointError("checkpoint was taken on a different track layout")
+
+    for name, value in saved["clock"].items():
+        setattr(sim_clock, name, value)
+
+    _apply(network, saved["network"])
+    for block_id, captured in saved["segments"].items():
+        _apply(network.segments[block_id], captured)
+    _restore_trains(network, saved["trains"])
+    network.refresh_status()
+
+    for controller, key in ((state.track_controller, "sw"),
+                            (state.track_controller_hw, "hw")):
+        # the controller's known-state maps come back matching the restored
+        # segments, so its event feed stays in sync without a full re-poll
+        _apply(controller, saved[key])
+        engine = getattr(controller, "_plc_engine", None)
+        if engine is not None:
+            engine.invalidate()
+
+    _apply(state.schedule, saved["schedule"])
+    _apply(state, saved["ctc"])
+    state._last_block_occupancy = None
+    if state.line_name in state._lines:
+        state._rebuild_index()
+
+
+def save_checkpoint(state: Any, path: Optional[str] = None,
+                    sim_clock: Optional[GlobalClock] = None) -> bytes:
+    """Serialize a running simulation.
+
+    Args:
+        state: The CTC TrackState owning the stack.
+        path: Optional file to write the checkpoint to as well.
+        sim_clock: Clock to record (defaults to the shared clock).
+
+    Returns:
+        The checkpoint bytes.
+    """
+    payload = zlib.compress(
+        pickle.dumps(_capture_state(state, sim_clock), pickle.HIGHEST_PROTOCOL))
+    data = HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION,
+                       zlib.crc32(payload), len(payload)) + payload
+    if path is not None:
+        with open(path, "wb") as f:
+            f.write(data)
+    return data
+
+
+def restore_checkpoint(state: Any, data: bytes | str,
+                       sim_clock: Optional[GlobalClock] = None) -> None:
+    """Restore a checkpoint onto a TrackState built for the same layout.
+
+    Args:
+        state: The CTC TrackState owning the stack.
+        data: Checkpoint bytes, or the path of a checkpoint file.
+        sim_clock: Clock to rewind (defaults to the shared clock).
+
+    Raises:
+        CheckpointError: If the checkpoint is corrupt, from another format
+            version, or for a different line or layout.
+    """
+    if isinstance(data, str):
+        with open(data, "rb") as f:
+            data = f.read()
+    _apply_state(state, load_checkpoint(data), sim_clock)
+
+
+def load_checkpoint(data: bytes) -> Dict[str, Any]:
+    """Decode checkpoint bytes into the dict _capture_state() returned.
+
+    Raises:
+        CheckpointError: If the checkpoint is corrupt or from another
+            format version.
+    """
+    if len(data) < HEADER.size:
+        raise CheckpointError("checkpoint is truncated")
+    magic, version, crc, length = HEADER.unpack_from(data)
+    if magic != CHECKPOINT_MAGIC:
+        raise CheckpointError("not a simulation checkpoint")
+    if version != CHECKPOINT_VERSION:
+        raise CheckpointError(
+            f"checkpoint format {version} is not supported "
+            f"(expected {CHECKPOINT_VERSION})")
+    payload = data[HEADER.size:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise CheckpointError("checkpoint is corrupt")
+    try:
+        return _Unpickler(io.BytesIO(zlib.decompress(payload))).load()
+    except (pickle.UnpicklingError, zlib.error, EOFError) as e:
+        raise CheckpointError(f"checkpoint is corrupt: {e}") from e
+
+
+class _Unpickler(pickle.Unpickler):
+    """Only resolves datetime types and project enums/dataclasses.
+
+    A class is looked up by its short module name among already imported
+    modules, so a checkpoint written where a module was imported as
+    ``CTC_backend`` loads where it is ``CTC.CTC_backend`` and vice versa.
+    """
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == "datetime" and name in ("datetime", "date", "timedelta"):
+            return getattr(datetime, name)
+        short = module.rsplit(".", 1)[-1]
+        for mod_name, mod in list(sys.modules.items()):
+            if mod is None or mod_name.rsplit(".", 1)[-1] != short:
+                continue
+            root = mod_name.split(".", 1)[0]
+            if root not in _PROJECT_PACKAGES and mod_name != short:
+                continue
+            cls = getattr(mod, name, None)
+            if isinstance(cls, type) and (issubclass(cls, enum.Enum)
+                                          or dataclasses.is_dataclass(cls)):
+                return cls
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a checkpoint")
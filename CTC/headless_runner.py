@@ -0,0 +1,269 @@
+"""Headless batch runner for the full train control simulation.
+
+Builds the same backend stack as ``main.py`` — TrackNetwork, the SW and HW
+wayside controllers, the CTC TrackState and N dispatched trains — without
+importing PyQt6, then drives the global clock as fast as the CPU allows.
+Intended for overnight soak runs and capacity studies on machines without a
+display.
+
+Example:
+    python CTC/headless_runner.py --line "Green Line" --trains 5 --minutes 60
+
+Pass ``--checkpoint PATH`` to save the state at the end of a run and
+``--restore PATH`` to start a later run from it (see CTC/checkpoint.py).
+
+This file is formatted per Google Python Style Guide.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from universal.controller_registry import controller_registry
+from universal.global_clock import clock
+from trackModel.track_model_backend import TrackNetwork, TrackSwitch
+from CTC.CTC_backend import TrackState
+from CTC.checkpoint import restore_checkpoint, save_checkpoint
+
+MPS_TO_MPH = 2.23693629
+M_TO_YD = 1 / 0.9144
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default PLC programs shipped with each wayside module, keyed by line colour.
+SW_PLC_TEMPLATE = os.path.join(_ROOT, "trackControllerSW", "PLC files", "plc_{}_test.py")
+HW_PLC_TEMPLATE = os.path.join(_ROOT, "trackControllerHW", "PLC", "plc_{}.py")
+
+
+@dataclass
+class HeadlessRunReport:
+    """Summary of one headless run.
+
+    Attributes:
+        line_name: Line that was simulated.
+        trains: Number of trains dispatched.
+        ticks: Number of simulation steps executed.
+        sim_seconds: Simulated time covered by the run.
+        wall_seconds: Real time the run took.
+        sim_seconds_per_wall_second: Achieved simulation speed.
+    """
+    line_name: str
+    trains: int
+    ticks: int
+    sim_seconds: float
+    wall_seconds: float
+    sim_seconds_per_wall_second: float
+
+
+class HeadlessSimulation:
+    """Full simulation stack for one line, driven without a Qt event loop.
+
+    The CTC ``TrackState`` owns the SW/HW controllers and the TrackModel. Their
+    background polling is never started so that each step is driven
+    deterministically from ``TrackState.tick_all_modules``, exactly as the
+    ``CTCWindow`` timer does in the UI build.
+    """
+
+    def __init__(self, line_name: str = "Green Line",
+                 network: Optional[TrackNetwork] = None,
+                 cruise_power_kw: float = 120.0) -> None:
+        """Build the backend stack for a line.
+
+        Args:
+            line_name: Line to simulate ("Green Line", "Red Line", ...).
+            network: Optional pre-built TrackNetwork. If None, TrackState loads
+                the layout CSV for the line.
+            cruise_power_kw: Power applied by the stand-in driver while a train
+                is below its commanded speed.
+        """
+        self.line_name = line_name
+        self.cruise_power_kw = cruise_power_kw
+
+        self.state = TrackState(line_name, network, live_link=False)
+        self.network = self.state.track_model
+        self.network.line_name = line_name
+
+        # Headless runs tick the controllers from tick_all_modules only;
+        # a network passed in may already be polled by someone else.
+        self.state.track_controller.stop_live_link()
+        self.state.track_controller_hw.stop_live_link()
+        # The live link's first poll used to land here, before the PLCs;
+        # do it explicitly so every run starts from the same view.
+        self.state.track_controller._poll_track_model()
+        self.state.track_controller_hw._poll_track_model()
+        self._upload_default_plcs()
+
+        self.ticks = 0
+
+    def close(self) -> None:
+        """Detach the stack from the shared clock.
+
+        Removes every train, unregisters the network's physics step and
+        releases its wayside controllers, so several simulations can be
+        built one after another in one process (e.g. by the scaling
+        benchmark) without the old ones still ticking.
+        """
+        for train_id in list(self.network.trains):
+            self.network.remove_train(train_id)
+        clock.unregister_phase(self.network.on_sim_step)
+        controller_registry.release(self.network)
+
+    def _upload_default_plcs(self) -> None:
+        """Load the line's default PLC program into both wayside controllers.
+
+        Without a PLC the controllers never turn CTC suggestions into
+        commanded speed/authority, so trains would stay parked.
+        """
+        colour = self.line_name.split()[0].lower()
+        for ctrl, template in (
+            (self.state.track_controller, SW_PLC_TEMPLATE),
+            (self.state.track_controller_hw, HW_PLC_TEMPLATE),
+        ):
+            path = template.format(colour)
+            if not os.path.exists(path):
+                continue
+            ctrl.set_maintenance_mode(True)
+            try:
+                ctrl.upload_plc(path)
+            finally:
+                ctrl.set_maintenance_mode(False)
+
+    def dispatch_trains(self, count: int, route_blocks: int = 10) -> List[str]:
+        """Dispatch trains spread evenly along the line.
+
+        Each train is sent ``route_blocks`` blocks downstream of its start
+        block, using the CTC's own speed/authority suggestions.
+
+        Args:
+            count: Number of trains to dispatch.
+            route_blocks: Blocks between each train's start and destination.
+
+        Returns:
+            The IDs of the dispatched trains.
+        """
+        candidates = [
+            bid for bid, seg in sorted(self.network.segments.items())
+            if bid != 0  # yard
+            and not isinstance(seg, TrackSwitch) and seg.next_segment is not None
+        ]
+        if count <= 0 or not candidates:
+            return []
+
+        stride = max(1, len(candidates) // count)
+        train_ids: List[str] = []
+        for i in range(count):
+            start_block = candidates[(i * stride) % len(candidates)]
+            dest_block = self._downstream_block(start_block, route_blocks)
+            speed_mps, auth_m = self.state.compute_suggestions(start_block, dest_block)
+
+            train_id = f"T{i + 1}"
+            self.state.dispatch_train(train_id, start_block, dest_block,
+                                      speed_mps * MPS_TO_MPH, auth_m * M_TO_YD)
+            if train_id in self.network.trains:
+                train_ids.append(train_id)
+        return train_ids
+
+    def _downstream_block(self, block_id: int, hops: int) -> int:
+        """Return the block reached by following next_segment ``hops`` times."""
+        seg = self.network.segments[block_id]
+        for _ in range(hops):
+            nxt = seg.get_next_segment()
+            if nxt is None:
+                break
+            seg = nxt
+        return seg.block_id
+
+    def _drive_trains(self) -> None:
+        """Stand-in for the train controller: cruise up to commanded speed."""
+        for train in self.network.trains.values():
+            tm = train.tm
+            if tm.authority_m > 0.0 and tm.velocity < tm.commanded_speed:
+                tm.power_kw = self.cruise_power_kw
+                tm.service_brake = False
+            else:
+                tm.power_kw = 0.0
+                tm.service_brake = tm.velocity > tm.commanded_speed
+
+    def step(self) -> None:
+        """Advance the whole stack by one simulation tick."""
+        self._drive_trains()
+        self.state.tick_all_modules()
+        self.ticks += 1
+
+    def run(self, sim_seconds: float, quiet: bool = True) -> HeadlessRunReport:
+        """Run until ``sim_seconds`` of simulated time have elapsed.
+
+        Args:
+            sim_seconds: Simulated time to cover.
+            quiet: Discard the backends' console output while running.
+
+        Returns:
+            A HeadlessRunReport with the achieved simulation speed.
+        """
+        start_sim = clock.get_time()
+        start_ticks = self.ticks
+        start_wall = time.perf_counter()
+
+        with contextlib.ExitStack() as stack:
+            if quiet:
+                devnull = stack.enter_context(open(os.devnull, "w"))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+            while (clock.get_time() - start_sim).total_seconds() < sim_seconds:
+                self.step()
+
+        wall = time.perf_counter() - start_wall
+        sim = (clock.get_time() - start_sim).total_seconds()
+        return HeadlessRunReport(
+            line_name=self.line_name,
+            trains=len(self.network.trains),
+            ticks=self.ticks - start_ticks,
+            sim_seconds=sim,
+            wall_seconds=wall,
+            sim_seconds_per_wall_second=sim / wall if wall > 0 else float("inf"),
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, object]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run the simulation headlessly.")
+    parser.add_argument("--line", default="Green Line", help="line to simulate")
+    parser.add_argument("--trains", type=int, default=2, help="trains to dispatch")
+    parser.add_argument("--minutes", type=float, default=10.0,
+                        help="simulated minutes to run")
+    parser.add_argument("--verbose", action="store_true",
+                        help="keep backend console output")
+    parser.add_argument("--restore", metavar="PATH",
+                        help="start from a checkpoint instead of dispatching")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="write a checkpoint at the end of the run")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        sim = HeadlessSimulation(args.line)
+        if args.restore:
+            restore_checkpoint(sim.state, args.restore)
+        else:
+            sim.dispatch_trains(args.trains)
+
+    report = sim.run(args.minutes * 60.0, quiet=not args.verbose)
+    if args.checkpoint:
+        save_checkpoint(sim.state, args.checkpoint)
+    print(f"[Headless] {report.line_name}: {report.trains} trains, "
+          f"{report.sim_seconds:.0f} sim-s in {report.wall_seconds:.2f} wall-s "
+          f"→ {report.sim_seconds_per_wall_second:.1f} sim-s/wall-s")
+    return asdict(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Advances every line's CTC TrackState on each simulation step.
+
+``TrackState.tick_all_modules`` ticks the global clock and then one line,
+so a UI that only ticked the selected line left every other line stalled
+while the shared clock kept moving. LineTickCoordinator runs each step as
+
+    1. begin_tick() for every line (scheduled dispatches), in order,
+    2. clock.tick() once, which also runs the registered train physics,
+    3. finish_tick(now) for every line, in order,
+
+then collects per-line timings and errors for the UI. By default the
+lines finish one after another on the calling thread. ``workers > 1``
+finishes them on a thread pool instead. That is opt-in only: under the
+GIL it gains nothing measurable, and the lines share the wayside
+poller/controller registry, refresh_bus and stdout, so a pool makes
+their interleaving nondeterministic.
+
+Example:
+    coordinator = LineTickCoordinator(backend_by_line)
+    engine = TimeWarpEngine(coordinator.step)
+
+This file is formatted per Google Python Style Guide.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from universal.global_clock import clock
+
+
+@dataclass
+class LineTickResult:
+    """Outcome of one line's finish_tick() in one step.
+
+    Attributes:
+        seconds: Wall time the line took.
+        error: The exception it raised, if any.
+    """
+    seconds: float
+    error: Optional[BaseException] = None
+
+
+class LineTickCoordinator:
+    """Ticks every TrackState in `backend_by_line` once per step.
+
+    Attributes:
+        backend_by_line: Line name -> TrackState, as given to CTCWindow.
+        workers: Threads used for finish_tick(); 1 runs lines serially
+            on the calling thread.
+        last_results: Per-line results of the most recent step.
+        last_step_seconds: Wall time of the most recent step.
+    """
+
+    def __init__(self, backend_by_line: Mapping[str, Any],
+                 workers: int = 1) -> None:
+        """Set up the coordinator.
+
+        Args:
+            backend_by_line: Line name -> TrackState.
+            workers: Worker threads for finish_tick(); the default of 1
+                finishes lines serially. Call close() when using more.
+        """
+        self.backend_by_line = backend_by_line
+        self.workers = max(1, workers)
+        self.last_results: Dict[str, LineTickResult] = {}
+        self.last_step_seconds = 0.0
+        self._steps = 0
+        self._totals: Dict[str, float] = {}
+        self._max: Dict[str, float] = {}
+        self._errors: Dict[str, int] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _finish(self, line_name: str, state: Any,
+                now: Any) -> LineTickResult:
+        start = time.perf_counter()
+        error = None
+        try:
+            state.finish_tick(now)
+        except Exception as e:
+            error = e
+            print(f"[CTC] {line_name} tick error: {e}")
+        return LineTickResult(time.perf_counter() - start, error)
+
+    def step(self) -> Dict[str, LineTickResult]:
+        """Advance the clock one tick and every line with it.
+
+        Returns:
+            Line name -> LineTickResult for this step.
+        """
+        start = time.perf_counter()
+        lines = list(self.backend_by_line.items())
+        for line_name, state in lines:
+            try:
+                state.begin_tick()
+            except Exception as e:
+                print(f"[CTC] {line_name} dispatch error: {e}")
+
+        now = clock.tick()
+
+        if self.workers == 1 or len(lines) < 2:
+            results = {name: self._finish(name, state, now)
+                       for name, state in lines}
+        else:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="CTCLine")
+            futures = {name: self._pool.submit(self._finish, name, state, now)
+                       for name, state in lines}
+            results = {name: f.result() for name, f in futures.items()}
+
+        self._record(results)
+        self.last_step_seconds = time.perf_counter() - start
+        return results
+
+    def _record(self, results: Dict[str, LineTickResult]) -> None:
+        self._steps += 1
+        for name, result in results.items():
+            self._totals[name] = self._totals.get(name, 0.0) + result.seconds
+            self._max[name] = max(self._max.get(name, 0.0), result.seconds)
+            if result.error is not None:
+                self._errors[name] = self._errors.get(name, 0) + 1
+        self.last_results = results
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-line mean/max finish_tick() cost (ms) and error count."""
+        steps = max(1, self._steps)
+        return {
+            name: {
+                "mean_ms": total * 1000 / steps,
+                "max_ms": self._max[name] * 1000,
+                "errors": self._errors.get(name, 0),
+            }
+            for name, total in self._totals.items()
+        }
+
+    def throughput_per_hour(self) -> int:
+        """Passengers per hour summed over every line."""
+        return sum(state.get_throughput_per_hour()
+                   for state in self.backend_by_line.values())
+
+    def close(self) -> None:
+        """Shut the worker threads down."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -0,0 +1,202 @@
+"""Scaling benchmark suite on synthetic networks of increasing size.
+
+For each network size a layout is generated with
+trackModel/layout_generator.py, loaded, and the full headless stack (CTC,
+SW/HW wayside controllers, trains) is built on it. Each benchmark is then
+timed over a number of rounds, pytest-benchmark style (min / median /
+mean / max per call):
+
+    load_track_layout_cold    first load of the CSV (parse + compile)
+    load_track_layout         load from the compiled layout cache
+    get_network_status        full status dict, one block changed per round
+    find_path                 CTC routing between seeded random blocks
+    controller_poll           SW + HW wayside poll and status push
+    tick_all_modules          one full simulation tick with trains running
+
+Results are printed as a table, one row per (benchmark, size), and can be
+written as JSON for comparing scaling curves between releases.
+
+Example:
+    python CTC/scaling_benchmark.py --sizes 100 1000 10000 --json scaling.json
+
+This file is formatted per Google Python Style Guide.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from random import Random
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trackModel import layout_cache
+from trackModel.layout_generator import write_layout
+from trackModel.track_model_backend import TrackNetwork
+from CTC.headless_runner import HeadlessSimulation
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+LINE_NAME = "Synthetic Line"
+
+BENCHMARKS = ("load_track_layout_cold", "load_track_layout",
+              "get_network_status", "find_path", "controller_poll",
+              "tick_all_modules")
+
+
+def measure(fn: Callable[[], object], rounds: int,
+            setup: Optional[Callable[[], object]] = None) -> Dict[str, float]:
+    """Time `fn` over `rounds` calls.
+
+    Args:
+        fn: The call to time.
+        rounds: Number of timed calls.
+        setup: Optional untimed call made before each round.
+
+    Returns:
+        Seconds per call as min, median, mean and max, plus the rounds.
+    """
+    times: List[float] = []
+    for _ in range(max(1, rounds)):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "rounds": float(len(times)),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "max": max(times),
+    }
+
+
+def _load(path: str) -> TrackNetwork:
+    network = TrackNetwork()
+    network.load_track_layout(path)
+    return network
+
+
+def run_size(blocks: int, rounds: int = 10, trains: int = 5,
+             workdir: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark on one synthetic network.
+
+    Args:
+        blocks: Network size in blocks.
+        rounds: Timed rounds per benchmark (the cold load runs once).
+        trains: Trains dispatched before ticking.
+        workdir: Directory for the generated CSV and its layout cache.
+
+    Returns:
+        Benchmark name -> timing stats from measure().
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory())
+        devnull = stack.enter_context(open(os.devnull, "w"))
+        stack.enter_context(contextlib.redirect_stdout(devnull))
+
+        path = write_layout(os.path.join(workdir, f"synthetic_{blocks}.csv"),
+                            blocks)
+        layout_cache.clear_memory_cache()
+        results["load_track_layout_cold"] = measure(lambda: _load(path), 1)
+        results["load_track_layout"] = measure(
+            lambda: _load(path), rounds, setup=layout_cache.clear_memory_cache)
+
+        network = _load(path)
+        network.line_name = LINE_NAME
+        sim = HeadlessSimulation(LINE_NAME, network)
+        stack.callback(sim.close)
+        sim.dispatch_trains(trains)
+
+        rng = Random(blocks)
+        block_ids = sorted(network.segments)
+        flip = {"block": block_ids[len(block_ids) // 2], "occupied": False}
+
+        def change_one_block() -> None:
+            flip["occupied"] = not flip["occupied"]
+            network.set_occupancy(flip["block"], flip["occupied"])
+
+        results["get_network_status"] = measure(
+            network.get_network_status, rounds, setup=change_one_block)
+
+        state = sim.state
+        state.routing_index()   # built once per layout, not per search
+        pairs = [(rng.choice(block_ids), rng.choice(block_ids))
+                 for _ in range(max(1, rounds))]
+        results["find_path"] = measure(
+            lambda: state.find_path(*pairs.pop()), rounds)
+
+        def poll_controllers() -> None:
+            for controller in (state.track_controller,
+                               state.track_controller_hw):
+                controller._poll_track_model()
+                controller._send_status_to_ctc()
+
+        results["controller_poll"] = measure(
+            poll_controllers, rounds, setup=change_one_block)
+        results["tick_all_modules"] = measure(sim.step, rounds)
+    return results
+
+
+def run(sizes=DEFAULT_SIZES, rounds: int = 10,
+        trains: int = 5) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Run the suite at every size.
+
+    Args:
+        sizes: Network sizes in blocks.
+        rounds: Timed rounds per benchmark.
+        trains: Trains dispatched on each network.
+
+    Returns:
+        Size (as a string, for JSON) -> benchmark -> timing stats.
+    """
+    return {str(blocks): run_size(blocks, rounds, trains) for blocks in sizes}
+
+
+def format_table(results: Dict[str, Dict[str, Dict[str, float]]]) -> str:
+    """Render run() results as one row per benchmark and size."""
+    lines = [f"{'benchmark':<24}{'blocks':>8}{'min ms':>11}"
+             f"{'median ms':>11}{'mean ms':>11}{'rounds':>8}"]
+    for name in BENCHMARKS:
+        for size, per_size in results.items():
+            stats = per_size.get(name)
+            if stats is None:
+                continue
+            lines.append(
+                f"{name:<24}{size:>8}{stats['min'] * 1000:>11.3f}"
+                f"{stats['median'] * 1000:>11.3f}"
+                f"{stats['mean'] * 1000:>11.3f}{int(stats['rounds']):>8}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, object]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=list(DEFAULT_SIZES))
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--trains", type=int, default=5)
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the results to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.rounds, args.trains)
+    print("[ScalingBenchmark]")
+    print(format_table(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"sizes": args.sizes, "results": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -52,6 +52,20 @@ def test_find_path_substitutes_yard_zero(ctc):
     path = ctc.find_path(0, 63)
     assert path == [63]
 
+def test_find_path_routing_index_invalidation(ctc):
+    index = ctc.routing_index()
+    ctc.find_path(1, 7)
+    assert ctc.routing_index() is index
+
+    switch = next(seg for seg in ctc.track_model.segments.values()
+                  if isinstance(seg, TrackSwitch))
+    switch.set_switch_position(1 - switch.current_position)
+    after_switch = ctc.routing_index()
+    assert after_switch is not index
+
+    ctc.track_model.close_block(5)
+    assert ctc.routing_index() is not after_switch
+
 # --------------------------------------------------------
 # Test: compute_travel_time
 # --------------------------------------------------------
@@ -254,3 +268,226 @@ def test_receive_multiple_occupancy_updates(ctc):
     assert blk6.status == "occupied"
     assert blk7.status == "unoccupied"
 
+
+# --------------------------------------------------------
+# Test: headless runner
+# --------------------------------------------------------
+
+def test_headless_run_advances_sim_time():
+    from CTC.headless_runner import HeadlessSimulation
+
+    sim = HeadlessSimulation("Green Line")
+    train_ids = sim.dispatch_trains(2)
+    assert len(train_ids) == 2
+
+    report = sim.run(30)
+    assert report.ticks == 30
+    assert report.sim_seconds == 30
+    assert report.trains == 2
+    assert report.sim_seconds_per_wall_second > 0
+
+# --------------------------------------------------------
+# Test: time warp
+# --------------------------------------------------------
+
+def test_time_warp_steps_at_requested_rate():
+    from universal.global_clock import GlobalClock
+    from universal.time_warp import TimeWarpEngine
+
+    sim_clock = GlobalClock()
+    sim_clock.time_multiplier = 50.0
+    steps = []
+    warp = TimeWarpEngine(lambda: steps.append(sim_clock.tick()), sim_clock,
+                          max_steps_per_frame=5)
+
+    for _ in range(60):
+        warp.run_frame(1 / 60)
+    assert len(steps) == 50
+    assert warp.achieved_warp == pytest.approx(50.0)
+
+    # 500x needs ~8 steps a frame; the cap of 5 drops the rest
+    warp.set_warp(500.0)
+    for _ in range(60):
+        warp.run_frame(1 / 60)
+    stats = warp.stats()
+    assert stats["requested_warp"] == 500.0
+    assert stats["achieved_warp"] == pytest.approx(300.0)
+    assert stats["dropped_sim_seconds"] > 0
+
+    warp.pause()
+    assert warp.run_frame(1.0) == 0
+
+# --------------------------------------------------------
+# Test: checkpoint / restore
+# --------------------------------------------------------
+
+def test_checkpoint_restore_replays_identically():
+    from CTC.headless_runner import HeadlessSimulation
+    from CTC.checkpoint import CheckpointError, restore_checkpoint, save_checkpoint
+    from universal.global_clock import clock
+
+    sim = HeadlessSimulation("Green Line")
+    sim.dispatch_trains(2)
+    sim.run(60)
+    wayside = sim.state.track_controller
+    wayside.receive_model_update(40, "occupancy", True)
+    data = save_checkpoint(sim.state)
+    saved_time = clock.get_time()
+
+    def positions():
+        return {tid: (t.current_segment.block_id, t.segment_displacement_m, t.tm.velocity)
+                for tid, t in sim.network.trains.items()}
+
+    sim.run(60)
+    expected = positions()
+
+    sim.dispatch_trains(1)           # not in the checkpoint, must be removed
+    wayside.receive_model_update(41, "occupancy", True)
+    restore_checkpoint(sim.state, data)
+    assert clock.get_time() == saved_time
+    assert wayside._known_occupancy.overridden == 1 << 40
+    assert len(sim.network.trains) == 2
+    sim.run(60)
+    assert positions() == expected
+
+    with pytest.raises(CheckpointError):
+        restore_checkpoint(sim.state, b"XXXX" + data[4:])
+
+
+# --------------------------------------------------------
+# Test: scaling benchmark suite
+# --------------------------------------------------------
+
+def test_scaling_benchmark_runs_on_synthetic_network(tmp_path):
+    from CTC.scaling_benchmark import BENCHMARKS, run_size
+
+    results = run_size(120, rounds=2, trains=2, workdir=str(tmp_path))
+    assert set(results) == set(BENCHMARKS)
+    assert all(stats["min"] >= 0 for stats in results.values())
+
+
+# --------------------------------------------------------
+# Test: tick profiler
+# --------------------------------------------------------
+
+def test_tick_profiler_reports_per_module_breakdown():
+    from CTC.tick_profiler import TARGETS, profile_run
+
+    report = profile_run("Green Line", trains=2, minutes=0.5)
+    assert report["ticks"] == 30 and report["trains_dispatched"] == 2
+    assert set(report["modules"]) == set(TARGETS)
+    tick = report["modules"]["ctc.tick_all_modules"]
+    assert tick["calls_per_tick"] == 1.0 and tick["share"] == 1.0
+    # trains left on the shared clock by earlier tests step too
+    assert report["modules"]["train.move_step"]["calls_per_tick"] >= 2.0
+
+    with pytest.raises(ValueError):
+        profile_run("Green Line", trains=0)
+
+
+# --------------------------------------------------------
+# Test: shared controller registry / poller pool
+# --------------------------------------------------------
+
+def test_track_states_share_registry_controllers():
+    import threading
+    from universal.controller_registry import controller_registry, poller
+
+    first = TrackState("Green Line")
+    second = TrackState("Green Line", first.track_model)
+    try:
+        assert second.track_controller is first.track_controller
+        assert second.track_controller_hw is first.track_controller_hw
+        assert poller.is_polling(first.track_controller._poll_track_model)
+
+        before = threading.active_count()
+        TrackState("Green Line", first.track_model)  # no new poll threads
+        assert threading.active_count() == before
+
+        stats = controller_registry.stats()
+        assert {"interval_s", "calls", "mean_ms", "max_ms"} <= set(stats["SW Green Line"])
+    finally:
+        released = controller_registry.release(first.track_model)
+    assert first.track_controller in released
+    assert not poller.is_polling(first.track_controller._poll_track_model)
+
+
+def test_poller_first_run_waits_one_interval():
+    import threading
+    from universal.controller_registry import PollerPool
+
+    pool = PollerPool("TestPoller")
+    ran = threading.Event()
+    calls = []
+
+    def poll():
+        calls.append(1)
+        ran.set()
+
+    pool.add(poll, 0.05)
+    assert calls == []          # nothing runs before add() has returned
+    assert ran.wait(2.0)
+    pool.remove(poll)
+
+
+def test_track_state_without_live_link_does_not_poll():
+    from universal.controller_registry import controller_registry, poller
+
+    state = TrackState("Green Line", live_link=False)
+    try:
+        assert not poller.is_polling(state.track_controller._poll_track_model)
+        assert not poller.is_polling(state.track_controller_hw._poll_track_model)
+    finally:
+        controller_registry.release(state.track_model)
+
+
+# --------------------------------------------------------
+# Test: multi-line tick coordinator
+# --------------------------------------------------------
+
+def test_line_coordinator_ticks_every_line_once_per_step():
+    from universal.global_clock import clock
+    from CTC.line_coordinator import LineTickCoordinator
+
+    lines = {"Green Line": TrackState("Green Line"),
+             "Red Line": TrackState("Red Line")}
+    coordinator = LineTickCoordinator(lines)
+    try:
+        before = clock.get_time()
+        results = coordinator.step()
+        now = clock.get_time()
+        # serial unless a pool is asked for
+        assert coordinator._pool is None
+    finally:
+        coordinator.close()
+
+    # the shared clock advances once, not once per line
+    assert (now - before).total_seconds() == pytest.approx(clock.tick_interval)
+    assert set(results) == set(lines)
+    assert all(r.error is None for r in results.values())
+    assert all(state._last_time == now for state in lines.values())
+    assert set(coordinator.stats()) == set(lines)
+
+
+# --------------------------------------------------------
+# Test: process-per-line simulation
+# --------------------------------------------------------
+
+def test_process_lines_publish_through_shared_memory():
+    from CTC.line_processes import LineSpec, ProcessLineSimulation
+
+    specs = [LineSpec("Red Line", trains=2), LineSpec("Blue Line", trains=2)]
+    with ProcessLineSimulation(specs) as sim:
+        kpis = sim.step(30)
+        red = sim.lines["Red Line"]
+        occupied = set(red.occupied_blocks())
+        positions = red.train_positions()
+        block_ids = list(red.block_ids)
+
+    assert set(kpis) == {"Red Line", "Blue Line"}
+    assert all(k["ticks"] == 30 and k["trains"] == 2 and k["errors"] == 0
+               for k in kpis.values())
+    # both workers' clocks moved together
+    assert kpis["Red Line"]["sim_seconds"] == kpis["Blue Line"]["sim_seconds"]
+    assert block_ids == sorted(block_ids)
+    assert {int(p["block_id"]) for p in positions} <= occupied
@@ -0,0 +1,197 @@
+"""Multi-train benchmark harness with a per-module tick breakdown.
+
+Dispatches N trains (1 to 500) on a line through HeadlessSimulation, runs
+M simulated minutes under cProfile and reports, per simulation tick, the
+time spent in each module's entry point:
+
+    CTC         TrackState.tick_all_modules (the whole tick),
+                _sync_block_mirror, _update_throughput
+    Track Model TrackNetwork.set_time, on_sim_step
+    Trains      Train._sense_track / _move_step (the fixed-step halves of
+                Train._auto_tick), FleetPhysics._on_physics_step (the fleet
+                form of TrainModelBackend._on_clock_tick)
+    Wayside     both controllers' _poll_track_model, _send_status_to_ctc
+                and PLC evaluation (SW _execute_plc_logic, HW
+                _invoke_plc_logic)
+
+The legacy per-train entry points (_auto_tick, _on_clock_tick) are listed
+too; they show zero calls while the fixed-step scheduler drives trains.
+Times are cumulative (callees included) and measured under the profiler,
+so compare runs with each other rather than with unprofiled wall time.
+
+The JSON output has sorted keys and fixed rounding so two commits' runs
+can be diffed directly.
+
+Example:
+    python CTC/tick_profiler.py --trains 50 --minutes 5 --json before.json
+
+This file is formatted per Google Python Style Guide.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import cProfile
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CTC.CTC_backend import TrackState
+from CTC.headless_runner import HeadlessSimulation
+from trackControllerHW.track_controller_hw_backend import (
+    HardwareTrackControllerBackend,
+)
+from trackControllerSW.track_controller_backend import TrackControllerBackend
+from trackModel.track_model_backend import TrackNetwork
+from trainModel.train_model_backend import FleetPhysics, Train, TrainModelBackend
+
+MAX_TRAINS = 500
+
+# Report name -> function whose cumulative time is attributed to it.
+TARGETS: Dict[str, Callable] = {
+    "ctc.tick_all_modules": TrackState.tick_all_modules,
+    "ctc.sync_block_mirror": TrackState._sync_block_mirror,
+    "ctc.update_throughput": TrackState._update_throughput,
+    "track_model.set_time": TrackNetwork.set_time,
+    "track_model.on_sim_step": TrackNetwork.on_sim_step,
+    "train.auto_tick": Train._auto_tick,
+    "train.sense_track": Train._sense_track,
+    "train.move_step": Train._move_step,
+    "train_model.on_clock_tick": TrainModelBackend._on_clock_tick,
+    "train_model.fleet_physics_step": FleetPhysics._on_physics_step,
+    "sw_controller.poll_track_model": TrackControllerBackend._poll_track_model,
+    "sw_controller.send_status_to_ctc": TrackControllerBackend._send_status_to_ctc,
+    "sw_controller.execute_plc_logic": TrackControllerBackend._execute_plc_logic,
+    "hw_controller.poll_track_model":
+        HardwareTrackControllerBackend._poll_track_model,
+    "hw_controller.send_status_to_ctc":
+        HardwareTrackControllerBackend._send_status_to_ctc,
+    "hw_controller.invoke_plc_logic":
+        HardwareTrackControllerBackend._invoke_plc_logic,
+}
+
+
+def _key(fn: Callable) -> Tuple[str, int, str]:
+    """The pstats key (file, first line, name) of a function."""
+    code = fn.__code__
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def breakdown(stats: pstats.Stats, ticks: int) -> Dict[str, Dict[str, float]]:
+    """Per-tick calls and cumulative milliseconds for every target.
+
+    Args:
+        stats: Profile of the run.
+        ticks: Number of ticks the run executed.
+
+    Returns:
+        Target name -> {"calls_per_tick", "ms_per_tick", "share"}, where
+        share is the fraction of tick_all_modules' time.
+    """
+    raw = stats.stats  # type: ignore[attr-defined]
+    ticks = max(1, ticks)
+    total = raw.get(_key(TrackState.tick_all_modules), (0, 0, 0.0, 0.0))[3]
+    result: Dict[str, Dict[str, float]] = {}
+    for name, fn in TARGETS.items():
+        _, calls, _, cumulative, *_ = raw.get(_key(fn), (0, 0, 0.0, 0.0, {}))
+        result[name] = {
+            "calls_per_tick": round(calls / ticks, 3),
+            "ms_per_tick": round(cumulative * 1000 / ticks, 4),
+            "share": round(cumulative / total, 4) if total else 0.0,
+        }
+    return result
+
+
+def profile_run(line_name: str = "Green Line", trains: int = 10,
+                minutes: float = 1.0) -> Dict[str, Any]:
+    """Dispatch trains, run headlessly under the profiler and report.
+
+    Args:
+        line_name: Line to simulate.
+        trains: Trains to dispatch, 1 to MAX_TRAINS.
+        minutes: Simulated minutes to run.
+
+    Returns:
+        A JSON-ready report (see the module docstring).
+
+    Raises:
+        ValueError: If `trains` is out of range.
+    """
+    if not 1 <= trains <= MAX_TRAINS:
+        raise ValueError(f"trains must be between 1 and {MAX_TRAINS}")
+
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        sim = HeadlessSimulation(line_name)
+        try:
+            dispatched = sim.dispatch_trains(trains)
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                report = sim.run(minutes * 60.0, quiet=False)
+            finally:
+                profiler.disable()
+            wall = time.perf_counter() - start
+        finally:
+            sim.close()
+
+    return {
+        "line": line_name,
+        "trains_requested": trains,
+        "trains_dispatched": len(dispatched),
+        "sim_minutes": minutes,
+        "ticks": report.ticks,
+        "profiled_wall_seconds": round(wall, 3),
+        "profiled_ms_per_tick": round(wall * 1000 / max(1, report.ticks), 3),
+        "python": platform.python_version(),
+        "modules": breakdown(pstats.Stats(profiler), report.ticks),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render profile_run() output as a table, slowest module first."""
+    lines = [
+        f"[TickProfiler] {report['line']}: {report['trains_dispatched']} "
+        f"trains, {report['ticks']} ticks, "
+        f"{report['profiled_ms_per_tick']:.2f} ms/tick (profiled)",
+        f"{'module':<36}{'calls/tick':>11}{'ms/tick':>11}{'share':>8}",
+    ]
+    rows = sorted(report["modules"].items(),
+                  key=lambda item: -item[1]["ms_per_tick"])
+    for name, row in rows:
+        lines.append(f"{name:<36}{row['calls_per_tick']:>11.2f}"
+                     f"{row['ms_per_tick']:>11.3f}{row['share']:>8.1%}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--line", default="Green Line", help="line to simulate")
+    parser.add_argument("--trains", type=int, default=10,
+                        help=f"trains to dispatch (1-{MAX_TRAINS})")
+    parser.add_argument("--minutes", type=float, default=1.0,
+                        help="simulated minutes to run")
+    parser.add_argument("--json", metavar="PATH",
+                        help="write the report to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    report = profile_run(args.line, args.trains, args.minutes)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
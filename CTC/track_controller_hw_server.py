@@ -5,12 +5,21 @@ them to CTC backends running on the laptop.
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import socket
 import threading
+from collections import deque
 from typing import Any
 
+from trackControllerHW.wayside_protocol import (
+    FRAME_HEADER,
+    MAX_FRAME_BYTES,
+    ProtocolError,
+    decode_wayside_status,
+)
+
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
@@ -18,7 +27,12 @@ logger.addHandler(logging.NullHandler())
 class HardwareTrackControllerServer:
     """TCP server that receives wayside status updates from Raspberry Pi.
 
-    Expected message format (JSON):
+    Clients send length-prefixed binary frames (see
+    trackControllerHW.wayside_protocol) on a long-lived connection. Older
+    clients that send newline-delimited JSON are still accepted; the first
+    byte of a connection tells the two apart.
+
+    Message format (as decoded, or as sent in JSON):
         {
             "type": "wayside_status",
             "line": "Green Line",
@@ -47,6 +61,9 @@ class HardwareTrackControllerServer:
         self._server_socket: socket.socket | None = None
         self._thread: threading.Thread | None = None
         self._running = False
+        self._stats_lock = threading.Lock()
+        self.frames_received = 0
+        self.updates_received = 0
 
     def start(self) -> None:
         """Start the server listening for connections."""
@@ -58,6 +75,7 @@ class HardwareTrackControllerServer:
         self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self._server_socket.bind((self.host, self.port))
         self._server_socket.listen(5)
+        self.port = self._server_socket.getsockname()[1]
 
         logger.info("[HWTC-Server] Listening on %s:%d", self.host, self.port)
 
@@ -98,36 +116,103 @@ class HardwareTrackControllerServer:
     def _handle_client(self, sock: socket.socket, addr: Any) -> None:
         """Handle a single client connection."""
         with sock:
-            buffer = b""
-            while self._running:
-                try:
-                    data = sock.recv(4096)
-                except OSError:
-                    break
-                if not data:
-                    break
-                buffer += data
+            try:
+                first = sock.recv(1, socket.MSG_PEEK)
+            except OSError:
+                first = b""
+            if first == b"{":
+                self._read_json_lines(sock, addr)
+            elif first:
+                self._read_frames(sock, addr)
 
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        msg = json.loads(line.decode("utf-8"))
-                    except json.JSONDecodeError:
-                        logger.exception(
-                            "[HWTC-Server] Failed to decode JSON from %s:%d", *addr
-                        )
-                        continue
+        logger.info("[HWTC-Server] Connection closed from %s:%d", *addr)
+
+    def _read_frames(self, sock: socket.socket, addr: Any) -> None:
+        """Read length-prefixed frames into one reusable buffer."""
+        buf = bytearray(64 * 1024)
+        view = memoryview(buf)
+        start = end = 0
+        header = FRAME_HEADER.size
+        while self._running:
+            if end == len(buf):
+                if start:
+                    # move the partial frame to the front
+                    buf[: end - start] = buf[start:end]
+                    end -= start
+                    start = 0
+                else:
+                    view.release()
+                    buf.extend(bytes(len(buf)))
+                    view = memoryview(buf)
+            try:
+                n = sock.recv_into(view[end:])
+            except OSError:
+                break
+            if not n:
+                break
+            end += n
+
+            while end - start >= header:
+                (length,) = FRAME_HEADER.unpack_from(buf, start)
+                if length > MAX_FRAME_BYTES:
+                    logger.error(
+                        "[HWTC-Server] Oversized frame (%d bytes) from %s:%d",
+                        length, *addr,
+                    )
+                    return
+                frame_end = start + header + length
+                if frame_end > end:
+                    break
+                try:
+                    msg = decode_wayside_status(view[start + header:frame_end])
+                except ProtocolError:
+                    logger.exception(
+                        "[HWTC-Server] Bad frame from %s:%d", *addr
+                    )
+                else:
                     self._handle_message(msg)
+                start = frame_end
+            if start == end:
+                start = end = 0
 
-        logger.info("[HWTC-Server] Connection closed from %s:%d", *addr)
+    def _read_json_lines(self, sock: socket.socket, addr: Any) -> None:
+        """Read newline-delimited JSON messages (pre-framing clients)."""
+        buffer = b""
+        while self._running:
+            try:
+                data = sock.recv(4096)
+            except OSError:
+                break
+            if not data:
+                break
+            buffer += data
+
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    msg = json.loads(line.decode("utf-8"))
+                except json.JSONDecodeError:
+                    logger.exception(
+                        "[HWTC-Server] Failed to decode JSON from %s:%d", *addr
+                    )
+                    continue
+                self._handle_message(msg)
 
     def _handle_message(self, msg: dict[str, Any]) -> None:
         """Route message to appropriate handler."""
         msg_type = msg.get("type")
-        logger.info("[HWTC-Server] Received message type '%s': %s", msg_type, msg)
+        updates = msg.get("updates") or []
+        with self._stats_lock:
+            self.frames_received += 1
+            self.updates_received += len(updates)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[HWTC-Server] Received '%s' for %s with %d updates",
+                msg_type, msg.get("line"), len(updates),
+            )
         if msg_type == "wayside_status":
             self._handle_wayside_status(msg)
         else:
@@ -202,4 +287,224 @@ class HardwareTrackControllerServer:
             except TypeError:
                 func(line_name, block_id, value)
         except Exception:
-            logger.exception("[HWTC-Server] %s failed", method_name)
\ No newline at end of file
+            logger.exception("[HWTC-Server] %s failed", method_name)
+
+
+class _AsyncClient:
+    """Per-connection bookkeeping for AsyncHardwareTrackControllerServer.
+
+    `queued` is only written by the event loop and `applied` only by the
+    simulation thread, so their difference (messages waiting for the
+    simulation) needs no lock.
+    """
+
+    __slots__ = ("addr", "queued", "applied", "wakeup")
+
+    def __init__(self, addr: Any) -> None:
+        self.addr = addr
+        self.queued = 0
+        self.applied = 0
+        self.wakeup = asyncio.Event()
+
+
+class AsyncHardwareTrackControllerServer(HardwareTrackControllerServer):
+    """Single-event-loop variant of HardwareTrackControllerServer.
+
+    All client connections are served by one asyncio loop on one
+    background thread, however many waysides attach. Decoded messages are
+    not applied on that thread: they go onto a deque that the simulation
+    thread empties with drain(), once per tick (see attach_to_clock), so
+    TrackState and the Track Model are only touched from the thread that
+    owns them.
+
+    Each client may have at most `max_pending` messages waiting for the
+    simulation. A client at that limit stops being read until the next
+    drain, which pushes back on the sender through TCP flow control.
+    """
+
+    def __init__(
+        self,
+        backends_by_line: dict[str, Any],
+        host: str = "0.0.0.0",
+        port: int = 6000,
+        max_pending: int = 16,
+    ) -> None:
+        super().__init__(backends_by_line, host, port)
+        self.max_pending = max_pending
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.base_events.Server | None = None
+        self._clients: set[_AsyncClient] = set()
+        self._inbox: deque[tuple[_AsyncClient, dict[str, Any]]] = deque()
+        self._blocked = False
+
+    # ---- lifecycle (any thread) ----
+    def start(self) -> None:
+        """Start the event loop thread and begin accepting connections."""
+        if self._running:
+            return
+        self._running = True
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run_loop,
+            args=(ready,),
+            name="AsyncHardwareTrackControllerServer",
+            daemon=True,
+        )
+        self._thread.start()
+        ready.wait()
+        if self._server is None:
+            self._running = False
+            raise OSError(f"could not listen on {self.host}:{self.port}")
+
+    def stop(self) -> None:
+        """Close every connection and stop the event loop."""
+        if not self._running:
+            return
+        self._running = False
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def attach_to_clock(self, clock: Any) -> None:
+        """Drain received updates in the SENSE phase of every clock step."""
+        from universal.global_clock import SimPhase
+        clock.register_phase(SimPhase.SENSE, self.drain)
+
+    # ---- simulation thread ----
+    def drain(self, *_args: Any) -> int:
+        """Apply every message received since the last drain.
+
+        Call from the simulation thread. Accepts and ignores the clock's
+        (time, dt) arguments so it can be registered as a phase callback.
+
+        Returns:
+            Number of messages applied.
+        """
+        applied = 0
+        for _ in range(len(self._inbox)):
+            client, msg = self._inbox.popleft()
+            try:
+                self._handle_message(msg)
+            except Exception:
+                logger.exception("[HWTC-Server] Failed to apply message")
+            client.applied += 1
+            applied += 1
+        if applied and self._blocked and self._loop is not None:
+            self._blocked = False
+            try:
+                self._loop.call_soon_threadsafe(self._wake_clients)
+            except RuntimeError:
+                pass  # loop already closed
+        return applied
+
+    def pending(self) -> int:
+        """Messages received but not yet drained."""
+        return len(self._inbox)
+
+    # ---- event loop thread ----
+    def _run_loop(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        try:
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._serve_client, self.host, self.port)
+            )
+        except OSError:
+            logger.exception(
+                "[HWTC-Server] Could not listen on %s:%d", self.host, self.port
+            )
+            ready.set()
+            loop.close()
+            return
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("[HWTC-Server] Listening on %s:%d (asyncio)", self.host, self.port)
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+            self._server = None
+
+    def _wake_clients(self) -> None:
+        for client in self._clients:
+            client.wakeup.set()
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        addr = writer.get_extra_info("peername") or ("?", 0)
+        client = _AsyncClient(addr)
+        self._clients.add(client)
+        logger.info("[HWTC-Server] Connection from %s:%d", *addr[:2])
+        try:
+            first = await reader.readexactly(1)
+            if first == b"{":
+                await self._read_json_stream(client, reader, first)
+            else:
+                await self._read_frame_stream(client, reader, first)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.discard(client)
+            writer.close()
+            logger.info("[HWTC-Server] Connection closed from %s:%d", *addr[:2])
+
+    async def _read_frame_stream(
+        self, client: _AsyncClient, reader: asyncio.StreamReader, first: bytes
+    ) -> None:
+        header = first + await reader.readexactly(FRAME_HEADER.size - 1)
+        while True:
+            (length,) = FRAME_HEADER.unpack(header)
+            if length > MAX_FRAME_BYTES:
+                logger.error(
+                    "[HWTC-Server] Oversized frame (%d bytes) from %s:%d",
+                    length, *client.addr[:2],
+                )
+                return
+            payload = await reader.readexactly(length)
+            try:
+                msg = decode_wayside_status(payload)
+            except ProtocolError:
+                logger.exception(
+                    "[HWTC-Server] Bad frame from %s:%d", *client.addr[:2]
+                )
+            else:
+                await self._enqueue(client, msg)
+            header = await reader.readexactly(FRAME_HEADER.size)
+
+    async def _read_json_stream(
+        self, client: _AsyncClient, reader: asyncio.StreamReader, first: bytes
+    ) -> None:
+        line = first + await reader.readline()
+        while line:
+            line = line.strip()
+            if line:
+                try:
+                    msg = json.loads(line.decode("utf-8"))
+                except json.JSONDecodeError:
+                    logger.exception(
+                        "[HWTC-Server] Failed to decode JSON from %s:%d",
+                        *client.addr[:2],
+                    )
+                else:
+                    await self._enqueue(client, msg)
+            line = await reader.readline()
+
+    async def _enqueue(self, client: _AsyncClient, msg: dict[str, Any]) -> None:
+        """Queue a message for the simulation thread, waiting while the
+        client already has max_pending messages queued."""
+        while client.queued - client.applied >= self.max_pending:
+            client.wakeup.clear()
+            self._blocked = True
+            if client.queued - client.applied < self.max_pending:
+                break
+            await client.wakeup.wait()
+        self._inbox.append((client, msg))
+        client.queued += 1
@@ -16,7 +16,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uni
 # CTC import
 from CTC.CTC_backend import TrackState,Block 
 from CTC.CTC_ui import CTCWindow 
-from CTC.track_controller_hw_server import HardwareTrackControllerServer # comment if doesnt work
+from CTC.track_controller_hw_server import AsyncHardwareTrackControllerServer # comment if doesnt work
 
 # Wayside Controller SW import
 from trackControllerSW.track_controller_backend import TrackControllerBackend
@@ -42,7 +42,9 @@ from trainControllerSW.TrainControllerBackend import TrainControllerBackend as T
 
 # Universal import
 from universal.universal import TrainCommand, SignalState, ConversionFunctions
-from universal.global_clock import clock
+from universal.global_clock import SimPhase, clock
+from universal.refresh_bus import refresh_bus
+from universal.controller_registry import controller_registry
 # PyQt6 import
 from PyQt6.QtWidgets import QApplication
 
@@ -52,6 +54,7 @@ from PyQt6.QtWidgets import QApplication
 if __name__ == "__main__":
     
     app = QApplication([])
+    refresh_bus.start()  # one coalesced repaint per frame for every module UI
     network1 = TrackNetwork()
     network1.load_track_layout('trackModel/green_line.csv')
     network1.line_name = "Green Line"
@@ -62,24 +65,25 @@ if __name__ == "__main__":
 
     #------------------------------------------------------------------------------------------------
     # trackcontroller sw stuff that might be wrong or need to be changed, tell me to change if needed
+    # one controller per (network, line, kind); the CTC TrackStates below get these same ones
     controllers = {
-        "Green Line": TrackControllerBackend(network1, "Green Line"),
-        "Red Line": TrackControllerBackend(network2, "Red Line")
+        "Green Line": controller_registry.get_or_create(network1, "Green Line", "SW", TrackControllerBackend),
+        "Red Line": controller_registry.get_or_create(network2, "Red Line", "SW", TrackControllerBackend)
         }
     for ctrl in controllers.values(): 
-        ctrl.start_live_link(poll_interval=1.0)
+        controller_registry.start(ctrl, poll_interval=1.0)
         
     
     #------------------------------------------------------------------------------------------------
     # track controller hw
     hw_controllers = {
-    "Green Line": HardwareTrackControllerBackend(network1, "Green Line"),
+    "Green Line": controller_registry.get_or_create(network1, "Green Line", "HW", HardwareTrackControllerBackend),
     # Add Red Line if needed:
-    "Red Line": HardwareTrackControllerBackend(network2, "Red Line"),
+    "Red Line": controller_registry.get_or_create(network2, "Red Line", "HW", HardwareTrackControllerBackend),
 }
 
     for ctrl in hw_controllers.values():
-        ctrl.start_live_link(1.0)
+        controller_registry.start(ctrl, 1.0)
 
     hw_ui = TrackControllerHWUI(hw_controllers)
     hw_ui.setWindowTitle("Wayside Controller – Hardware UI")
@@ -88,8 +92,8 @@ if __name__ == "__main__":
     TrackModelUI = NetworkStatusUI(network1, network2)
     TrackModelUI.show()
     TrackModelUI.refresh_status()
-    clock.register_listener(network1.set_time)
-    clock.register_listener(network2.set_time)
+    clock.register_phase(SimPhase.PHYSICS, network1.on_sim_step)
+    clock.register_phase(SimPhase.PHYSICS, network2.on_sim_step)
     #-----------------------------------------------------------------------------------------------
     TrackControllerUi = TrackControllerUI(controllers)
     TrackControllerUi.setWindowTitle("Wayside SW Module")
@@ -165,12 +169,8 @@ if __name__ == "__main__":
     ctc_green = TrackState("Green Line", network1)
     ctc_red = TrackState("Red Line", network2)
 
-    # Replace internal controllers so both use REAL modules
-    ctc_green.track_controller = controllers["Green Line"]
-    controllers["Green Line"].set_ctc_backend(ctc_green)
-
-    ctc_red.track_controller = controllers["Red Line"]
-    controllers["Red Line"].set_ctc_backend(ctc_red)
+    # No need to swap controllers in: TrackState gets the ones above from controller_registry
+    # (and links them with set_ctc_backend), so the UIs and the CTC share one per line.
 
     ctc_green.on_train_created = create_train
     ctc_red.on_train_created  = create_train
@@ -181,7 +181,8 @@ if __name__ == "__main__":
         "Red Line": ctc_red
     }
 
-    hw_server = HardwareTrackControllerServer(backend_by_line, host="0.0.0.0", port=6000) # comment if doesnt work
+    hw_server = AsyncHardwareTrackControllerServer(backend_by_line, host="0.0.0.0", port=6000) # comment if doesnt work
+    hw_server.attach_to_clock(clock) # wayside updates are applied on the sim thread
     hw_server.start() # comment if doesnt work
     
     ctc_ui = CTCWindow(backend_by_line)
@@ -4,16 +4,18 @@ Forwards wayside status updates over TCP to the CTC running on the laptop.
 """
 from __future__ import annotations
 
-import json
 import logging
 import socket
 import threading
+import time
 from typing import Any
 
 try:
     from trackControllerHW.track_controller_hw_backend import WaysideStatusUpdate
+    from trackControllerHW.wayside_protocol import encode_wayside_status
 except ImportError:
     from track_controller_hw_backend import WaysideStatusUpdate
+    from wayside_protocol import encode_wayside_status
 
 from universal.universal import SignalState
 
@@ -22,70 +24,159 @@ logger.addHandler(logging.NullHandler())
 
 
 class NetworkCTCProxy:
-    """Proxy that forwards wayside status updates to CTC over TCP."""
+    """Proxy that forwards wayside status updates to CTC over TCP.
 
-    def __init__(self, host: str, port: int = 6000) -> None:
+    Keeps one connection open and sends length-prefixed binary frames (see
+    wayside_protocol) holding only the blocks whose status changed since
+    the last successful send. A dropped connection is reopened with
+    exponential backoff, and every new connection (plus a periodic
+    refresh, in case a send was silently lost) starts with a full batch.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 6000,
+        connect_timeout: float = 2.0,
+        max_backoff: float = 8.0,
+        full_refresh_interval: float = 5.0,
+    ) -> None:
         """Initialize the proxy.
 
         Args:
             host: IP address of the laptop running main.py.
             port: TCP port where the laptop server listens.
+            connect_timeout: Seconds to wait for a connection attempt.
+            max_backoff: Longest wait between reconnect attempts, seconds.
+            full_refresh_interval: Seconds between full (non-delta) batches.
         """
         self.host = host
         self.port = port
+        self.connect_timeout = connect_timeout
+        self.max_backoff = max_backoff
+        self.full_refresh_interval = full_refresh_interval
         self._lock = threading.Lock()
+        self._sock: socket.socket | None = None
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._last_full = 0.0
+        self._last_sent: dict[tuple[str, int], tuple[Any, ...]] = {}
+
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.updates_sent = 0
 
     def receive_wayside_status(
         self,
         line_name: str,
         status_updates: list[WaysideStatusUpdate],
     ) -> None:
-        """Convert status updates to dicts and send them to laptop.
+        """Send the blocks whose status changed to the laptop.
 
         Args:
             line_name: Name of the rail line.
             status_updates: List of status updates to send.
         """
-        payload_updates: list[dict[str, Any]] = []
+        rows = []
         for s in status_updates:
             if isinstance(s.signal_state, SignalState):
                 signal_value = s.signal_state.value
             else:
                 signal_value = str(s.signal_state)
+            rows.append((
+                int(s.block_id),
+                bool(s.occupied),
+                signal_value,
+                s.switch_position,
+                s.crossing_status,
+            ))
 
-            payload_updates.append({
-                "block_id": int(s.block_id),
-                "occupied": bool(s.occupied),
-                "signal_state": signal_value,
-                "switch_position": s.switch_position,
-                "crossing_status": s.crossing_status,
-            })
-
-        payload = {
-            "type": "wayside_status",
-            "line": line_name,
-            "updates": payload_updates,
-        }
-        self._send(payload)
-
-    def _send(self, payload: dict[str, Any]) -> None:
-        """Send payload to CTC server over TCP."""
-        data = (json.dumps(payload) + "\n").encode("utf-8")
-        try:
-            with self._lock:
-                with socket.create_connection(
-                    (self.host, self.port), timeout=2.0
-                ) as sock:
-                    sock.sendall(data)
+        with self._lock:
+            sock = self._connect()
+            if sock is None:
+                return
+            now = time.monotonic()
+            if now - self._last_full >= self.full_refresh_interval:
+                self._last_sent.clear()
+                self._last_full = now
+
+            last_sent = self._last_sent
+            changed = [
+                row for row in rows
+                if last_sent.get((line_name, row[0])) != row[1:]
+            ]
+            if not changed:
+                return
+
+            frame = encode_wayside_status(line_name, changed)
+            try:
+                sock.sendall(frame)
+            except OSError:
+                logger.warning(
+                    "Lost connection to CTC server at %s:%d",
+                    self.host,
+                    self.port,
+                )
+                self._disconnect()
+                return
+
+            for row in changed:
+                last_sent[(line_name, row[0])] = row[1:]
+            self.frames_sent += 1
+            self.bytes_sent += len(frame)
+            self.updates_sent += len(changed)
             logger.debug(
-                "Sent %d bytes to CTC server at %s:%d",
-                len(data),
+                "Sent %d block updates (%d bytes) to CTC server at %s:%d",
+                len(changed),
+                len(frame),
                 self.host,
                 self.port,
             )
+
+    def close(self) -> None:
+        """Close the connection to the CTC server."""
+        with self._lock:
+            self._disconnect()
+
+    def _connect(self) -> socket.socket | None:
+        """Return the open connection, reconnecting if the backoff allows."""
+        if self._sock is not None:
+            return self._sock
+
+        now = time.monotonic()
+        if now < self._retry_at:
+            return None
+        try:
+            sock = socket.create_connection(
+                (self.host, self.port), timeout=self.connect_timeout
+            )
         except OSError:
-            logger.exception(
-                "Failed to send payload to CTC server at %s:%d",
+            self._backoff = min(
+                self.max_backoff, self._backoff * 2 if self._backoff else 0.25
+            )
+            self._retry_at = now + self._backoff
+            logger.warning(
+                "Cannot reach CTC server at %s:%d; retrying in %.2fs",
                 self.host,
                 self.port,
-            )
\ No newline at end of file
+                self._backoff,
+            )
+            return None
+
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        logger.info("Connected to CTC server at %s:%d", self.host, self.port)
+        self._sock = sock
+        self._backoff = 0.0
+        # the server has none of our state yet, so start with a full batch
+        self._last_sent.clear()
+        self._last_full = now
+        return sock
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+        self._last_sent.clear()
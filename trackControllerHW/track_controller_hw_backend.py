@@ -11,7 +11,17 @@ import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Mapping, MutableMapping, Optional
+
+try:
+    from universal.block_bits import BlockBits, BlockBitsOverlay, iter_bits
+    from universal.controller_registry import poller
+    from universal.plc_engine import PLCEngine
+except ImportError:  # running standalone (e.g. on the Pi) without the repo root
+    BlockBits = dict
+    BlockBitsOverlay = None
+    PLCEngine = None
+    poller = None
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
@@ -168,7 +178,7 @@ class HardwareTrackControllerBackend:
         self._switch_signals: dict[tuple[int, int], SignalState] = {}
         self._init_default_infrastructure()
 
-        self._known_occupancy: dict[int, bool] = {}
+        self._known_occupancy: Mapping[int, bool] = self._occupancy_source()
         self._known_signal: dict[int, SignalState] = {}
         self._suggested_speed_mph: dict[int, int] = {}
         self._suggested_auth_yd: dict[int, int] = {}
@@ -177,7 +187,8 @@ class HardwareTrackControllerBackend:
 
         self.failures: dict[str, FailureSnapshot] = {}
         self.failure_history: list[FailureSnapshot] = []
-        self._previous_occupancy: dict[int, bool] = {}
+        # occupancy as last acted on by _on_occupancy_change
+        self._previous_occupancy: MutableMapping[int, bool] = BlockBits()
         self._occupancy_timestamps: dict[int, datetime] = {}
         self._expected_stop_blocks: dict[int, datetime] = {}
         self._pending_actuator_checks: dict[str, ActuatorCommandCheck] = {}
@@ -186,7 +197,8 @@ class HardwareTrackControllerBackend:
         self._max_command_attempts: int = 3
 
         self._plc_logic_module: Any | None = None
-        self._plc_prev_occupancy: dict[int, bool] = {}
+        self._plc_engine: Any | None = None
+        self._plc_prev_occupancy: MutableMapping[int, bool] = BlockBits()
 
         self.maintenance_mode: bool = False
         self._live_thread_running = False
@@ -206,6 +218,7 @@ class HardwareTrackControllerBackend:
         self._line_blocks: list[int] = sorted(
             set(self._hw_blocks) | set(self._view_blocks)
         )
+        self._line_block_set: frozenset[int] = frozenset(self._line_blocks)
 
         self._guard_blocks: list[int] = []
         if self._hw_blocks:
@@ -225,6 +238,18 @@ class HardwareTrackControllerBackend:
                 logger.exception("ensure_blocks failed")
         self._initial_sync()
 
+        # Change feed from the track model; replaces the full scan once synced.
+        self._event_feed = False
+        self._event_feed_synced = False
+        self._pending_state_change = False
+        self._feed_blocks: frozenset[int] = frozenset(
+            self._line_blocks + self._guard_blocks
+        )
+        self._feed_mask = sum(1 << b for b in self._feed_blocks)
+        if hasattr(self.track_model, "subscribe"):
+            self.track_model.subscribe(self._on_track_event)
+            self._event_feed = True
+
     def _init_default_infrastructure(self) -> None:
         """Initialize switches and crossings for the line."""
         if self.line_name == "Green Line":
@@ -330,7 +355,7 @@ class HardwareTrackControllerBackend:
         """
         b = int(block)
 
-        if b not in self._line_blocks:
+        if b not in self._line_block_set:
             logger.debug(
                 "CTC suggestion for block %d ignored (not in %s territory)",
                 b,
@@ -354,6 +379,47 @@ class HardwareTrackControllerBackend:
 
         self._notify_listeners()
 
+    def receive_ctc_suggestions_bulk(
+        self, suggestions: Mapping[int, tuple[float, float]]
+    ) -> int:
+        """Receive a full set of speed/authority suggestions from CTC.
+
+        Only blocks whose converted suggestion changed are updated, and
+        listeners are notified once for the whole batch.
+
+        Args:
+            suggestions: Mapping of block ID to (speed m/s, authority m).
+
+        Returns:
+            Number of blocks whose suggestion changed.
+        """
+        line_blocks = self._line_block_set
+        speeds = self._suggested_speed_mph
+        auths = self._suggested_auth_yd
+        changed = 0
+
+        for block, (speed_mps, auth_m) in suggestions.items():
+            b = int(block)
+            if b not in line_blocks:
+                continue
+            speed_mph = int(round(float(speed_mps) * 2.23694))
+            auth_yd = int(round(float(auth_m) * 1.09361))
+            if speeds.get(b) == speed_mph and auths.get(b) == auth_yd:
+                continue
+            speeds[b] = speed_mph
+            auths[b] = auth_yd
+            changed += 1
+
+        if changed:
+            logger.debug(
+                "%s: CTC bulk suggestion updated %d of %d blocks",
+                self.line_name,
+                changed,
+                len(suggestions),
+            )
+            self._notify_listeners()
+        return changed
+
     def _send_status_to_ctc(self) -> None:
         """Send current status to CTC backend."""
         if not self.ctc_backend or not self._ctc_update_enabled:
@@ -422,6 +488,18 @@ class HardwareTrackControllerBackend:
         except Exception:
             logger.exception("CTC single-status update failed")
 
+    def _occupancy_source(self) -> Mapping[int, bool]:
+        """Map block occupancy is read from.
+
+        A TrackNetwork owns the packed occupancy, so it is read through a
+        live view; only writes that disagree with the network are kept
+        here. Other track models get a map filled by the sync/poll paths.
+        """
+        occupancy_view = getattr(self.track_model, "occupancy_view", None)
+        if occupancy_view is None or BlockBitsOverlay is None:
+            return BlockBits()
+        return BlockBitsOverlay(occupancy_view())
+
     def _initial_sync(self) -> None:
         """Sync initial state from track model."""
         segments = getattr(self.track_model, "segments", {})
@@ -432,8 +510,9 @@ class HardwareTrackControllerBackend:
         for b in self._line_blocks:
             if seg := segments.get(b):
                 occ = bool(getattr(seg, "occupied", False))
-                if self._known_occupancy.get(b) != occ:
+                if self._previous_occupancy.get(b) != occ:
                     self._known_occupancy[b] = occ
+                    self._previous_occupancy[b] = occ
                     changed = True
 
                 if b not in self.switch_map:
@@ -464,8 +543,9 @@ class HardwareTrackControllerBackend:
 
     def _on_occupancy_change(self, block_id: int, occupied: bool) -> None:
         """Handle block occupancy change."""
-        previous = self._known_occupancy.get(block_id, False)
+        previous = self._previous_occupancy.get(block_id, False)
         self._known_occupancy[block_id] = occupied
+        self._previous_occupancy[block_id] = occupied
 
         for crossing_id, blk in self.crossing_blocks.items():
             if blk == block_id:
@@ -485,7 +565,6 @@ class HardwareTrackControllerBackend:
 
         if previous != occupied:
             self._occupancy_timestamps[block_id] = self.time
-            self._previous_occupancy[block_id] = previous
 
         self._check_broken_rail(block_id, occupied)
         self._check_track_circuit(block_id, previous, occupied)
@@ -631,10 +710,26 @@ class HardwareTrackControllerBackend:
             self._actuator_retry_count.pop(key, None)
 
     def start_live_link(self, poll_interval: float = 1.0) -> None:
-        """Start live polling of track model."""
+        """Start live polling of track model.
+
+        With the repo available, the track poll and the guard-block poll
+        are tasks on the shared poller thread; standalone they each get a
+        thread.
+        """
         if self._live_thread_running:
             return
         self._live_thread_running = True
+        self._guard_poll_interval = max(0.25, float(poll_interval))
+        start_guard = bool(self._guard_blocks) and not self._guard_thread_running
+        self._guard_thread_running = self._guard_thread_running or start_guard
+
+        if poller is not None:
+            poller.add(self._poll_track_model, poll_interval,
+                       name=f"HW {self.line_name}")
+            if start_guard:
+                poller.add(self._poll_guard_blocks, self._guard_poll_interval,
+                           name=f"HW {self.line_name} guard")
+            return
 
         def loop():
             while self._live_thread_running:
@@ -645,22 +740,69 @@ class HardwareTrackControllerBackend:
                 time.sleep(poll_interval)
 
         threading.Thread(target=loop, daemon=True).start()
-
-        self._guard_poll_interval = max(0.25, float(poll_interval))
-        if self._guard_blocks and not self._guard_thread_running:
-            self._guard_thread_running = True
+        if start_guard:
             threading.Thread(target=self._guard_loop, daemon=True).start()
 
     def stop_live_link(self) -> None:
         """Stop live polling."""
         self._guard_thread_running = False
         self._live_thread_running = False
+        if poller is not None:
+            poller.remove(self._poll_track_model)
+            poller.remove(self._poll_guard_blocks)
+
+    def _on_track_event(self, event: Any) -> None:
+        """Apply an occupancy or signal change pushed by the track model.
+
+        These are the two things the full scan picked up; signals are kept
+        where set_signal() keeps them.
+        """
+        b = event.block_id
+        if b not in self._feed_blocks:
+            return
+        kind = event.kind.value
+        if kind == "occupancy":
+            # the network's value replaces any override of this block; the
+            # blocks not yet acted on are one XOR against the snapshot
+            occupancy = self._known_occupancy
+            occupancy.release(1 << b)
+            changed = (
+                occupancy.bits ^ self._previous_occupancy.bits
+            ) & self._feed_mask
+            for block_id in iter_bits(changed):
+                self._on_occupancy_change(block_id, occupancy[block_id])
+            if changed:
+                self._pending_state_change = True
+        elif kind == "signal":
+            side, state = event.value
+            if b in self.switch_map:
+                known, key = self._switch_signals, (b, side)
+            elif side == 0:
+                known, key = self._known_signal, b
+            else:
+                return
+            if known.get(key) != state:
+                known[key] = state
+                self._pending_state_change = True
 
     def _poll_track_model(self) -> None:
-        """Poll track model for changes."""
+        """Poll track model for changes.
+
+        With a change feed, only the first call scans every segment; later
+        calls report the changes pushed since the previous call.
+        """
+        if self._event_feed and self._event_feed_synced:
+            if self._pending_state_change:
+                self._pending_state_change = False
+                self._notify_listeners()
+                self._send_status_to_ctc()
+            self._review_actuator_responses()
+            return
+
         segments = getattr(self.track_model, "segments", {})
         if not isinstance(segments, dict):
             return
+        self._event_feed_synced = self._event_feed
 
         changed_ctc = False
         for b, seg in segments.items():
@@ -680,17 +822,21 @@ class HardwareTrackControllerBackend:
 
         self._review_actuator_responses()
 
+    def _poll_guard_blocks(self) -> None:
+        """Poll guard blocks at territory boundaries once."""
+        segments = getattr(self.track_model, "segments", {})
+        for gb in self._guard_blocks:
+            if seg := segments.get(gb):
+                occ = bool(getattr(seg, "occupied", False))
+                if self._known_occupancy.get(gb) != occ:
+                    self._known_occupancy[gb] = occ
+                    self._notify_listeners()
+
     def _guard_loop(self) -> None:
-        """Poll guard blocks at territory boundaries."""
+        """Guard-block polling thread (standalone only)."""
         while self._guard_thread_running:
             try:
-                segments = getattr(self.track_model, "segments", {})
-                for gb in self._guard_blocks:
-                    if seg := segments.get(gb):
-                        occ = bool(getattr(seg, "occupied", False))
-                        if self._known_occupancy.get(gb) != occ:
-                            self._known_occupancy[gb] = occ
-                            self._notify_listeners()
+                self._poll_guard_blocks()
             except Exception:
                 logger.exception("Guard-block polling error")
             time.sleep(self._guard_poll_interval)
@@ -1050,10 +1196,28 @@ class HardwareTrackControllerBackend:
             return
 
         max_idx = max(blocks) + 1
-        current_occ = [False] * max_idx
-        prev_occ = [False] * max_idx
-        stop_flags = [False] * max_idx
-        signal_bools = [False] * max_idx
+        switch_ids = sorted(self.switches.keys())
+        crossing_ids = sorted(self.crossing_blocks.keys())
+
+        engine = self._plc_engine_for(
+            plc.plc_logic, max_idx, len(switch_ids), len(crossing_ids)
+        )
+        if engine is not None:
+            (
+                current_occ,
+                switch_positions,
+                signal_bools,
+                crossing_states,
+                prev_occ,
+                stop_flags,
+            ) = engine.inputs
+        else:
+            current_occ = [False] * max_idx
+            prev_occ = [False] * max_idx
+            stop_flags = [False] * max_idx
+            signal_bools = [False] * max_idx
+            switch_positions = [False] * len(switch_ids)
+            crossing_states = [False] * len(crossing_ids)
 
         for b in blocks:
             if b < max_idx:
@@ -1062,25 +1226,25 @@ class HardwareTrackControllerBackend:
                 sig = self._known_signal.get(b, SignalState.RED)
                 signal_bools[b] = sig == SignalState.GREEN
 
-        switch_ids = sorted(self.switches.keys())
-        switch_positions = [
-            self.switches.get(sid, "Straight") == "Diverging" for sid in switch_ids
-        ]
+        for idx, sid in enumerate(switch_ids):
+            switch_positions[idx] = self.switches.get(sid, "Straight") == "Diverging"
 
-        crossing_ids = sorted(self.crossing_blocks.keys())
-        crossing_states = [
-            self.crossings.get(cid, "Inactive") == "Active" for cid in crossing_ids
-        ]
+        for idx, cid in enumerate(crossing_ids):
+            crossing_states[idx] = self.crossings.get(cid, "Inactive") == "Active"
 
         try:
-            out_switches, out_signals, out_crossings, out_stops = plc.plc_logic(
-                current_occ,
-                switch_positions,
-                signal_bools,
-                crossing_states,
-                prev_occ,
-                stop_flags,
-            )
+            if engine is not None:
+                # skipped inside the engine if nothing it reads changed
+                out_switches, out_signals, out_crossings, out_stops = engine.run()
+            else:
+                out_switches, out_signals, out_crossings, out_stops = plc.plc_logic(
+                    current_occ,
+                    switch_positions,
+                    signal_bools,
+                    crossing_states,
+                    prev_occ,
+                    stop_flags,
+                )
         except Exception:
             logger.exception("PLC plc_logic() raised an exception")
             return
@@ -1174,6 +1338,27 @@ class HardwareTrackControllerBackend:
 
         self._update_switch_signals()
 
+    def _plc_engine_for(
+        self,
+        plc_logic: Callable[..., Any],
+        num_blocks: int,
+        num_switches: int,
+        num_crossings: int,
+    ) -> Any | None:
+        """Get the PLC engine for plc_logic, rebuilding it if the program or
+        array sizes changed. Returns None when the engine isn't importable."""
+        if PLCEngine is None:
+            return None
+        sizes = (
+            num_blocks, num_switches, num_blocks, num_crossings,
+            num_blocks, num_blocks,
+        )
+        engine = self._plc_engine
+        if engine is None or engine.plc_logic is not plc_logic or engine.sizes != sizes:
+            engine = PLCEngine(plc_logic, *([False] * n for n in sizes))
+            self._plc_engine = engine
+        return engine
+
     def get_line_block_ids(self) -> list[int]:
         """Get all block IDs for this line."""
         return list(self._line_blocks)
@@ -732,5 +732,132 @@ class TestFailureDetection:
         assert "pending_commands" in report
 
 
+
+class TestWaysideLink:
+    """Test the framed Pi -> CTC status link."""
+
+    def test_frame_round_trip(self):
+        from wayside_protocol import FRAME_HEADER, decode_wayside_status, encode_wayside_status
+
+        rows = [
+            (12, True, "SignalState.RED", "Diverging", None),
+            (19, False, "N/A", None, "Active"),
+            (20, False, "N/A", None, True),
+        ]
+        frame = encode_wayside_status("Green Line", rows)
+        (length,) = FRAME_HEADER.unpack_from(frame)
+        assert length == len(frame) - FRAME_HEADER.size
+        msg = decode_wayside_status(memoryview(frame)[FRAME_HEADER.size:])
+        assert msg["line"] == "Green Line"
+        assert [tuple(u.values()) for u in msg["updates"]] == rows
+
+    def test_proxy_sends_deltas_over_one_connection(self):
+        import time
+        from network_ctc_proxy import NetworkCTCProxy
+        from trackControllerHW.track_controller_hw_backend import WaysideStatusUpdate
+        from CTC.track_controller_hw_server import HardwareTrackControllerServer
+
+        received = []
+
+        class _CTC:
+            def update_block_occupancy(self, line, block, occupied):
+                received.append((block, occupied))
+
+        server = HardwareTrackControllerServer({"Green Line": _CTC()}, "127.0.0.1", 0)
+        server.start()
+        proxy = NetworkCTCProxy("127.0.0.1", server.port)
+        try:
+            status = [WaysideStatusUpdate(b, False, "N/A", None, None) for b in range(63, 67)]
+            proxy.receive_wayside_status("Green Line", status)
+            status[1] = WaysideStatusUpdate(64, True, "N/A", None, None)
+            proxy.receive_wayside_status("Green Line", status)
+            proxy.receive_wayside_status("Green Line", status)
+            deadline = time.time() + 5
+            while server.updates_received < 5 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            proxy.close()
+            server.stop()
+        assert proxy.frames_sent == 2
+        assert received == [(63, False), (64, False), (65, False), (66, False), (64, True)]
+
+    def test_async_server_applies_updates_on_drain(self):
+        import threading
+        import time
+        from network_ctc_proxy import NetworkCTCProxy
+        from trackControllerHW.track_controller_hw_backend import WaysideStatusUpdate
+        from CTC.track_controller_hw_server import AsyncHardwareTrackControllerServer
+
+        received = []
+        threads = set()
+
+        class _CTC:
+            def update_block_occupancy(self, line, block, occupied):
+                threads.add(threading.get_ident())
+                received.append((block, occupied))
+
+        server = AsyncHardwareTrackControllerServer(
+            {"Green Line": _CTC()}, "127.0.0.1", 0, max_pending=2)
+        server.start()
+        proxies = [NetworkCTCProxy("127.0.0.1", server.port) for _ in range(8)]
+        try:
+            for i, proxy in enumerate(proxies):
+                for occupied in (True, False, True):
+                    proxy.receive_wayside_status(
+                        "Green Line", [WaysideStatusUpdate(i + 1, occupied, "N/A", None, None)])
+            deadline = time.time() + 5
+            while server.pending() < 16 and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.05)
+            # two queued per client; the third waits for a drain
+            assert server.pending() == 16
+            assert received == []
+            applied = server.drain()
+            while server.pending() < 8 and time.time() < deadline:
+                time.sleep(0.01)
+            applied += server.drain()
+        finally:
+            for proxy in proxies:
+                proxy.close()
+            server.stop()
+        assert applied == 24
+        assert threads == {threading.get_ident()}
+        assert sorted(received) == sorted(
+            (i + 1, occ) for i in range(8) for occ in (True, False, True))
+
+def test_event_feed_tracks_signals():
+    from trackModel.track_model_backend import (
+        Direction, TrackNetwork, TrackSegment, TrackSwitch)
+
+    network = TrackNetwork()
+    for i in range(1, 151):
+        cls = TrackSwitch if i in (60, 77) else TrackSegment
+        network.add_segment(cls(i, 100, 20, 0, 0, False, Direction.FORWARD))
+    controller = HardwareTrackControllerBackend(network, "Green Line")
+    controller._poll_track_model()
+    assert controller._event_feed_synced
+
+    network.segments[60].set_signal_state(0, SignalState.GREEN)
+    network.segments[77].set_signal_state(1, SignalState.YELLOW)
+    assert controller._known_signal[60] == SignalState.GREEN
+    assert controller._switch_signals[(77, 1)] == SignalState.YELLOW
+    assert controller._pending_state_change
+
+def test_event_feed_reads_network_occupancy():
+    from trackModel.track_model_backend import (
+        Direction, TrackNetwork, TrackSegment)
+
+    network = TrackNetwork()
+    for i in range(1, 151):
+        network.add_segment(TrackSegment(i, 100, 20, 0, 0, False, Direction.FORWARD))
+    controller = HardwareTrackControllerBackend(network, "Green Line")
+    controller._poll_track_model()
+
+    network.segments[60].set_occupancy(True)
+    assert controller._known_occupancy.bits == network.occupancy_bits
+    assert controller._previous_occupancy[60] is True
+    assert controller._occupancy_timestamps[60] == controller.time
+    assert controller._pending_state_change
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
\ No newline at end of file
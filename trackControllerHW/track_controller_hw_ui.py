@@ -38,6 +38,7 @@ YELLOW = SignalState.YELLOW
 GREEN = SignalState.GREEN
 
 from universal.global_clock import clock as global_clock
+from universal.refresh_bus import refresh_bus
 
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor
@@ -83,10 +84,7 @@ class TrackControllerHWUI(QWidget):
         self.maintenance_enabled = False
         self.current_plc_path = "None"
 
-        self._refresh_pending = False
-        self._refresh_timer = QTimer(self)
-        self._refresh_timer.setSingleShot(True)
-        self._refresh_timer.timeout.connect(self._do_deferred_refresh)
+        refresh_bus.start()
 
         for c in self.controllers.values():
             try:
@@ -106,21 +104,15 @@ class TrackControllerHWUI(QWidget):
         self.refresh_all()
 
         try:
-            global_clock.register_listener(self._update_clock_display)
+            # the clock may tick on the sim worker thread; repaint on the UI thread
+            global_clock.register_listener(refresh_bus.listener(self._refresh_clock_display))
             self._update_clock_display(global_clock.get_time())
         except Exception:
             logger.exception("Failed to hook HW UI into global clock")
 
     def _request_refresh(self) -> None:
-        """Request a debounced refresh."""
-        if not self._refresh_pending:
-            self._refresh_pending = True
-            self._refresh_timer.start(50)
-
-    def _do_deferred_refresh(self) -> None:
-        """Execute the deferred refresh."""
-        self._refresh_pending = False
-        self.refresh_all()
+        """Request a coalesced refresh on the next UI frame (any thread)."""
+        refresh_bus.mark_dirty(self.refresh_all)
 
     def _apply_stylesheet(self) -> None:
         """Apply the UI stylesheet."""
@@ -339,6 +331,10 @@ class TrackControllerHWUI(QWidget):
             self._hb_timer.stop()
             QTimer.singleShot(2000, lambda: self._hb_timer.start(1000))
 
+    def _refresh_clock_display(self) -> None:
+        """Show the clock's current time (refresh bus callback)."""
+        self._update_clock_display(global_clock.get_time())
+
     def _update_clock_display(self, current_time) -> None:
         """Update the clock display."""
         try:
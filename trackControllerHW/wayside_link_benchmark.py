@@ -0,0 +1,178 @@
+"""Loopback benchmark for the HW wayside -> CTC status link.
+
+Sends status batches for a 150-block line through a local
+HardwareTrackControllerServer, first the old way (a new connection and
+the full JSON list per batch) and then through NetworkCTCProxy (one
+connection, binary frames, changed blocks only). Reports batches/s
+delivered end to end and bytes on the wire per batch and per block update.
+
+Example:
+    python trackControllerHW/wayside_link_benchmark.py --batches 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import socket
+import sys
+import time
+from typing import Any, Optional
+
+_PKG_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _PKG_ROOT not in sys.path:
+    sys.path.insert(0, _PKG_ROOT)
+
+from CTC.track_controller_hw_server import HardwareTrackControllerServer
+from trackControllerHW.network_ctc_proxy import NetworkCTCProxy
+from trackControllerHW.track_controller_hw_backend import (
+    SignalState,
+    WaysideStatusUpdate,
+)
+
+LINE = "Green Line"
+
+
+class _NullCTC:
+    """CTC stand-in that accepts and discards block updates."""
+
+    def update_block_occupancy(self, line: str, block: int, occupied: bool) -> None:
+        pass
+
+    def update_signal_state(self, line: str, block: int, state: Any) -> None:
+        pass
+
+    def update_switch_position(self, line: str, block: int, pos: Any) -> None:
+        pass
+
+    def update_crossing_status(self, line: str, block: int, status: Any) -> None:
+        pass
+
+
+def _batches(count: int, blocks: int, changes: int) -> list[list[WaysideStatusUpdate]]:
+    """Full-line status batches where `changes` blocks flip each batch."""
+    occupied = [False] * (blocks + 1)
+    batches = []
+    for i in range(count):
+        for k in range(changes):
+            b = 1 + (i * changes + k) % blocks
+            occupied[b] = not occupied[b]
+        batches.append([
+            WaysideStatusUpdate(
+                b,
+                occupied[b],
+                SignalState.RED if occupied[b] else SignalState.GREEN,
+                "Straight" if b in (13, 29, 57, 63, 77, 85) else None,
+                "Inactive" if b in (19, 108) else None,
+            )
+            for b in range(1, blocks + 1)
+        ])
+    return batches
+
+
+def _legacy_send(host: str, port: int, updates: list[WaysideStatusUpdate]) -> int:
+    """The pre-framing proxy: new connection, whole line as JSON."""
+    payload = {
+        "type": "wayside_status",
+        "line": LINE,
+        "updates": [
+            {
+                "block_id": int(s.block_id),
+                "occupied": bool(s.occupied),
+                "signal_state": str(s.signal_state),
+                "switch_position": s.switch_position,
+                "crossing_status": s.crossing_status,
+            }
+            for s in updates
+        ],
+    }
+    data = (json.dumps(payload) + "\n").encode("utf-8")
+    with socket.create_connection((host, port), timeout=2.0) as sock:
+        sock.sendall(data)
+    return len(data)
+
+
+def _wait_for(server: HardwareTrackControllerServer, frames: int,
+              timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while server.frames_received < frames:
+        if time.perf_counter() > deadline:
+            raise TimeoutError(
+                f"server saw {server.frames_received} of {frames} frames"
+            )
+        time.sleep(0.0005)
+
+
+def run(batches: int = 1000, blocks: int = 150, changes: int = 2) -> dict[str, float]:
+    """Run the benchmark.
+
+    Args:
+        batches: Status batches to send per mode.
+        blocks: Blocks per batch (the whole line is reported each time).
+        changes: Blocks whose occupancy flips between batches.
+
+    Returns:
+        Throughput and size figures for both modes.
+    """
+    server = HardwareTrackControllerServer({LINE: _NullCTC()}, "127.0.0.1", 0)
+    server.start()
+    data = _batches(batches, blocks, changes)
+    try:
+        start = time.perf_counter()
+        legacy_bytes = 0
+        for updates in data:
+            legacy_bytes += _legacy_send("127.0.0.1", server.port, updates)
+        _wait_for(server, batches)
+        legacy_s = time.perf_counter() - start
+        legacy_updates = server.updates_received
+
+        base_frames = server.frames_received
+        base_updates = server.updates_received
+        proxy = NetworkCTCProxy("127.0.0.1", server.port)
+        start = time.perf_counter()
+        for updates in data:
+            proxy.receive_wayside_status(LINE, updates)
+        _wait_for(server, base_frames + proxy.frames_sent)
+        framed_s = time.perf_counter() - start
+        proxy.close()
+        framed_updates = server.updates_received - base_updates
+    finally:
+        server.stop()
+
+    return {
+        "batches": float(batches),
+        "legacy_batches_per_s": batches / legacy_s,
+        "legacy_bytes_per_batch": legacy_bytes / batches,
+        "legacy_bytes_per_update": legacy_bytes / legacy_updates,
+        "framed_batches_per_s": batches / framed_s,
+        "framed_bytes_per_batch": proxy.bytes_sent / batches,
+        "framed_bytes_per_update": proxy.bytes_sent / max(1, framed_updates),
+        "framed_frames": float(proxy.frames_sent),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> dict[str, float]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batches", type=int, default=1000)
+    parser.add_argument("--blocks", type=int, default=150)
+    parser.add_argument("--changes", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    r = run(args.batches, args.blocks, args.changes)
+    print(
+        f"[WaysideLinkBenchmark] {args.blocks} blocks, {args.changes} changes/batch: "
+        f"JSON per-connection {r['legacy_batches_per_s']:.0f} batches/s, "
+        f"{r['legacy_bytes_per_batch']:.0f} B/batch "
+        f"({r['legacy_bytes_per_update']:.1f} B/update) -> "
+        f"framed delta {r['framed_batches_per_s']:.0f} batches/s, "
+        f"{r['framed_bytes_per_batch']:.0f} B/batch "
+        f"({r['framed_bytes_per_update']:.1f} B/update)"
+    )
+    return r
+
+
+if __name__ == "__main__":
+    main()
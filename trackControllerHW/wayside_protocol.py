@@ -0,0 +1,158 @@
+"""Binary framing for wayside status sent from the Pi to the CTC laptop.
+
+Every frame on the TCP stream is a 4-byte big-endian payload length
+followed by the payload. A wayside status payload is::
+
+    u8  message type (MSG_WAYSIDE_STATUS)
+    u8  line name length, then the UTF-8 line name
+    u8  value count, then that many values (see below)
+    u16 update count, then that many 6-byte updates:
+        u16 block_id, u8 occupied,
+        u8 signal_state / switch_position / crossing_status value index
+
+Values are the distinct signal/switch/crossing values in the frame, so
+arbitrary strings survive the trip without repeating them per block.
+Each is a tag byte (None, False, True, or a u8-length UTF-8 string).
+
+Only blocks whose status changed since the last frame are sent (see
+NetworkCTCProxy); the server applies each update as it did for JSON.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Any, Iterable
+
+FRAME_HEADER = struct.Struct("!I")
+UPDATE = struct.Struct("!HBBBB")
+
+MSG_WAYSIDE_STATUS = 1
+MAX_FRAME_BYTES = 1 << 20
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_STR = 3
+
+# (block_id, occupied, signal_state, switch_position, crossing_status)
+StatusTuple = tuple[int, bool, Any, Any, Any]
+
+
+class ProtocolError(ValueError):
+    """Raised for frames that don't follow the wayside protocol."""
+
+
+def _value_key(value: Any) -> Any:
+    """Table key for a value; keeps True/1 and False/0 apart."""
+    return (type(value), value)
+
+
+def _encode_value(value: Any, out: bytearray) -> None:
+    if value is None:
+        out.append(_TAG_NONE)
+    elif value is False:
+        out.append(_TAG_FALSE)
+    elif value is True:
+        out.append(_TAG_TRUE)
+    else:
+        data = str(value).encode("utf-8")
+        if len(data) > 255:
+            raise ProtocolError(f"value too long to encode: {value!r}")
+        out.append(_TAG_STR)
+        out.append(len(data))
+        out += data
+
+
+def encode_wayside_status(line_name: str, updates: Iterable[StatusTuple]) -> bytes:
+    """Encode one framed wayside status message.
+
+    Args:
+        line_name: Name of the rail line.
+        updates: (block_id, occupied, signal_state, switch_position,
+            crossing_status) tuples. Values other than None/True/False are
+            sent as strings.
+
+    Returns:
+        The frame, length prefix included.
+    """
+    values: list[Any] = []
+    index: dict[Any, int] = {}
+    packed = bytearray()
+    count = 0
+    for block_id, occupied, signal, switch, crossing in updates:
+        refs = []
+        for value in (signal, switch, crossing):
+            key = _value_key(value)
+            ref = index.get(key)
+            if ref is None:
+                if len(values) == 255:
+                    raise ProtocolError("too many distinct values in one frame")
+                ref = index[key] = len(values)
+                values.append(value)
+            refs.append(ref)
+        packed += UPDATE.pack(int(block_id), 1 if occupied else 0, *refs)
+        count += 1
+    if count > 0xFFFF:
+        raise ProtocolError("too many updates in one frame")
+
+    name = line_name.encode("utf-8")
+    if len(name) > 255:
+        raise ProtocolError(f"line name too long: {line_name!r}")
+    payload = bytearray((MSG_WAYSIDE_STATUS, len(name)))
+    payload += name
+    payload.append(len(values))
+    for value in values:
+        _encode_value(value, payload)
+    payload += count.to_bytes(2, "big")
+    payload += packed
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_wayside_status(payload: memoryview | bytes) -> dict[str, Any]:
+    """Decode a frame payload (without the length prefix).
+
+    Returns:
+        The same message dict the JSON protocol carried:
+        {"type": "wayside_status", "line": ..., "updates": [...]}.
+
+    Raises:
+        ProtocolError: If the payload is malformed.
+    """
+    try:
+        if payload[0] != MSG_WAYSIDE_STATUS:
+            raise ProtocolError(f"unknown message type {payload[0]}")
+        pos = 2 + payload[1]
+        line_name = bytes(payload[2:pos]).decode("utf-8")
+
+        values: list[Any] = []
+        count = payload[pos]
+        pos += 1
+        for _ in range(count):
+            tag = payload[pos]
+            pos += 1
+            if tag == _TAG_STR:
+                end = pos + 1 + payload[pos]
+                values.append(bytes(payload[pos + 1:end]).decode("utf-8"))
+                pos = end
+            elif tag <= _TAG_TRUE:
+                values.append((None, False, True)[tag])
+            else:
+                raise ProtocolError(f"unknown value tag {tag}")
+
+        n_updates = int.from_bytes(payload[pos:pos + 2], "big")
+        pos += 2
+        if len(payload) - pos != n_updates * UPDATE.size:
+            raise ProtocolError("update section has the wrong length")
+        updates = [
+            {
+                "block_id": block_id,
+                "occupied": bool(occupied),
+                "signal_state": values[signal],
+                "switch_position": values[switch],
+                "crossing_status": values[crossing],
+            }
+            for block_id, occupied, signal, switch, crossing
+            in UPDATE.iter_unpack(payload[pos:])
+        ]
+    except (IndexError, UnicodeDecodeError, struct.error) as e:
+        raise ProtocolError(f"malformed wayside status frame: {e}") from e
+    return {"type": "wayside_status", "line": line_name, "updates": updates}
@@ -0,0 +1,128 @@
+"""Micro-benchmark for the wayside controller's territory lookups.
+
+Times one controller tick on the 150-block Green Line (occupancy change,
+PLC pass, CTC status report) and compares block-membership lookups done the
+old way — rebuilding a filtered list from LINE_BLOCK_MAP and scanning it —
+against the cached TerritoryIndex.
+
+Example:
+    python trackControllerSW/territory_benchmark.py --ticks 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+_PKG_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _PKG_ROOT not in sys.path:
+    sys.path.append(_PKG_ROOT)
+
+from trackControllerSW.track_controller_backend import (
+    LINE_BLOCK_MAP,
+    TrackControllerBackend,
+)
+from trackModel.track_model_backend import Direction, TrackNetwork, TrackSegment
+
+PLC_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'PLC files', 'plc_green_test.py'
+)
+
+
+class _NullCTC:
+    """CTC stand-in that accepts and discards wayside status."""
+
+    def receive_wayside_status(self, line: str, updates: list) -> None:
+        pass
+
+
+def _build_controller(line_name: str) -> TrackControllerBackend:
+    """Build a controller over a plain segment network with the PLC loaded."""
+    network = TrackNetwork()
+    for block_id in LINE_BLOCK_MAP[line_name]:
+        network.add_segment(
+            TrackSegment(block_id, 100, 20, 0, 0, False, Direction.FORWARD)
+        )
+    controller = TrackControllerBackend(network, line_name)
+    controller.set_ctc_backend(_NullCTC())
+    controller.maintenance_mode = True
+    controller.upload_plc(PLC_PATH)
+    controller.maintenance_mode = False
+    controller._poll_track_model()
+    return controller
+
+
+def _legacy_line_block_ids(controller: TrackControllerBackend) -> List[int]:
+    """The pre-index lookup: rebuild the filtered list on every call."""
+    block_range = LINE_BLOCK_MAP.get(controller.line_name)
+    if block_range is None:
+        return sorted(controller.track_model.segments.keys())
+    return [b for b in block_range if b in controller.track_model.segments]
+
+
+def run(ticks: int = 1000, line_name: str = 'Green Line') -> Dict[str, float]:
+    """Run the benchmark.
+
+    Args:
+        ticks: Number of controller ticks / lookup passes to time.
+        line_name: Line to build.
+
+    Returns:
+        Timings in microseconds per tick or per pass.
+    """
+    controller = _build_controller(line_name)
+    blocks = list(controller._line_block_ids())
+    segments = controller.track_model.segments
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        block_id = blocks[i % len(blocks)]
+        segments[block_id].set_occupancy(not segments[block_id].occupied)
+        controller._poll_track_model()
+    tick_us = (time.perf_counter() - start) / ticks * 1e6
+
+    # One membership check per block, as a per-block PLC pass does.
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for block_id in blocks:
+            _ = block_id + 1 in _legacy_line_block_ids(controller)
+    legacy_us = (time.perf_counter() - start) / ticks * 1e6
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for block_id in blocks:
+            _ = block_id + 1 in controller._territory().members
+    index_us = (time.perf_counter() - start) / ticks * 1e6
+
+    return {
+        'blocks': float(len(blocks)),
+        'tick_us': tick_us,
+        'legacy_lookup_pass_us': legacy_us,
+        'index_lookup_pass_us': index_us,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--line', default='Green Line')
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    result = run(args.ticks, args.line)
+    print(
+        f"[TerritoryBenchmark] {args.line} ({result['blocks']:.0f} blocks): "
+        f"{result['tick_us']:.1f} us/tick; per-block lookup pass "
+        f"{result['legacy_lookup_pass_us']:.1f} us (list) -> "
+        f"{result['index_lookup_pass_us']:.1f} us (index)"
+    )
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -12,17 +12,23 @@ import math
 import os
 import sys
 import threading
-import time
 from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set,
+    Tuple, Union,
+)
 
 _PKG_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if _PKG_ROOT not in sys.path:
     sys.path.append(_PKG_ROOT)
 
-from trackModel.track_model_backend import TrackNetwork
+from trackModel.track_model_backend import TrackEventType, TrackNetwork
+from universal.block_bits import BlockBits, BlockBitsOverlay, iter_bits
+from universal.controller_registry import poller
+from universal.global_clock import SimPhase, clock
+from universal.plc_engine import PLCEngine
 from universal.universal import ConversionFunctions, SignalState
 
 logger = logging.getLogger(__name__)
@@ -82,6 +88,48 @@ class CommandVerification:
     verified: bool = False
 
 
+@dataclass(frozen=True)
+class TerritoryIndex:
+    """Read-only index of the blocks a controller owns.
+
+    Built once per track layout so per-block lookups in the PLC pass are
+    set/dict hits instead of rebuilding and scanning a filtered list.
+    """
+
+    blocks: Tuple[int, ...]
+    members: FrozenSet[int]
+    neighbours: Dict[int, Tuple[int, ...]]
+    mask: int
+
+    @classmethod
+    def build(
+        cls, line_name: str, segment_ids: Iterable[int]
+    ) -> 'TerritoryIndex':
+        """Build the index for a line from the Track Model's block IDs.
+
+        Args:
+            line_name: The name of the railway line.
+            segment_ids: Block IDs present in the Track Model.
+
+        Returns:
+            The territory index for the line.
+        """
+        present = set(segment_ids)
+        block_range = LINE_BLOCK_MAP.get(line_name)
+        if block_range is None:
+            blocks = tuple(sorted(present))
+        else:
+            blocks = tuple(b for b in block_range if b in present)
+        members = frozenset(blocks)
+        neighbours = {
+            b: tuple(n for n in (b - 1, b + 1) if n in members) for b in blocks
+        }
+        mask = 0
+        for b in blocks:
+            mask |= 1 << b
+        return cls(blocks, members, neighbours, mask)
+
+
 class FailureDetection:
     """Mixin class providing failure detection and handling capabilities."""
 
@@ -342,7 +390,7 @@ class FailureDetection:
                 max(1, block_id - 2), min(block_id + 3, self.num_blocks + 1)
             )
             for nearby_block in nearby_range:
-                if nearby_block in self._line_block_ids():
+                if nearby_block in self._territory().members:
                     self.set_signal(nearby_block, SignalState.RED)
         except Exception:
             logger.exception('Failed to set signals for track circuit failure')
@@ -356,12 +404,7 @@ class FailureDetection:
         Returns:
             List of adjacent block IDs that are valid for this line.
         """
-        adjacent = []
-        if block_id > 1:
-            adjacent.append(block_id - 1)
-        if block_id < self.num_blocks:
-            adjacent.append(block_id + 1)
-        return [b for b in adjacent if b in self._line_block_ids()]
+        return list(self._territory().neighbours.get(block_id, ()))
 
     def get_failure_report(self) -> Dict[str, Any]:
         """Get a comprehensive failure report.
@@ -451,7 +494,10 @@ class FailureDetection:
         yellow_factor = getattr(plc_module, 'YELLOW_SPEED_FACTOR', 0.5)
         approach_factor = getattr(plc_module, 'APPROACH_SPEED_FACTOR', 0.7)
 
-        for block_id in self._line_block_ids():
+        territory = self._territory()
+        members = territory.members
+
+        for block_id in territory.blocks:
             try:
                 # Get base values from PLC module
                 base_speed = getattr(
@@ -522,7 +568,7 @@ class FailureDetection:
                     adjusted_speed = int(adjusted_speed * occupancy_factor)
                 else:
                     next_block = block_id + 1
-                    if next_block in self._line_block_ids():
+                    if next_block in members:
                         if self._known_occupancy.get(next_block, False):
                             adjusted_speed = int(
                                 adjusted_speed * approach_factor
@@ -540,12 +586,12 @@ class FailureDetection:
                         next_block = block_id + distance
                         prev_occupied = (
                             self._known_occupancy.get(prev_block, False)
-                            if prev_block in self._line_block_ids()
+                            if prev_block in members
                             else False
                         )
                         next_occupied = (
                             self._known_occupancy.get(next_block, False)
-                            if next_block in self._line_block_ids()
+                            if next_block in members
                             else False
                         )
                         if prev_occupied or next_occupied:
@@ -615,7 +661,7 @@ class FailureDetection:
                 continue
 
         logger.info(
-            'Dynamic PLC logic applied to %d blocks', len(self._line_block_ids())
+            'Dynamic PLC logic applied to %d blocks', len(territory.blocks)
         )
 
     def _get_next_blocks(self, block_id: int) -> List[int]:
@@ -633,7 +679,7 @@ class FailureDetection:
             next_blocks.extend(self.switch_map[block_id])
         else:
             next_block = block_id + 1
-            if next_block in self._line_block_ids():
+            if next_block in self._territory().members:
                 next_blocks.append(next_block)
 
         return next_blocks
@@ -670,13 +716,19 @@ class TrackControllerBackend(FailureDetection):
         self.crossings: Dict[int, bool] = {}
         self.crossing_blocks: Dict[int, int] = {}
 
+        # Territory index, rebuilt only when the Track Model layout changes
+        self._territory_index: Optional[TerritoryIndex] = None
+        self._territory_key: Optional[Tuple[Any, int]] = None
+
         # State tracking
         self._listeners: List[Callable[[], None]] = []
         self.time = datetime(2000, 1, 1, 0, 0, 0)
         self.maintenance_mode: bool = False
 
-        # Known state from Track Model
-        self._known_occupancy: Dict[int, bool] = {}
+        # Known state from Track Model (occupancy maps are bit-packed, so
+        # previous/current comparisons are a single XOR; see
+        # _occupancy_source for where current occupancy lives)
+        self._known_occupancy = self._occupancy_source()
         self._known_signal: Dict[int, SignalState] = {}
         self._known_commanded_speed: Dict[int, int] = {}
         self._known_commanded_auth: Dict[int, int] = {}
@@ -687,7 +739,7 @@ class TrackControllerBackend(FailureDetection):
         # Failure detection
         self.failures: Dict[str, FailureRecord] = {}
         self.failure_history: List[FailureRecord] = []
-        self._previous_occupancy: Dict[int, bool] = {}
+        self._previous_occupancy = BlockBits()
         self._occupancy_changes: Dict[int, datetime] = {}
         self._pending_verifications: Dict[str, CommandVerification] = {}
         self._verification_timeout = timedelta(seconds=5)
@@ -698,12 +750,19 @@ class TrackControllerBackend(FailureDetection):
 
         # PLC module
         self._plc_module = None
-        self._previous_occupancies: Dict[int, bool] = {}
+        self._plc_engine: Optional[PLCEngine] = None
+        self._previous_occupancies = BlockBits()
 
         # Threading
         self._live_thread_lock = threading.Lock()
         self._live_thread_running: bool = False
 
+        # Change feed from the Track Model (replaces the full-line scan)
+        self._event_feed: bool = False
+        self._event_feed_synced: bool = False
+        self._pending_state_change: bool = False
+        self._pending_occupancy_change: bool = False
+
         # CTC integration
         self.ctc_backend = None
         self._ctc_update_enabled: bool = True
@@ -722,6 +781,26 @@ class TrackControllerBackend(FailureDetection):
         # Setup
         self._initialize_infrastructure()
         self._initial_sync()
+        if hasattr(self.track_model, 'subscribe'):
+            self.track_model.subscribe(self._on_track_event)
+            self._event_feed = True
+
+    def _occupancy_source(self) -> Union[BlockBits, BlockBitsOverlay]:
+        """Build the map this controller reads block occupancy from.
+
+        A TrackNetwork owns the packed occupancy of every block, so it is
+        read through a live view limited to this territory (the mask is
+        set by _territory()); only writes that disagree with the network,
+        such as Track Model messages, are kept here. Other track models
+        get a BlockBits filled by the sync and poll paths.
+
+        Returns:
+            The occupancy map.
+        """
+        occupancy_view = getattr(self.track_model, 'occupancy_view', None)
+        if occupancy_view is None:
+            return BlockBits()
+        return BlockBitsOverlay(occupancy_view(), mask=0)
 
     def set_ctc_backend(self, ctc_backend: Any) -> None:
         """Connect this controller to a CTC backend.
@@ -755,7 +834,7 @@ class TrackControllerBackend(FailureDetection):
             suggested_speed_mps: Suggested speed in meters per second.
             suggested_auth_m: Suggested authority in meters.
         """
-        if block not in self._line_block_ids():
+        if block not in self._territory().members:
             logger.warning(
                 'CTC provided invalid block %d for %s', block, self.line_name
             )
@@ -772,6 +851,45 @@ class TrackControllerBackend(FailureDetection):
         )
         self._notify_listeners()
 
+    def receive_ctc_suggestions_bulk(
+        self, suggestions: Mapping[int, Tuple[float, float]]
+    ) -> int:
+        """Receive a full set of speed/authority suggestions from CTC.
+
+        Only blocks whose suggestion differs from the last one received are
+        updated, and listeners are notified once for the whole batch.
+        Blocks outside this line are ignored.
+
+        Args:
+            suggestions: Mapping of block ID to (speed m/s, authority m).
+
+        Returns:
+            Number of blocks whose suggestion changed.
+        """
+        members = self._territory().members
+        speeds = self._suggested_speed_mps
+        auths = self._suggested_auth_m
+        changed = 0
+
+        for block, (speed_mps, auth_m) in suggestions.items():
+            if block not in members:
+                continue
+            if speeds.get(block) == speed_mps and auths.get(block) == auth_m:
+                continue
+            speeds[block] = speed_mps
+            auths[block] = auth_m
+            changed += 1
+
+        if changed:
+            logger.debug(
+                '%s: CTC bulk suggestion updated %d of %d blocks',
+                self.line_name,
+                changed,
+                len(suggestions),
+            )
+            self._notify_listeners()
+        return changed
+
     def _send_status_to_ctc(self) -> None:
         """Send current wayside status to CTC."""
         if not self._ctc_update_enabled or self.ctc_backend is None:
@@ -887,7 +1005,7 @@ class TrackControllerBackend(FailureDetection):
                     except (ValueError, TypeError):
                         continue
 
-                    if block_id_int not in self._line_block_ids():
+                    if block_id_int not in self._territory().members:
                         continue
 
                     if not isinstance(info, dict):
@@ -1031,7 +1149,7 @@ class TrackControllerBackend(FailureDetection):
             block_id: The block to command.
             speed_mps: Speed in meters per second.
         """
-        if block_id not in self._line_block_ids():
+        if block_id not in self._territory().members:
             logger.warning(
                 'Cannot set commanded speed: block %d not in %s',
                 block_id,
@@ -1073,7 +1191,7 @@ class TrackControllerBackend(FailureDetection):
             block_id: The block to command.
             authority_m: Authority in meters.
         """
-        if block_id not in self._line_block_ids():
+        if block_id not in self._territory().members:
             logger.warning(
                 'Cannot set commanded authority: block %d not in %s',
                 block_id,
@@ -1181,56 +1299,47 @@ class TrackControllerBackend(FailureDetection):
             return
 
         try:
-            # Prepare occupancy arrays
-            max_blocks = (
-                max(self._line_block_ids()) + 1
-                if self._line_block_ids()
-                else 151
-            )
-            block_occupancies = [False] * max_blocks
-            previous_occupancies = [False] * max_blocks
-            stop = [False] * max_blocks
+            # Refresh the engine's persistent input arrays
+            line_blocks = self._line_block_ids()
+            engine = self._plc_engine_for(line_blocks)
+            (
+                block_occupancies,
+                switch_positions,
+                _,
+                crossing_signals,
+                previous_occupancies,
+                _,
+            ) = engine.inputs
 
-            for block_id in self._line_block_ids():
+            occupancy_bits = self._known_occupancy.bits
+            previous_bits = self._previous_occupancies.bits
+            for block_id in line_blocks:
                 if block_id < len(block_occupancies):
-                    block_occupancies[block_id] = self._known_occupancy.get(
-                        block_id, False
+                    block_occupancies[block_id] = bool(
+                        occupancy_bits >> block_id & 1
                     )
-                    previous_occupancies[block_id] = (
-                        self._previous_occupancies.get(block_id, False)
+                    previous_occupancies[block_id] = bool(
+                        previous_bits >> block_id & 1
                     )
 
-            # Prepare switch positions
-            switch_positions = [0] * max(10, len(self.switches))
-            for idx, (switch_id, position) in enumerate(self.switches.items()):
+            for idx, position in enumerate(self.switches.values()):
                 if idx < len(switch_positions):
                     switch_positions[idx] = position
 
-            # Prepare signals
-            light_signals = [False] * (len(self.switches) * 3)
-
-            # Prepare crossing signals
-            crossing_signals = [False] * max(10, len(self.crossings))
-            for idx, (crossing_id, status) in enumerate(self.crossings.items()):
+            for idx, status in enumerate(self.crossings.values()):
                 if idx < len(crossing_signals):
                     crossing_signals[idx] = status
 
             logger.info('Executing PLC logic')
 
-            # Execute PLC logic
+            # Execute PLC logic (skipped by the engine if nothing it reads
+            # changed since the last run)
             (
                 switch_positions,
                 light_signals,
                 crossing_signals,
                 stop,
-            ) = self._plc_module.plc_logic(
-                block_occupancies,
-                switch_positions,
-                light_signals,
-                crossing_signals,
-                previous_occupancies,
-                stop,
-            )
+            ) = engine.run()
 
             # Apply switch positions
             for idx, (switch_id, _) in enumerate(self.switches.items()):
@@ -1266,21 +1375,22 @@ class TrackControllerBackend(FailureDetection):
                         if light_signals[signal_idx_base]
                         else SignalState.RED
                     )
-                    try:
-                        self.track_model.set_signal_state(
-                            switch_id, 0, signal_state
-                        )
-                        self._switch_signals[(switch_id, 0)] = signal_state
-                        logger.debug(
-                            'PLC set switch %d previous signal: %s',
-                            switch_id,
-                            signal_state,
-                        )
-                    except Exception:
-                        logger.exception(
-                            'Failed to set switch %d previous signal',
-                            switch_id,
-                        )
+                    if self._switch_signals.get((switch_id, 0)) != signal_state:
+                        try:
+                            self.track_model.set_signal_state(
+                                switch_id, 0, signal_state
+                            )
+                            self._switch_signals[(switch_id, 0)] = signal_state
+                            logger.debug(
+                                'PLC set switch %d previous signal: %s',
+                                switch_id,
+                                signal_state,
+                            )
+                        except Exception:
+                            logger.exception(
+                                'Failed to set switch %d previous signal',
+                                switch_id,
+                            )
 
                 # Straight signal
                 if signal_idx_base + 1 < len(light_signals):
@@ -1289,21 +1399,22 @@ class TrackControllerBackend(FailureDetection):
                         if light_signals[signal_idx_base + 1]
                         else SignalState.RED
                     )
-                    try:
-                        self.track_model.set_signal_state(
-                            switch_id, 1, signal_state
-                        )
-                        self._switch_signals[(switch_id, 1)] = signal_state
-                        logger.debug(
-                            'PLC set switch %d straight signal: %s',
-                            switch_id,
-                            signal_state,
-                        )
-                    except Exception:
-                        logger.exception(
-                            'Failed to set switch %d straight signal',
-                            switch_id,
-                        )
+                    if self._switch_signals.get((switch_id, 1)) != signal_state:
+                        try:
+                            self.track_model.set_signal_state(
+                                switch_id, 1, signal_state
+                            )
+                            self._switch_signals[(switch_id, 1)] = signal_state
+                            logger.debug(
+                                'PLC set switch %d straight signal: %s',
+                                switch_id,
+                                signal_state,
+                            )
+                        except Exception:
+                            logger.exception(
+                                'Failed to set switch %d straight signal',
+                                switch_id,
+                            )
 
                 # Diverging signal
                 if signal_idx_base + 2 < len(light_signals):
@@ -1312,21 +1423,22 @@ class TrackControllerBackend(FailureDetection):
                         if light_signals[signal_idx_base + 2]
                         else SignalState.RED
                     )
-                    try:
-                        self.track_model.set_signal_state(
-                            switch_id, 2, signal_state
-                        )
-                        self._switch_signals[(switch_id, 2)] = signal_state
-                        logger.debug(
-                            'PLC set switch %d diverging signal: %s',
-                            switch_id,
-                            signal_state,
-                        )
-                    except Exception:
-                        logger.exception(
-                            'Failed to set switch %d diverging signal',
-                            switch_id,
-                        )
+                    if self._switch_signals.get((switch_id, 2)) != signal_state:
+                        try:
+                            self.track_model.set_signal_state(
+                                switch_id, 2, signal_state
+                            )
+                            self._switch_signals[(switch_id, 2)] = signal_state
+                            logger.debug(
+                                'PLC set switch %d diverging signal: %s',
+                                switch_id,
+                                signal_state,
+                            )
+                        except Exception:
+                            logger.exception(
+                                'Failed to set switch %d diverging signal',
+                                switch_id,
+                            )
 
             # Apply crossing states
             for idx, (crossing_id, _) in enumerate(self.crossings.items()):
@@ -1375,17 +1487,52 @@ class TrackControllerBackend(FailureDetection):
                         )
 
             # Update previous occupancies
-            for block_id in self._line_block_ids():
-                if block_id < len(block_occupancies):
-                    self._previous_occupancies[block_id] = block_occupancies[
-                        block_id
-                    ]
+            self._previous_occupancies.store(
+                self._territory().mask, occupancy_bits
+            )
 
             logger.info('PLC logic executed successfully')
 
         except Exception:
             logger.exception('PLC logic execution failed')
 
+    def _plc_engine_for(self, line_blocks: List[int]) -> PLCEngine:
+        """Return the PLC engine for the loaded module, rebuilding it if the
+        module or the array sizes (line length, switch/crossing count) changed.
+
+        Args:
+            line_blocks: Sorted block IDs on this line.
+
+        Returns:
+            The PLCEngine wrapping the current plc_logic function.
+        """
+        max_blocks = line_blocks[-1] + 1 if line_blocks else 151
+        num_switches = max(10, len(self.switches))
+        num_signals = len(self.switches) * 3
+        num_crossings = max(10, len(self.crossings))
+        sizes = (
+            max_blocks, num_switches, num_signals, num_crossings,
+            max_blocks, max_blocks,
+        )
+        plc_logic = self._plc_module.plc_logic
+        engine = self._plc_engine
+        if (
+            engine is None
+            or engine.plc_logic is not plc_logic
+            or engine.sizes != sizes
+        ):
+            engine = PLCEngine(
+                plc_logic,
+                [False] * max_blocks,
+                [0] * num_switches,
+                [False] * num_signals,
+                [False] * num_crossings,
+                [False] * max_blocks,
+                [False] * max_blocks,
+            )
+            self._plc_engine = engine
+        return engine
+
     def _sync_after_plc_upload(self) -> None:
         """Synchronize state after PLC upload."""
         for block_id in self._line_block_ids():
@@ -1464,7 +1611,9 @@ class TrackControllerBackend(FailureDetection):
             block_id: The block that changed occupancy.
             occupied: New occupancy status.
         """
-        old_state = self._known_occupancy.get(block_id)
+        # _previous_occupancy is what the controller last acted on;
+        # _known_occupancy may already show the new value
+        old_state = self._previous_occupancy.get(block_id)
         self._known_occupancy[block_id] = occupied
         logger.info(
             '%s: Block %d occupancy updated from model -> %s',
@@ -1522,6 +1671,11 @@ class TrackControllerBackend(FailureDetection):
     def start_live_link(self, poll_interval: float = 1.0) -> None:
         """Start live polling of Track Model state.
 
+        Polling runs on the shared poller thread (see
+        universal.controller_registry), not a thread of its own. With a
+        change feed, changes pushed since the last step are also acted on
+        in the clock's SENSE phase, so the PLC doesn't wait for the poll.
+
         Args:
             poll_interval: Polling interval in seconds.
         """
@@ -1533,26 +1687,11 @@ class TrackControllerBackend(FailureDetection):
                 return
             self._live_thread_running = True
 
-        def poll_loop() -> None:
-            """Polling loop that runs in a separate thread."""
-            while True:
-                with self._live_thread_lock:
-                    if not self._live_thread_running:
-                        break
-
-                try:
-                    self._poll_track_model()
-                except Exception:
-                    logger.exception('Error during Track Model polling loop')
-
-                time.sleep(poll_interval)
-
-        thread = threading.Thread(
-            target=poll_loop,
-            daemon=True,
-            name=f'TrackPoll-{self.line_name}',
+        poller.add(
+            self._poll_track_model, poll_interval, name=f'SW {self.line_name}'
         )
-        thread.start()
+        if self._event_feed:
+            clock.register_phase(SimPhase.SENSE, self._on_sense_step)
         logger.info(
             'Live link started for %s (poll interval: %.1fs)',
             self.line_name,
@@ -1563,12 +1702,129 @@ class TrackControllerBackend(FailureDetection):
         """Stop live polling of Track Model state."""
         with self._live_thread_lock:
             self._live_thread_running = False
+        poller.remove(self._poll_track_model)
+        clock.unregister_phase(self._on_sense_step)
         logger.info('Live link stopped for %s', self.line_name)
 
+    def _on_track_event(self, event: Any) -> None:
+        """Apply a single change pushed by the Track Model.
+
+        Does the same bookkeeping the full-line scan in _poll_track_model
+        does for the changed field, for blocks in this controller's
+        territory only. Listener/CTC notification is deferred to the next
+        SENSE step (or _poll_track_model() call) so a burst of changes is
+        reported once.
+
+        Args:
+            event: The TrackChangeEvent published by the TrackNetwork.
+        """
+        block_id = event.block_id
+        if block_id not in self._territory().members:
+            return
+
+        kind = event.kind
+        if kind == TrackEventType.OCCUPANCY:
+            # The network's value replaces any override of this block; the
+            # blocks not yet acted on are one XOR against the snapshot.
+            occupancy = self._known_occupancy
+            occupancy.release(1 << block_id)
+            changed = (
+                (occupancy.bits ^ self._previous_occupancy.bits)
+                & self._territory().mask
+            )
+            for changed_block in iter_bits(changed):
+                self._update_occupancy_from_model(
+                    changed_block, occupancy[changed_block]
+                )
+            if changed:
+                self._pending_occupancy_change = True
+                self._pending_state_change = True
+        elif kind == TrackEventType.SIGNAL:
+            side, state = event.value
+            if self._switch_signals.get((block_id, side)) != state:
+                self._switch_signals[(block_id, side)] = state
+                logger.info(
+                    'Switch %d signal %d updated from model: %s',
+                    block_id,
+                    side,
+                    state,
+                )
+                self._pending_state_change = True
+        elif kind == TrackEventType.SWITCH:
+            if self.switches.get(block_id) != int(event.value):
+                self.switches[block_id] = int(event.value)
+                logger.info(
+                    'Switch %d position updated from model -> %d',
+                    block_id,
+                    int(event.value),
+                )
+                self._pending_state_change = True
+        elif kind == TrackEventType.GATE:
+            for cid, cblock in self.crossing_blocks.items():
+                if cblock == block_id:
+                    if self.crossings.get(cid) != bool(event.value):
+                        self.crossings[cid] = bool(event.value)
+                        logger.info(
+                            'Crossing %d status updated from model -> %s',
+                            cid,
+                            self.crossings[cid],
+                        )
+                        self._pending_state_change = True
+                    break
+        elif kind == TrackEventType.COMMAND:
+            cmd = event.value
+            if getattr(cmd, 'commanded_speed', None):
+                speed_mps = int(cmd.commanded_speed)
+                self._commanded_speed_mps[block_id] = speed_mps
+                self._known_commanded_speed[block_id] = speed_mps
+            if getattr(cmd, 'authority', None):
+                auth_m = int(cmd.authority)
+                self._commanded_auth_m[block_id] = auth_m
+                self._known_commanded_auth[block_id] = auth_m
+
+    def _on_sense_step(self, current_time: datetime, dt: float) -> None:
+        """Act on changes pushed since the previous simulation step.
+
+        Args:
+            current_time: Simulation time of this step.
+            dt: Simulated seconds since the previous call.
+        """
+        if not self._event_feed_synced:
+            return
+        if self._pending_occupancy_change or self._pending_state_change:
+            self._flush_track_events()
+
+    def _flush_track_events(self) -> None:
+        """Report changes collected by _on_track_event since the last poll."""
+        if self._pending_occupancy_change and self._plc_module is not None:
+            if not self.maintenance_mode:
+                logger.info('Occupancy changed, re-executing PLC logic')
+                self._execute_plc_logic()
+            else:
+                logger.info('Occupancy changed, but PLC execution skipped (maintenance mode)')
+
+        state_changed = self._pending_state_change
+        self._pending_state_change = False
+        self._pending_occupancy_change = False
+        if state_changed:
+            self._notify_listeners()
+            self._send_status_to_ctc()
+
+        self._verify_commands()
+
     def _poll_track_model(self) -> None:
-        """Poll the Track Model for state changes."""
+        """Poll the Track Model for state changes.
+
+        When the Track Model publishes a change feed, the first call scans
+        every block on the line to resync and later calls only report the
+        changes pushed since then. Without a feed every call scans the line.
+        """
+        if self._event_feed and self._event_feed_synced:
+            self._flush_track_events()
+            return
         if not hasattr(self.track_model, 'segments'):
             return
+        self._event_feed_synced = self._event_feed
 
         state_changed = False
         occupancy_changed = False
@@ -1713,16 +1969,33 @@ class TrackControllerBackend(FailureDetection):
 
         self._verify_commands()
 
-    def _line_block_ids(self) -> List[int]:
-        """Get the list of block IDs for this line.
+    def _territory(self) -> TerritoryIndex:
+        """Get the territory index for this line.
+
+        The index is cached and rebuilt only when the Track Model reports a
+        new topology_version or its segment count changes.
 
         Returns:
-            List of block IDs that belong to this line.
+            The TerritoryIndex for the current track layout.
         """
-        block_range = LINE_BLOCK_MAP.get(self.line_name)
-        if block_range is None:
-            return sorted(self.track_model.segments.keys())
-        return [b for b in block_range if b in self.track_model.segments]
+        segments = self.track_model.segments
+        key = (getattr(self.track_model, 'topology_version', None), len(segments))
+        if self._territory_index is None or key != self._territory_key:
+            self._territory_index = TerritoryIndex.build(
+                self.line_name, segments.keys()
+            )
+            self._territory_key = key
+            if isinstance(self._known_occupancy, BlockBitsOverlay):
+                self._known_occupancy.mask = self._territory_index.mask
+        return self._territory_index
+
+    def _line_block_ids(self) -> Tuple[int, ...]:
+        """Get the sorted block IDs for this line.
+
+        Returns:
+            Tuple of block IDs that belong to this line.
+        """
+        return self._territory().blocks
 
     def add_listener(self, callback: Callable[[], None]) -> None:
         """Add a listener callback for state changes.
@@ -1791,7 +2064,7 @@ class TrackControllerBackend(FailureDetection):
         seg = self.track_model.segments.get(block)
         if seg is None:
             raise ValueError(f'Invalid block {block}')
-        if block not in self._line_block_ids():
+        if block not in self._territory().members:
             raise ValueError(f'Block {block} is not part of {self.line_name}')
         return seg
 
@@ -9,6 +9,8 @@ if _pkg_root not in sys.path:
     sys.path.append(_pkg_root)
 
 from universal.universal import SignalState, TrainCommand, ConversionFunctions
+from trackModel.track_model_backend import TrackNetwork, TrackSegment, Direction
+from universal.refresh_bus import RefreshDispatcher
 from track_controller_backend import (
     TrackControllerBackend, 
     SafetyException, 
@@ -127,6 +129,25 @@ def test_receive_ctc_suggestion(controller):
     assert controller._suggested_speed_mps[block_id] == suggested_speed
     assert controller._suggested_auth_m[block_id] == suggested_auth
 
+def test_receive_ctc_suggestions_bulk_applies_diffs_once(controller):
+    listener = Mock()
+    controller.add_listener(listener)
+    suggestions = {b: (0.0, 0.0) for b in range(0, 152)}
+    suggestions[10] = (15.0, 200.0)
+
+    assert controller.receive_ctc_suggestions_bulk(suggestions) == 150
+    assert listener.call_count == 1
+    assert controller._suggested_speed_mps[10] == 15.0
+    assert 0 not in controller._suggested_speed_mps
+
+    assert controller.receive_ctc_suggestions_bulk(suggestions) == 0
+    assert listener.call_count == 1
+
+    suggestions[10] = (0.0, 0.0)
+    suggestions[11] = (15.0, 180.0)
+    assert controller.receive_ctc_suggestions_bulk(suggestions) == 2
+    assert listener.call_count == 2
+
 def test_receive_ctc_suggestion_invalid_block(controller, caplog):
     invalid_block = 999
     with caplog.at_level(logging.WARNING):
@@ -943,6 +964,24 @@ def test_many_listeners(controller):
     for cb in callbacks:
         cb.assert_called()
 
+def test_refresh_bus_coalesces_listener_calls(controller):
+    import threading
+    bus = RefreshDispatcher(max_fps=30)
+    refresh = Mock()
+    controller.add_listener(bus.listener(refresh))
+    controller.add_listener(bus.listener(refresh))
+
+    worker = threading.Thread(
+        target=lambda: [controller._notify_listeners() for _ in range(100)]
+    )
+    worker.start()
+    worker.join()
+    refresh.assert_not_called()
+
+    assert bus.flush() == 1
+    refresh.assert_called_once_with()
+    assert bus.flush() == 0
+
 # failure history 
 def test_failure_history_append(controller):
     initial_count = len(controller.failure_history)
@@ -962,5 +1001,197 @@ def test_failure_history_limit(controller):
     report = controller.get_failure_report()
     assert len(report["failure_history"]) == 10
 
+# change feed
+def test_event_feed_replaces_full_scan(mock_ctc):
+    network = TrackNetwork()
+    for i in range(1, 151):
+        network.add_segment(TrackSegment(i, 100, 20, 0, 0, False, Direction.FORWARD))
+    controller = TrackControllerBackend(network, "Green Line")
+    controller.set_ctc_backend(mock_ctc)
+    controller._poll_track_model()
+    assert controller._event_feed_synced
+    mock_ctc.wayside_status_calls.clear()
+
+    network.segments[30].set_occupancy(True)
+    assert controller._known_occupancy[30] == True
+
+    # Changes made behind the feed are not scanned for any more
+    network.segments[31].occupied = True
+    controller._poll_track_model()
+    assert len(mock_ctc.wayside_status_calls) == 1
+    assert controller._known_occupancy[31] == False
+
+    controller._poll_track_model()
+    assert len(mock_ctc.wayside_status_calls) == 1
+
+def test_event_feed_reports_on_next_sense_step(mock_ctc):
+    from universal.global_clock import clock
+    network = TrackNetwork()
+    for i in range(1, 151):
+        network.add_segment(TrackSegment(i, 100, 20, 0, 0, False, Direction.FORWARD))
+    controller = TrackControllerBackend(network, "Green Line")
+    controller.set_ctc_backend(mock_ctc)
+    controller._poll_track_model()
+    controller._plc_module = object()
+    mock_ctc.wayside_status_calls.clear()
+    controller.start_live_link(poll_interval=60.0)
+    try:
+        with patch.object(controller, '_execute_plc_logic') as run_plc:
+            network.segments[30].set_occupancy(True)
+            # PLC runs on the event itself, the report waits for the step
+            assert run_plc.called
+            assert mock_ctc.wayside_status_calls == []
+            clock.tick()
+            assert len(mock_ctc.wayside_status_calls) == 1
+            clock.tick()
+            assert len(mock_ctc.wayside_status_calls) == 1
+    finally:
+        controller.stop_live_link()
+    assert all(cb != controller._on_sense_step
+               for entries in clock._phases.values() for cb, _ in entries)
+
+def test_event_feed_ignores_other_territory():
+    network = TrackNetwork()
+    for i in range(1, 151):
+        network.add_segment(TrackSegment(i, 100, 20, 0, 0, False, Direction.FORWARD))
+    controller = TrackControllerBackend(network, "Red Line")
+    network.segments[120].set_occupancy(True)
+    assert 120 not in controller._known_occupancy
+
+def test_occupancy_read_from_network_view():
+    network = TrackNetwork()
+    for i in range(1, 151):
+        network.add_segment(TrackSegment(i, 100, 20, 0, 0, False, Direction.FORWARD))
+    controller = TrackControllerBackend(network, "Green Line")
+    network.segments[30].set_occupancy(True)
+    assert controller._known_occupancy.bits == network.occupancy_bits & controller._territory().mask
+    assert controller._previous_occupancy[30] is True
+
+    # A Track Model message the network disagrees with is kept as an override
+    controller.receive_model_update(31, "occupancy", True)
+    assert controller._known_occupancy[31] is True
+    assert controller._known_occupancy.overridden == 1 << 31
+    # until the network reports the block again
+    network.segments[31].set_occupancy(True)
+    network.segments[31].set_occupancy(False)
+    assert controller._known_occupancy[31] is False
+    assert controller._known_occupancy.overridden == 0
+
+# territory index
+def test_territory_index_rebuilt_only_on_topology_change():
+    network = TrackNetwork()
+    for i in range(1, 11):
+        network.add_segment(TrackSegment(i, 100, 20, 0, 0, False, Direction.FORWARD))
+    controller = TrackControllerBackend(network, "Blue Line")
+    index = controller._territory()
+    assert controller._line_block_ids() == tuple(range(1, 11))
+    assert controller._get_adjacent_blocks(10) == [9]
+    assert controller._territory() is index
+
+    network.add_segment(TrackSegment(11, 100, 20, 0, 0, False, Direction.FORWARD))
+    assert controller._territory() is not index
+    assert 11 in controller._territory().members
+    assert controller._get_adjacent_blocks(10) == [9, 11]
+
+def test_plc_engine_matches_full_run():
+    import importlib.util, random
+    from universal.plc_engine import PLCEngine
+    plc_path = os.path.join(os.path.dirname(__file__), "PLC files", "plc_green_test.py")
+    spec = importlib.util.spec_from_file_location("plc_green_test", plc_path)
+    plc = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(plc)
+
+    def fresh():
+        return [False] * 151, [0] * 10, [False] * 12, [False] * 10, [False] * 151, [False] * 151
+
+    engine = PLCEngine(plc.plc_logic, *fresh())
+    rng = random.Random(1140)
+    occ = [False] * 151
+    prev = [False] * 151
+    for step in range(300):
+        # every tenth step can touch any block and ages the previous
+        # occupancies; the rest only touch blocks the green PLC never reads
+        if step % 10 == 0:
+            prev = list(occ)
+            pool = range(0, 151)
+        else:
+            pool = range(65, 122)
+        for b in rng.sample(pool, 3):
+            occ[b] = not occ[b]
+        expected = [list(a) for a in plc.plc_logic(list(occ), *fresh()[1:4], list(prev), [False] * 151)]
+        engine.inputs[0][:] = occ
+        engine.inputs[4][:] = prev
+        assert [list(a) for a in engine.run()] == expected
+    # tracing paid for itself, so the engine kept tracing its misses
+    assert engine.skipped >= 250
+    assert engine.traced == engine.runs
+    assert engine.runs + engine.skipped == 300
+    assert ("block_occupancies", 90) not in engine.read_set()
+    assert engine.dependencies()[("crossing_signals", 0)] >= {("block_occupancies", b) for b in range(16, 22)}
+
+def test_plc_engine_passes_through_unwritten_switch_slot():
+    from universal.plc_engine import PLCEngine
+
+    def plc_logic(occ, switches, lights, crossings, prev, stop):
+        # switch 0 follows block 1; switch 1 is never read or written
+        switches[0] = occ[1]
+        return switches, lights, crossings, stop
+
+    engine = PLCEngine(plc_logic, [False] * 3, [False, False], [False] * 3,
+                       [], [False] * 3, [False] * 3)
+    engine.TRACE_COST = 0       # trace every miss
+    assert engine.run()[0] == [False, False]
+    # a maintenance-mode switch move lands in the unread, unwritten slot
+    engine.inputs[1][1] = True
+    assert engine.run()[0] == [False, True]
+    assert engine.runs == 2
+    assert engine.run()[0] == [False, True]
+    assert engine.skipped == 1
+    assert ("switch_positions", 1) not in engine.read_set()
+
+def test_plc_engine_stops_tracing_when_it_does_not_pay():
+    from universal.plc_engine import PLCEngine
+
+    def plc_logic(occ, switches, lights, crossings, prev, stop):
+        switches[0] = int(occ[1] != occ[2])
+        return switches, lights, crossings, stop
+
+    engine = PLCEngine(plc_logic, [False] * 4, [0], [], [], [False] * 4, [])
+    for step in range(200):
+        # every call changes a slot the program reads
+        engine.inputs[0][1 + step % 2] = not engine.inputs[0][1 + step % 2]
+        occ = engine.inputs[0]
+        assert engine.run()[0] == [int(occ[1] != occ[2])]
+    assert engine.runs == 200
+    assert engine.traced == 1
+    assert engine.read_set() == {("block_occupancies", 1), ("block_occupancies", 2)}
+
+def test_plc_engine_skip_latency_flat_in_territory_size():
+    import time
+    from universal.plc_engine import PLCEngine
+
+    def plc_logic(occ, switches, lights, crossings, prev, stop):
+        switches[0] = int(occ[10] and not occ[11])
+        crossings[0] = occ[20]
+        return switches, lights, crossings, [occ[30] and prev[30]]
+
+    def skip_latency(blocks):
+        engine = PLCEngine(plc_logic, [False] * blocks, [0], [], [False],
+                           [False] * blocks, [False] * blocks)
+        engine.run()
+        occ = engine.inputs[0]
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            for b in range(40, 240):
+                occ[b] = not occ[b]
+                engine.run()
+            best = min(best, time.perf_counter() - start)
+        assert engine.runs == 1
+        return best
+
+    small, large = skip_latency(300), skip_latency(30000)
+    assert large < 3 * small
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
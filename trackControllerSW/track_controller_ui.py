@@ -40,6 +40,7 @@ if _PKG_ROOT not in sys.path:
 
 from track_controller_backend import TrackControllerBackend
 from universal.global_clock import clock as global_clock
+from universal.refresh_bus import refresh_bus
 from universal.universal import SignalState
 
 if TYPE_CHECKING:
@@ -124,14 +125,17 @@ class TrackControllerUI(QWidget):
 
         self.resize(1200, 800)
 
-        # Register listeners
+        # Register listeners; backends may notify from the polling thread,
+        # so repaints go through the refresh bus onto the Qt thread.
+        refresh_bus.start()
         try:
             for controller in self.controllers.values():
-                controller.add_listener(self.refresh_tables)
+                controller.add_listener(refresh_bus.listener(self.refresh_tables))
         except Exception:
             logger.exception('Failed to attach to backend')
 
-        global_clock.register_listener(self._update_clock_display)
+        # the clock may tick on the sim worker thread; repaint on the UI thread
+        global_clock.register_listener(refresh_bus.listener(self._refresh_clock_display))
 
         # Build UI and setup
         self._build_ui()
@@ -420,12 +424,14 @@ class TrackControllerUI(QWidget):
         """
         try:
             try:
-                self.backend.remove_listener(self.refresh_tables)
+                self.backend.remove_listener(
+                    refresh_bus.listener(self.refresh_tables)
+                )
             except Exception:
                 pass
 
             self.backend = self.controllers[line_name]
-            self.backend.add_listener(self.refresh_tables)
+            self.backend.add_listener(refresh_bus.listener(self.refresh_tables))
             self.dropdown_text.setText(f'Track: {line_name}')
             self.refresh_tables()
         except Exception:
@@ -890,6 +896,10 @@ class TrackControllerUI(QWidget):
             logger.exception('Failed to toggle crossing in maintenance mode')
             self.refresh_tables()
 
+    def _refresh_clock_display(self) -> None:
+        '''Show the clock's current time (refresh bus callback).'''
+        self._update_clock_display(global_clock.get_time())
+
     def _update_clock_display(self, current_time) -> None:
         """Update the clock display with the current simulation time.
 
@@ -0,0 +1,115 @@
+"""Cold vs warm startup benchmark for the compiled track layout cache.
+
+Loads every line layout the way a simulation start does (one
+TrackNetwork.load_track_layout per line plus the CTC section map), first
+cold (CSV parsed and validated every time) and then warm (compiled image
+read back from the cache). Reports milliseconds per startup for both.
+
+Example:
+    python trackModel/layout_benchmark.py --repeats 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Optional
+
+_PKG_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _PKG_ROOT not in sys.path:
+    sys.path.insert(0, _PKG_ROOT)
+
+from trackModel import layout_cache, track_model_backend
+from trackModel.track_model_backend import TrackNetwork
+
+LAYOUTS = ("blue_line.csv", "red_line.csv", "green_line.csv")
+
+
+def _startup(paths: list[str], load) -> float:
+    """Seconds to build every network and its section map with `load`."""
+    original = track_model_backend.load_layout
+    track_model_backend.load_layout = load
+    try:
+        start = time.perf_counter()
+        for path in paths:
+            network = TrackNetwork()
+            network.load_track_layout(path)
+            load(path).section_names()
+        return time.perf_counter() - start
+    finally:
+        track_model_backend.load_layout = original
+
+
+def run(repeats: int = 10) -> dict[str, float]:
+    """Run the benchmark.
+
+    Args:
+        repeats: Startups to time per mode.
+
+    Returns:
+        Milliseconds per startup (and per layout load) for both modes.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    paths = [os.path.join(here, name) for name in LAYOUTS]
+
+    cold_load = warm_load = cold = warm = 0.0
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            redirect_stdout(StringIO()):
+
+        def parse(path: str) -> layout_cache.CompiledLayout:
+            return layout_cache.load_layout(path, use_cache=False)
+
+        def cached(path: str) -> layout_cache.CompiledLayout:
+            return layout_cache.load_layout(path, cache_dir=cache_dir)
+
+        for path in paths:
+            cached(path)        # compile once
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for path in paths:
+                parse(path)
+            cold_load += time.perf_counter() - start
+
+            # warm = a fresh process reading the compiled images
+            layout_cache.clear_memory_cache()
+            start = time.perf_counter()
+            for path in paths:
+                cached(path)
+            warm_load += time.perf_counter() - start
+
+            cold += _startup(paths, parse)
+            layout_cache.clear_memory_cache()
+            warm += _startup(paths, cached)
+
+    return {
+        "layouts": float(len(paths)),
+        "cold_load_ms": cold_load * 1000 / repeats,
+        "warm_load_ms": warm_load * 1000 / repeats,
+        "cold_startup_ms": cold * 1000 / repeats,
+        "warm_startup_ms": warm * 1000 / repeats,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> dict[str, float]:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    r = run(args.repeats)
+    print(
+        f"[LayoutBenchmark] {len(LAYOUTS)} layouts: "
+        f"CSV parse {r['cold_load_ms']:.2f} ms -> "
+        f"compiled image {r['warm_load_ms']:.2f} ms; "
+        f"full startup {r['cold_startup_ms']:.1f} ms -> "
+        f"{r['warm_startup_ms']:.1f} ms"
+    )
+    return r
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Compiled track layout images and their on-disk cache.
+
+compile_layout() reads a layout CSV once, validates every row (with the
+same rules and messages TrackNetwork.load_track_layout has always used)
+and packs the result into a binary image:
+
+    header      magic, format version, row count, string count
+    rows        one fixed-size ROW record per block
+    strings     u16 length + UTF-8 bytes, referenced from rows by index
+
+load_layout() keys images by a hash of the CSV bytes. A valid image in
+the cache directory (``__pycache__`` next to the CSV by default) is
+mapped with mmap and its rows are unpacked straight out of the mapping,
+so after the first run no CSV parsing or validation happens at all.
+Images are also kept per process, so the CTC mirror and several
+TrackStates loading one line share a single decode.
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import mmap
+import os
+import re
+import struct
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+LAYOUT_MAGIC = b"TLAY"
+LAYOUT_VERSION = 2
+
+HEADER = struct.Struct("<4sHxxII")
+# type, block_id, length, speed_limit, grade, elevation, underground,
+# direction, station_side, reverse flags, previous, next, straight,
+# diverging, name, station_name, beacon_data
+ROW = struct.Struct("<BxxxIddddBBBBiiiiIII")
+_STR_LEN = struct.Struct("<H")
+
+SEGMENT_TYPES = ("TrackSegment", "TrackSwitch", "LevelCrossing", "Station")
+DIRECTIONS = ("forward", "backward", "bidirectional")
+STATION_SIDES = ("", "left", "right", "both")
+
+_PREVIOUS_REVERSE = 1
+_NEXT_REVERSE = 2
+_NO_BLOCK = -1
+
+
+class LayoutRow(NamedTuple):
+    """One validated layout row. Connection fields are None when unset."""
+    segment_type: str
+    block_id: int
+    length: float
+    speed_limit: float
+    grade: float
+    elevation: float
+    underground: bool
+    direction: str
+    station_side: str
+    previous_reverse: bool
+    next_reverse: bool
+    previous_segment: Optional[int]
+    next_segment: Optional[int]
+    straight_segment: Optional[int]
+    diverging_segment: Optional[int]
+    name: str
+    station_name: str
+    beacon_data: str
+
+
+class CompiledLayout:
+    """Decoded layout image.
+
+    Attributes:
+        rows: The layout rows in file order.
+        digest: Hash of the CSV the image was compiled from.
+    """
+
+    def __init__(self, rows: List[LayoutRow], digest: str) -> None:
+        self.rows = rows
+        self.digest = digest
+
+    def section_names(self) -> Dict[int, str]:
+        """Block ID -> the CSV's ``name`` column (e.g. "A1", "Yard")."""
+        return {row.block_id: row.name for row in self.rows if row.name}
+
+
+# (path, digest) -> decoded layout, shared within the process
+_loaded: Dict[Tuple[str, str], CompiledLayout] = {}
+
+
+def _check(pattern: str, value: Optional[str], field: str, line: int,
+           flags: int = 0) -> None:
+    if value is None or not re.match(pattern, value, flags):
+        raise ValueError(
+            f"Invalid '{field}' field in layout file at row {line}.")
+
+
+def _parse_rows(text: str) -> List[LayoutRow]:
+    """Validate the CSV text and return its rows."""
+    rows: List[LayoutRow] = []
+    seen = set()
+    current_line = 0
+    for lines in csv.DictReader(io.StringIO(text)):
+        if not lines["Type"].strip() and not lines["block_id"].strip():
+            current_line += 1
+            continue
+        _check("^[a-zA-Z]+$", lines.get("Type"), "Type", current_line)
+        _check("^[0-9]+$", lines.get("block_id"), "block_id", current_line)
+        for field in ("length", "speed_limit", "grade", "elevation"):
+            _check("^[0-9.-]+$", lines.get(field), field, current_line)
+        _check("^(TRUE|FALSE|true|false)$", lines.get("underground"),
+               "underground", current_line)
+        _check("^(FORWARD|BACKWARD|BIDIRECTIONAL)$", lines.get("direction"),
+               "direction", current_line, re.IGNORECASE)
+
+        segment_type = lines["Type"]
+        if segment_type not in SEGMENT_TYPES:
+            raise ValueError(
+                f"Unknown segment type {segment_type} at row {current_line}.")
+        block_id = int(lines["block_id"])
+        if block_id in seen:
+            raise ValueError(
+                f"Block ID {block_id} already exists in network.")
+        seen.add(block_id)
+
+        station_name = ""
+        station_side = ""
+        if segment_type == "Station":
+            _check(r"^[\w\s\.\'\-\u00C0-\u017F]+$", lines.get("station_name"),
+                   "station_name", current_line)
+            _check("^(left|right|both)$", lines.get("station_side"),
+                   "station_side", current_line, re.IGNORECASE)
+            station_name = lines["station_name"]
+            station_side = lines["station_side"].lower()
+
+        links = {}
+        for field in ("previous_segment", "next_segment",
+                      "straight_segment", "diverging_segment"):
+            value = lines.get(field)
+            if value is not None and not re.match("(^[0-9]+$|^$)", value):
+                raise ValueError(
+                    f"Invalid '{field}' field in layout file at row "
+                    f"{current_line}.")
+            links[field] = int(value) if value else None
+
+        reverse = {}
+        for field in ("previous_reverse", "next_reverse"):
+            value = lines.get(field)
+            reverse[field] = False
+            if value and value.strip():
+                _check("^(TRUE|FALSE|true|false)$", value, field, current_line)
+                reverse[field] = value.lower() == "true"
+
+        beacon = lines.get("beacon_data") or ""
+        rows.append(LayoutRow(
+            segment_type=segment_type,
+            block_id=block_id,
+            length=float(lines["length"]),
+            speed_limit=float(lines["speed_limit"]),
+            grade=float(lines["grade"]),
+            elevation=float(lines["elevation"]),
+            underground=lines["underground"].lower() == "true",
+            direction=lines["direction"].lower(),
+            station_side=station_side,
+            previous_reverse=reverse["previous_reverse"],
+            next_reverse=reverse["next_reverse"],
+            name=(lines.get("name") or "").strip(),
+            station_name=station_name,
+            beacon_data=beacon if beacon.strip() else "",
+            **links,
+        ))
+        current_line += 1
+    return rows
+
+
+def _encode(rows: List[LayoutRow]) -> bytes:
+    strings: List[str] = [""]
+    index: Dict[str, int] = {"": 0}
+
+    def ref(value: str) -> int:
+        i = index.get(value)
+        if i is None:
+            i = index[value] = len(strings)
+            strings.append(value)
+        return i
+
+    def link(value: Optional[int]) -> int:
+        return _NO_BLOCK if value is None else value
+
+    out = bytearray()
+    for row in rows:
+        out += ROW.pack(
+            SEGMENT_TYPES.index(row.segment_type), row.block_id,
+            row.length, row.speed_limit, row.grade, row.elevation,
+            row.underground, DIRECTIONS.index(row.direction),
+            STATION_SIDES.index(row.station_side),
+            (_PREVIOUS_REVERSE if row.previous_reverse else 0)
+            | (_NEXT_REVERSE if row.next_reverse else 0),
+            link(row.previous_segment), link(row.next_segment),
+            link(row.straight_segment), link(row.diverging_segment),
+            ref(row.name), ref(row.station_name), ref(row.beacon_data))
+    for value in strings:
+        data = value.encode("utf-8")
+        out += _STR_LEN.pack(len(data)) + data
+    return HEADER.pack(LAYOUT_MAGIC, LAYOUT_VERSION, len(rows),
+                       len(strings)) + bytes(out)
+
+
+def _decode(buf: memoryview, digest: str) -> CompiledLayout:
+    magic, version, n_rows, n_strings = HEADER.unpack_from(buf)
+    if magic != LAYOUT_MAGIC or version != LAYOUT_VERSION:
+        raise ValueError("not a current layout image")
+    pos = HEADER.size + n_rows * ROW.size
+    strings = []
+    for _ in range(n_strings):
+        (length,) = _STR_LEN.unpack_from(buf, pos)
+        pos += _STR_LEN.size
+        strings.append(str(buf[pos:pos + length], "utf-8"))
+        pos += length
+
+    def link(value: int) -> Optional[int]:
+        return None if value == _NO_BLOCK else value
+
+    rows = [
+        LayoutRow(
+            SEGMENT_TYPES[kind], block_id, length, speed_limit, grade,
+            elevation, bool(underground), DIRECTIONS[direction],
+            STATION_SIDES[side], bool(flags & _PREVIOUS_REVERSE),
+            bool(flags & _NEXT_REVERSE), link(prev), link(nxt),
+            link(straight), link(diverging),
+            strings[name], strings[station], strings[beacon])
+        for (kind, block_id, length, speed_limit, grade, elevation,
+             underground, direction, side, flags, prev, nxt, straight,
+             diverging, name, station, beacon)
+        in ROW.iter_unpack(buf[HEADER.size:HEADER.size + n_rows * ROW.size])
+    ]
+    return CompiledLayout(rows, digest)
+
+
+def compile_layout(layout_file: str) -> bytes:
+    """Validate a layout CSV and return its binary image.
+
+    Raises:
+        ValueError: If a row fails validation.
+    """
+    with open(layout_file, "rb") as f:
+        return _encode(_parse_rows(f.read().decode("utf-8")))
+
+
+def cache_path(layout_file: str, digest: str,
+               cache_dir: Optional[str] = None) -> str:
+    """Where the image of `layout_file` with hash `digest` is cached."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(layout_file)),
+                                 "__pycache__")
+    stem = os.path.splitext(os.path.basename(layout_file))[0]
+    return os.path.join(cache_dir, f"{stem}.{digest[:16]}.layout")
+
+
+def load_layout(layout_file: str, cache_dir: Optional[str] = None,
+                use_cache: bool = True) -> CompiledLayout:
+    """Load a layout, compiling and caching it if needed.
+
+    Args:
+        layout_file: Path to the layout CSV.
+        cache_dir: Directory for compiled images. Defaults to
+            ``__pycache__`` beside the CSV.
+        use_cache: If False, always parse the CSV and don't touch the
+            cache (used by the benchmark's cold runs).
+
+    Returns:
+        The decoded layout.
+
+    Raises:
+        ValueError: If the CSV fails validation.
+    """
+    with open(layout_file, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha1(raw).hexdigest()
+    if not use_cache:
+        return CompiledLayout(_parse_rows(raw.decode("utf-8")), digest)
+
+    key = (os.path.abspath(layout_file), digest)
+    layout = _loaded.get(key)
+    if layout is not None:
+        return layout
+
+    path = cache_path(layout_file, digest, cache_dir)
+    try:
+        with open(path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as image:
+            with memoryview(image) as view:
+                layout = _decode(view, digest)
+    except (OSError, ValueError, struct.error, UnicodeDecodeError,
+            IndexError):
+        layout = None
+
+    if layout is None:
+        image = _encode(_parse_rows(raw.decode("utf-8")))
+        layout = _decode(memoryview(image), digest)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(image)
+            os.replace(tmp, path)
+        except OSError:
+            pass    # read-only checkout: still works, just uncached
+
+    _loaded[key] = layout
+    return layout
+
+
+def clear_memory_cache() -> None:
+    """Forget layouts decoded in this process (files stay cached)."""
+    _loaded.clear()
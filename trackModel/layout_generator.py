@@ -0,0 +1,225 @@
+"""Synthetic track layout generator for capacity and scaling studies.
+
+Writes layout CSVs in the same format as ``green_line.csv`` (every row
+passes the checks in layout_cache, so TrackNetwork.load_track_layout
+loads them unchanged) at any size:
+
+    block 0             the Yard, a Station leading onto the main line
+    blocks 1..M         the main line, one chain of blocks
+    blocks M+1..        passing sidings: a TrackSwitch on the main line
+                        diverges into the siding, which rejoins the main
+                        line a few blocks further on
+
+Stations and level crossings are spread along the main line at the given
+densities (crossings offset from the others so they don't coincide). With ``loop=True`` the last main line block leads back to
+block 1. Geometry (lengths, grades, speed limits) is drawn from a seeded
+Random, so the same arguments always give the same file.
+
+Example:
+    python trackModel/layout_generator.py synthetic.csv --blocks 10000
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+from random import Random
+from typing import Dict, List, Optional
+
+COLUMNS = ("name", "Type", "block_id", "length", "grade", "elevation",
+           "speed_limit", "underground", "direction", "previous_segment",
+           "next_segment", "previous_reverse", "next_reverse",
+           "reverse_switch", "straight_segment", "diverging_segment",
+           "station_name", "station_side", "beacon_data")
+
+SECTION_BLOCKS = 10
+LENGTHS = (50, 75, 100, 150, 200, 300)
+SPEED_LIMITS = (8.334, 12.501, 16.668, 19.446)
+STATION_SIDES = ("Left", "Right", "Both")
+
+
+def _interval(density: float) -> int:
+    """Blocks between features for a per-block density (0 disables)."""
+    if density <= 0:
+        return 0
+    return max(2, round(1 / density))
+
+
+def _section(index: int) -> str:
+    """Section letters for the index-th section: A..Z, AA..AZ, ..."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def _sidings(main_blocks: int, interval: int, siding_blocks: int) -> List[int]:
+    """Main line blocks that get a switch into a siding."""
+    if not interval:
+        return []
+    # the siding rejoins siding_blocks + 1 blocks downstream
+    return [b for b in range(interval, main_blocks + 1, interval)
+            if b + siding_blocks + 1 <= main_blocks]
+
+
+def generate_layout(blocks: int, switch_density: float = 0.02,
+                    station_density: float = 0.05,
+                    crossing_density: float = 0.01, siding_blocks: int = 3,
+                    loop: bool = True, seed: int = 0) -> List[Dict[str, str]]:
+    """Build the rows of a synthetic layout.
+
+    Args:
+        blocks: Total blocks, including the yard and sidings.
+        switch_density: Switches (each with one siding) per main line block.
+        station_density: Stations per main line block.
+        crossing_density: Level crossings per main line block.
+        siding_blocks: Blocks in each passing siding.
+        loop: Whether the end of the main line leads back to block 1.
+        seed: Seed for the block geometry.
+
+    Returns:
+        One dict per row, keyed by COLUMNS.
+
+    Raises:
+        ValueError: If `blocks` is too small or a density is out of range.
+    """
+    if blocks < 3:
+        raise ValueError("A layout needs at least 3 blocks.")
+    for name, density in (("switch_density", switch_density),
+                          ("station_density", station_density),
+                          ("crossing_density", crossing_density)):
+        if not 0 <= density < 1:
+            raise ValueError(f"{name} must be in [0, 1).")
+    if siding_blocks < 1:
+        raise ValueError("siding_blocks must be >= 1.")
+
+    switch_every = _interval(switch_density)
+    # size the main line so main line + sidings fill `blocks`; whatever
+    # rounding leaves over lengthens the main line after the last switch
+    main_blocks = blocks - 1
+    if switch_every:
+        main_blocks = int(main_blocks / (1 + siding_blocks / switch_every))
+    switches = _sidings(main_blocks, switch_every, siding_blocks)
+    while len(switches) * siding_blocks > blocks - 1 - main_blocks:
+        switches.pop()
+    main_blocks = blocks - 1 - len(switches) * siding_blocks
+
+    station_every = _interval(station_density)
+    crossing_every = _interval(crossing_density)
+    rng = Random(seed)
+    rows: Dict[int, Dict[str, str]] = {}
+    elevation = 0.0
+
+    def add(block_id: int, kind: str, section_index: int,
+            previous: Optional[int], following: Optional[int]) -> Dict[str, str]:
+        nonlocal elevation
+        length = rng.choice(LENGTHS)
+        grade = round(rng.uniform(-2.0, 2.0), 1)
+        elevation = max(0.0, elevation + length * grade / 100)
+        row = dict.fromkeys(COLUMNS, "")
+        row.update({
+            "name": f"{_section(section_index)}{block_id}",
+            "Type": kind,
+            "block_id": str(block_id),
+            "length": str(length),
+            "grade": str(grade),
+            "elevation": f"{elevation:.2f}",
+            "speed_limit": str(rng.choice(SPEED_LIMITS)),
+            "underground": "FALSE",
+            "direction": "BIDIRECTIONAL",
+            "previous_segment": "" if previous is None else str(previous),
+            "next_segment": "" if following is None else str(following),
+        })
+        rows[block_id] = row
+        return row
+
+    yard = add(0, "Station", 0, None, 1)
+    yard.update(name="Yard", length="0", grade="0", elevation="0.00",
+                station_name="Yard", station_side="Both")
+    elevation = 0.0
+
+    switch_set = set(switches)
+    station_count = 0
+    previous_station = "Yard"
+    for b in range(1, main_blocks + 1):
+        following = b + 1 if b < main_blocks else (1 if loop else None)
+        section = (b - 1) // SECTION_BLOCKS
+        if b in switch_set:
+            row = add(b, "TrackSwitch", section, b - 1, None)
+            row["reverse_switch"] = "FALSE"
+            row["straight_segment"] = str(following)
+        elif station_every and b % station_every == 0:
+            station_count += 1
+            name = f"Station {station_count}"
+            row = add(b, "Station", section, b - 1, following)
+            row["station_name"] = name
+            row["station_side"] = STATION_SIDES[station_count % 3]
+            if b - 1 in rows and rows[b - 1]["Type"] != "TrackSwitch":
+                rows[b - 1]["beacon_data"] = f"{name};{previous_station}"
+            previous_station = name
+        elif crossing_every and b % crossing_every == crossing_every // 2 + 1:
+            add(b, "LevelCrossing", section, b - 1, following)
+        else:
+            add(b, "TrackSegment", section, b - 1, following)
+
+    next_id = main_blocks + 1
+    for s in switches:
+        rows[s]["diverging_segment"] = str(next_id)
+        section = (s - 1) // SECTION_BLOCKS
+        for k in range(siding_blocks):
+            block_id = next_id + k
+            last = k == siding_blocks - 1
+            add(block_id, "TrackSegment", section,
+                s if k == 0 else block_id - 1,
+                s + siding_blocks + 1 if last else block_id + 1)
+        next_id += siding_blocks
+
+    return [rows[b] for b in sorted(rows)]
+
+
+def write_layout(path: str, blocks: int, **kwargs) -> str:
+    """Generate a layout and write it to `path`.
+
+    Args:
+        path: CSV file to write.
+        blocks: Total blocks; see generate_layout() for the other options.
+
+    Returns:
+        `path`.
+    """
+    rows = generate_layout(blocks, **kwargs)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> str:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="CSV file to write")
+    parser.add_argument("--blocks", type=int, default=1000)
+    parser.add_argument("--switch-density", type=float, default=0.02)
+    parser.add_argument("--station-density", type=float, default=0.05)
+    parser.add_argument("--crossing-density", type=float, default=0.01)
+    parser.add_argument("--siding-blocks", type=int, default=3)
+    parser.add_argument("--no-loop", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    write_layout(args.path, args.blocks,
+                 switch_density=args.switch_density,
+                 station_density=args.station_density,
+                 crossing_density=args.crossing_density,
+                 siding_blocks=args.siding_blocks,
+                 loop=not args.no_loop, seed=args.seed)
+    print(f"[LayoutGenerator] Wrote {args.blocks} blocks to "
+          f"{os.path.abspath(args.path)}")
+    return args.path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Columnar (struct-of-arrays) view of a TrackNetwork's segments.
+
+The segment objects stay the live, authoritative blocks: trains and
+controllers read one block at a time and attribute access on a slotted
+object is the fastest way to do that. Whole-network work (capacity
+studies on large synthetic lines, "every station", "total length")
+instead reads a SegmentTable, where each property is one packed array
+indexed by row:
+
+    block_ids                       array('l')
+    length, speed_limit, grade,     array('d')
+    elevation
+    kinds                           bytearray, index into SEGMENT_TYPES
+    flags                           bytearray, UNDERGROUND | CLOSED
+    next_rows, previous_rows        array('l'), row of the neighbour or -1
+
+Rows follow the network's insertion order. TrackNetwork.segment_table()
+rebuilds the table only when the topology or routing version changes.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from trackModel.layout_cache import SEGMENT_TYPES
+
+UNDERGROUND = 1
+CLOSED = 2
+
+_NO_ROW = -1
+
+
+def _kind(segment: Any) -> int:
+    """Index into SEGMENT_TYPES of the segment's class (or its base)."""
+    for cls in type(segment).__mro__:
+        if cls.__name__ in SEGMENT_TYPES:
+            return SEGMENT_TYPES.index(cls.__name__)
+    return 0
+
+
+class SegmentTable:
+    """Packed per-block columns built from a mapping of segments.
+
+    Attributes:
+        block_ids: Block ID of each row.
+        length: Segment length in meters.
+        speed_limit: Speed limit in m/s.
+        grade: Grade percentage.
+        elevation: Cumulative elevation in meters.
+        kinds: Index into SEGMENT_TYPES per row.
+        flags: UNDERGROUND / CLOSED bits per row.
+        next_rows: Row of next_segment, or -1.
+        previous_rows: Row of previous_segment, or -1.
+        key: (topology_version, routing_version) the table was built at.
+    """
+
+    __slots__ = ('block_ids', 'length', 'speed_limit', 'grade', 'elevation',
+                 'kinds', 'flags', 'next_rows', 'previous_rows', 'key',
+                 '_rows', '_segments')
+
+    def __init__(self, segments: Dict[int, Any], key: tuple = (0, 0)) -> None:
+        values = list(segments.values())
+        self.key = key
+        self._segments = values
+        self._rows: Dict[int, int] = {seg.block_id: row
+                                      for row, seg in enumerate(values)}
+        self.block_ids = array('l', (seg.block_id for seg in values))
+        self.length = array('d', (seg.length for seg in values))
+        self.speed_limit = array('d', (seg.speed_limit for seg in values))
+        self.grade = array('d', (seg.grade for seg in values))
+        self.elevation = array('d', (seg.elevation for seg in values))
+        self.kinds = bytearray(_kind(seg) for seg in values)
+        self.flags = bytearray(
+            (UNDERGROUND if seg.underground else 0)
+            | (CLOSED if seg.closed else 0)
+            for seg in values)
+        self.next_rows = array('l', (self._row_of(seg.next_segment)
+                                     for seg in values))
+        self.previous_rows = array('l', (self._row_of(seg.previous_segment)
+                                         for seg in values))
+
+    def _row_of(self, segment: Optional[Any]) -> int:
+        if segment is None:
+            return _NO_ROW
+        return self._rows.get(segment.block_id, _NO_ROW)
+
+    def __len__(self) -> int:
+        return len(self.block_ids)
+
+    def row(self, block_id: int) -> int:
+        """Row of `block_id`.
+
+        Raises:
+            KeyError: If the block is not in the table.
+        """
+        return self._rows[block_id]
+
+    def segment(self, row: int) -> Any:
+        """The live segment object at `row`."""
+        return self._segments[row]
+
+    def rows_of_kind(self, *kinds: str) -> List[int]:
+        """Rows whose segment type is one of `kinds` (e.g. "Station")."""
+        wanted = {SEGMENT_TYPES.index(kind) for kind in kinds}
+        return [row for row, kind in enumerate(self.kinds) if kind in wanted]
+
+    def segments_of_kind(self, *kinds: str) -> List[Any]:
+        """Live segment objects whose type is one of `kinds`."""
+        return [self._segments[row] for row in self.rows_of_kind(*kinds)]
+
+    def iter_path(self, row: int, limit: Optional[int] = None) -> Iterator[int]:
+        """Rows reached by following next_rows from `row` (inclusive).
+
+        Stops at a dead end, after `limit` rows, or on returning to a row
+        already visited (loops).
+        """
+        seen = set()
+        while row != _NO_ROW and row not in seen:
+            if limit is not None and len(seen) >= limit:
+                return
+            seen.add(row)
+            yield row
+            row = self.next_rows[row]
+
+    def total_length(self, rows: Optional[Iterable[int]] = None) -> float:
+        """Sum of segment lengths over `rows` (default: every block)."""
+        if rows is None:
+            return sum(self.length)
+        length = self.length
+        return sum(length[row] for row in rows)
@@ -3,18 +3,22 @@ Track Model Backend
 """
 
 # Standard library imports
-import csv
 import os
-import re
 import sys
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from random import Random
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import (TYPE_CHECKING, Any, Callable, Dict, List, Mapping,
+                    Optional, Set, Tuple)
 
 # Local imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from trackModel.layout_cache import load_layout
+from trackModel.segment_table import SegmentTable
+from universal.block_bits import BlockBits, BlockBitsView
 from universal.universal import SignalState, TrainCommand, BeaconData
 
 if TYPE_CHECKING:
@@ -40,6 +44,66 @@ class Direction(Enum):
     BACKWARD = "backward"
     BIDIRECTIONAL = "bidirectional"
 
+class TrackEventType(str, Enum):
+    """Enumeration of state changes published by the TrackNetwork.
+    Members compare equal to their string value, so subscribers match kinds
+    even when this module was imported under a different name."""
+    OCCUPANCY = "occupancy"
+    SWITCH = "switch"
+    SIGNAL = "signal"
+    GATE = "gate"
+    COMMAND = "command"
+    FAILURE = "failure"
+
+# Packed signal codes: TrackNetwork.signal_codes() holds one of these
+# indices per (block, side); 0 means the block has no signal on that side.
+SIGNAL_CODES: Tuple[Optional[SignalState], ...] = (None,) + tuple(SignalState)
+_SIGNAL_CODE_BY_NAME = {state.name: code
+                        for code, state in enumerate(SIGNAL_CODES) if state}
+
+# Failure set of a block that never failed; replaced by a real set on the
+# first failure so healthy blocks don't each carry an empty set.
+_NO_FAILURES: frozenset = frozenset()
+
+@dataclass(frozen=True)
+class TrackChangeEvent:
+    """A single state change on one block.
+
+    Attributes:
+        kind: What changed.
+        block_id: Block the change happened on.
+        value: New value. Occupancy/gate are bools, switch is the position,
+            signal is (signal_side, SignalState), command is the TrainCommand
+            and failure is (TrackFailureType, active).
+    """
+    kind: TrackEventType
+    block_id: int
+    value: Any
+
+
+# get_segment_status() keys reported by get_wayside_status()
+_WAYSIDE_STATUS_KEYS = (
+    "block_id", "type", "length", "speed_limit", "occupied", "beacon_data",
+    "active_command", "closed", "next_segment", "previous_segment",
+    "gate_status", "current_position", "previous_signal_state",
+    "straight_signal_state", "diverging_signal_state",
+)
+
+
+@dataclass(frozen=True)
+class NetworkSnapshot:
+    """Read-only status of every segment at one status version.
+
+    Attributes:
+        version: TrackNetwork.status_version the snapshot was taken at.
+        topology_version: TrackNetwork.topology_version at that time.
+        segments: Block ID -> read-only get_segment_status() mapping, with
+            the failures list stored as a tuple.
+    """
+    version: int
+    topology_version: int
+    segments: Mapping[int, Mapping[str, Any]]
+
 
 class TrackSegment:
     """Base class for all track segments in the railway network.
@@ -63,7 +127,15 @@ class TrackSegment:
         closed: Whether the block is closed for maintenance.
         active_command: Current active TrainCommand for this block.
 
+    Segments use __slots__ (no per-block __dict__) so large networks stay
+    compact; bulk scans should use TrackNetwork.segment_table().
     """
+
+    __slots__ = ('block_id', 'length', 'speed_limit', 'grade', 'elevation',
+                 'underground', 'closed', 'direction', 'next_segment',
+                 'previous_segment', 'next_segment_reverse_entry',
+                 'previous_segment_reverse_entry', 'network', 'occupied',
+                 'failures', 'beacon_data', 'active_command')
     
     def __init__(self, block_id: int, length: float, speed_limit: float,
                  grade: float, elevation: float, underground: bool,
@@ -100,8 +172,8 @@ class TrackSegment:
         # Track status
         self.occupied = False
         
-        # Failure states
-        self.failures: set[TrackFailureType] = set()
+        # Failure states (shared empty set until the first failure)
+        self.failures: set[TrackFailureType] = _NO_FAILURES
 
         # Beacon and track circuit information
         self.beacon_data: Optional['BeaconData'] = None
@@ -115,7 +187,9 @@ class TrackSegment:
         """
         if TrackFailureType.BROKEN_RAIL in self.failures:
             return
-        self.occupied = occupied
+        if occupied != self.occupied:
+            self.occupied = occupied
+            self._publish_change(TrackEventType.OCCUPANCY, occupied)
         #if not occupied:
         #    self.active_command = None
 
@@ -126,6 +200,7 @@ class TrackSegment:
             beacon_data: The beacon information to set in format "[next_station];[previous_station]".
         """
         self.beacon_data = self._parse_beacon_data(beacon_data)
+        self._mark_dirty()
     
     def _parse_beacon_data(self, beacon_data: str) -> Optional['BeaconData']:
         """Parse beacon data string into BeaconData object.
@@ -157,11 +232,15 @@ class TrackSegment:
         """
 
         if failure_type not in self.failures:
+            if not isinstance(self.failures, set):
+                self.failures = set()
             self.failures.add(failure_type)
             self._report_track_failure(failure_type, active=True)
+            self._publish_change(TrackEventType.FAILURE, (failure_type, True))
 
-        if failure_type == TrackFailureType.BROKEN_RAIL:
+        if failure_type == TrackFailureType.BROKEN_RAIL and not self.occupied:
             self.occupied = True
+            self._publish_change(TrackEventType.OCCUPANCY, True)
 
     def clear_track_failure(self, failure_type: TrackFailureType) -> None:
         """Clear a failure condition.
@@ -172,9 +251,11 @@ class TrackSegment:
         if failure_type in self.failures:
             self.failures.remove(failure_type)
             self._report_track_failure(failure_type, active=False)
+            self._publish_change(TrackEventType.FAILURE, (failure_type, False))
 
-        if failure_type == TrackFailureType.BROKEN_RAIL:
+        if failure_type == TrackFailureType.BROKEN_RAIL and self.occupied:
             self.occupied = False
+            self._publish_change(TrackEventType.OCCUPANCY, False)
 
     def _report_track_failure(self, failure_type: TrackFailureType,
                               active: bool) -> None:
@@ -189,6 +270,21 @@ class TrackSegment:
             self.network.add_failure_log_entry(self.block_id, 
                                                failure_type, active)
 
+    def _mark_dirty(self) -> None:
+        """Flag this block's status as changed."""
+        if self.network is not None:
+            self.network._touch(self.block_id)
+
+    def _publish_change(self, kind: 'TrackEventType', value: Any) -> None:
+        """Publish a state change on this block to network subscribers.
+
+        Args:
+            kind: What changed.
+            value: The new value.
+        """
+        if self.network is not None:
+            self.network._publish(kind, self.block_id, value)
+
     def get_next_segment(self) -> Optional['TrackSegment']:
         """Get the next connected track segment.
         
@@ -230,17 +326,27 @@ class TrackSegment:
         if TrackFailureType.TRACK_CIRCUIT_FAILURE in self.failures:
             return
 
-        self.active_command = TrainCommand(commanded_speed, authority)
+        command = TrainCommand(commanded_speed, authority)
+        changed = command != self.active_command
+        self.active_command = command
+        if changed:
+            self._publish_change(TrackEventType.COMMAND, command)
         for train in self.network.trains.values():
                 train.train_command_interrupt(self.block_id)
 
     def close(self) -> None:
         """Close the block for maintenance."""
+        if not self.closed and self.network is not None:
+            self.network.routing_version += 1
         self.closed = True
+        self._mark_dirty()
 
     def open(self) -> None:
         """Open the block after maintenance."""
+        if self.closed and self.network is not None:
+            self.network.routing_version += 1
         self.closed = False
+        self._mark_dirty()
         
 class TrackSwitch(TrackSegment):
     """Switch segment that inherits from TrackSegment.
@@ -254,6 +360,10 @@ class TrackSwitch(TrackSegment):
         current_position: Current switch position (0 or 1).
     """
 
+    __slots__ = ('straight_segment', 'diverging_segment', 'current_position',
+                 'previous_signal_state', 'straight_signal_state',
+                 'diverging_signal_state')
+
     def __init__(self, block_id: int, length: float, speed_limit: float, 
                  grade: float, elevation: float, underground: bool,
                  direction: Direction) -> None:
@@ -289,14 +399,19 @@ class TrackSwitch(TrackSegment):
             return
         match signal_side:
             case 0:
+                previous = self.previous_signal_state
                 self.previous_signal_state = state
             case 1:
+                previous = self.straight_signal_state
                 self.straight_signal_state = state
             case 2:
+                previous = self.diverging_signal_state
                 self.diverging_signal_state = state
             case _:
                 raise ValueError("Invalid signal side. Must be 0 (previous) or "
                                "1 (straight) or 2 (diverging).")
+        if state != previous:
+            self._publish_change(TrackEventType.SIGNAL, (signal_side, state))
             
     def set_switch_paths(self, straight_segment: 'TrackSegment', 
                         diverging_segment: 'TrackSegment') -> None:
@@ -320,8 +435,17 @@ class TrackSwitch(TrackSegment):
             raise ValueError("Invalid switch position. Must be 0 or 1.")
         if TrackFailureType.POWER_FAILURE in self.failures:
             return
+        changed = position != self.current_position
         self.current_position = position
         self._update_connected_segments()
+        if changed:
+            if self.network is not None:
+                self.network.routing_version += 1
+            # the branch segments' previous_segment moved with the points
+            for branch in (self.straight_segment, self.diverging_segment):
+                if branch is not None:
+                    branch._mark_dirty()
+            self._publish_change(TrackEventType.SWITCH, position)
         
         
     def _update_connected_segments(self) -> None:
@@ -363,6 +487,8 @@ class LevelCrossing(TrackSegment):
         gate_status: Whether the crossing gates are closed 
                 (True = closed, False = open).
     """
+
+    __slots__ = ('gate_status',)
     
     def __init__(self, block_id: int, length: float, 
                  speed_limit: float, grade: float, elevation: float, 
@@ -393,7 +519,9 @@ class LevelCrossing(TrackSegment):
                     (True = closed, False = open)
         """
 
-        self.gate_status = status
+        if status != self.gate_status:
+            self.gate_status = status
+            self._publish_change(TrackEventType.GATE, status)
 
 class Station(TrackSegment):
     """Station segment with passenger management capabilities.
@@ -409,6 +537,10 @@ class Station(TrackSegment):
         tickets_sold_total: Number of tickets sold in total.
         ticket_sales_log: Historical record of ticket sales.
     """
+
+    __slots__ = ('station_name', 'station_side', 'passengers_waiting',
+                 'passengers_boarded_total', 'passengers_exited_total',
+                 'passenger_rand_range', 'tickets_sold_total')
     
     def __init__(self, block_id: int, length: float, speed_limit: float,
                  grade: float, elevation: float, underground: bool, 
@@ -458,6 +590,7 @@ class Station(TrackSegment):
                                 self.passenger_rand_range[1])
         self.tickets_sold_total += count
         self.passengers_waiting += count
+        self._mark_dirty()
 
     def passengers_boarding(self, train: 'Train', 
                           count: Optional[int] = None) -> None:
@@ -489,6 +622,7 @@ class Station(TrackSegment):
                 count = 0
         self.passengers_boarded_total += count
         self.passengers_waiting = max(0, self.passengers_waiting - count)
+        self._mark_dirty()
         if train is not None:
             train.board_passengers(count)
         
@@ -506,6 +640,7 @@ class Station(TrackSegment):
         if count < 0:
             raise ValueError("Passenger exit count cannot be negative.")
         self.passengers_exited_total += count
+        self._mark_dirty()
 
     def get_throughput(self) -> List[int]:
         """Get passenger throughput statistics.
@@ -537,8 +672,21 @@ class TrackNetwork:
         """Initialize an empty track network."""
         self.segments: Dict[TrackSegment] = {}
         self.trains: Dict['Train'] = {}
+        # Train registry: str(train_id) -> key in self.trains, so 5 and "5"
+        # find the same train in one lookup (see get_train()).
+        self._train_keys: Dict[str, Any] = {}
+        # Spatial index, kept by connect_train() and update_train_location():
+        # block_id -> keys of the trains on it, and train key -> block_id.
+        self._trains_by_block: Dict[int, Set[Any]] = {}
+        self._train_blocks: Dict[Any, int] = {}
+        # Upstream neighbours of every block (all switch legs), and
+        # (block_id, hops) -> {upstream block_id: hops}, per topology_version
+        self._predecessors: Optional[Dict[int, List[int]]] = None
+        self._upstream_cache: Dict[Tuple[int, int], Dict[int, int]] = {}
+        self._upstream_topology = -1
         # System-wide properties
         self.line_name = ""
+        self.layout_file: Optional[str] = None
         self.time = datetime(2000,1,1,0,0,0)
         self.environmental_temperature = 20       # Celsius
         self.rail_temperature = self.environmental_temperature
@@ -547,6 +695,32 @@ class TrackNetwork:
         
         # Logging
         self.failure_log: List[Dict] = []
+
+        # Change feed: (callback, kinds) pairs, kinds=None means all events
+        self._subscribers: List[tuple] = []
+        # Bumped whenever segments are added or connected, so consumers can
+        # cache per-line indexes until the layout changes.
+        self.topology_version = 0
+        # Bumped when a switch moves or a block is closed/opened, i.e. when
+        # routes through the unchanged layout may differ.
+        self.routing_version = 0
+        # Status versioning: every status change bumps status_version and
+        # stamps the block with it. _segment_versions is kept in version
+        # order so change queries only walk the changed tail.
+        self.status_version = 0
+        self._segment_versions: Dict[int, int] = {}
+        self._dirty_version = 0
+        # block_id -> (version, read-only status), built on demand
+        self._status_cache: Dict[int, Tuple[int, Mapping[str, Any]]] = {}
+        self._status_cache_topology = 0
+        self._snapshot: Optional[NetworkSnapshot] = None
+        # Authoritative packed occupancy (bit per block) and signal states
+        # (3 bytes per block: previous/straight/diverging), kept in step with
+        # the change feed so consumers can diff whole lines with one XOR.
+        self._occupancy = BlockBits()
+        self._signal_codes = bytearray()
+        # Columnar copy of the static segment data, see segment_table()
+        self._segment_table: Optional[SegmentTable] = None
         
     def add_segment(self, segment: TrackSegment) -> None:
         """Add a track segment to the network.
@@ -559,6 +733,231 @@ class TrackNetwork:
             raise ValueError(f"Block ID {block_id} already exists in network.")
         segment.network = self
         self.segments[segment.block_id] = segment
+        self.topology_version += 1
+        self._occupancy[block_id] = bool(segment.occupied)
+        if isinstance(segment, TrackSwitch):
+            self._set_signal_code(block_id, 0, segment.previous_signal_state)
+            self._set_signal_code(block_id, 1, segment.straight_signal_state)
+            self._set_signal_code(block_id, 2, segment.diverging_signal_state)
+        self._touch(block_id)
+
+    def subscribe(self, callback: Callable[['TrackChangeEvent'], None],
+                  kinds: Optional[set] = None) -> None:
+        """Register a callback for block state changes.
+
+        Callbacks run synchronously on the thread that made the change and
+        only fire when a value actually changes.
+
+        Args:
+            callback: Called with a TrackChangeEvent for each change.
+            kinds: Optional set of TrackEventType to receive. None receives
+                every kind.
+        """
+        self.unsubscribe(callback)
+        self._subscribers.append(
+            (callback, frozenset(kinds) if kinds is not None else None))
+
+    def unsubscribe(self, callback: Callable[['TrackChangeEvent'], None]) -> None:
+        """Remove a callback registered with subscribe().
+
+        Args:
+            callback: The callback to remove.
+        """
+        self._subscribers = [(cb, kinds) for cb, kinds in self._subscribers
+                             if cb != callback]
+
+    def _publish(self, kind: TrackEventType, block_id: int, value: Any) -> None:
+        """Deliver a change event to all interested subscribers.
+
+        Args:
+            kind: What changed.
+            block_id: Block the change happened on.
+            value: The new value.
+        """
+        if kind == TrackEventType.OCCUPANCY:
+            self._occupancy[block_id] = bool(value)
+        elif kind == TrackEventType.SIGNAL:
+            self._set_signal_code(block_id, *value)
+        self._touch(block_id)
+        if not self._subscribers:
+            return
+        event = TrackChangeEvent(kind, block_id, value)
+        for callback, kinds in list(self._subscribers):
+            if kinds is not None and kind not in kinds:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[TrackNetwork] Subscriber error on {kind.value} "
+                      f"for block {block_id}: {e}")
+
+    def _set_signal_code(self, block_id: int, signal_side: int,
+                         state: Any) -> None:
+        """Store a signal state in the packed signal array."""
+        index = 3 * block_id + signal_side
+        if index >= len(self._signal_codes):
+            # new array rather than extend(): views handed out pin the old one
+            self._signal_codes = self._signal_codes + bytes(
+                index + 1 - len(self._signal_codes))
+        name = getattr(state, 'name', str(state)).upper()
+        self._signal_codes[index] = _SIGNAL_CODE_BY_NAME.get(name, 0)
+
+    @property
+    def occupancy_bits(self) -> int:
+        """Occupancy of the whole network as an int; bit b is block b."""
+        return self._occupancy.bits
+
+    def occupancy_view(self) -> BlockBitsView:
+        """Read-only, live block ID -> occupied view of the network.
+
+        Returns:
+            A BlockBitsView over the network's packed occupancy.
+        """
+        return BlockBitsView(self._occupancy)
+
+    def signal_codes(self) -> memoryview:
+        """Read-only view of the packed signal states.
+
+        Byte 3 * block_id + side (0 previous, 1 straight, 2 diverging) is
+        an index into SIGNAL_CODES. The array grows when switches are
+        added, so fetch a new view after topology changes.
+
+        Returns:
+            A read-only memoryview over the signal byte array.
+        """
+        return memoryview(self._signal_codes).toreadonly()
+
+    def segment_table(self) -> SegmentTable:
+        """Columnar view of every segment for whole-network scans.
+
+        Rebuilt only after segments are added, connected or rerouted, so
+        repeated scans of a large network don't walk the segment objects.
+
+        Returns:
+            The SegmentTable for the current topology and routing.
+        """
+        key = (self.topology_version, self.routing_version)
+        table = self._segment_table
+        if table is None or table.key != key:
+            table = self._segment_table = SegmentTable(self.segments, key)
+        return table
+
+    def stations(self) -> List['Station']:
+        """Every Station in the network, in layout order."""
+        return self.segment_table().segments_of_kind("Station")
+
+    def _touch(self, block_id: int) -> None:
+        """Record a status change on a block under a new status version.
+
+        Args:
+            block_id: Block whose status changed.
+        """
+        self.status_version += 1
+        self._segment_versions.pop(block_id, None)
+        self._segment_versions[block_id] = self.status_version
+
+    def refresh_status(self) -> None:
+        """Re-derive network-level state after segments were set directly.
+
+        For code that writes segment attributes without the setters (e.g.
+        restoring a checkpoint): re-applies switch positions to the graph,
+        rebuilds the packed occupancy and signal arrays, and marks every
+        block and route as changed so cached views are rebuilt. No change
+        events are published.
+        """
+        self._occupancy.clear()
+        for block_id, segment in self.segments.items():
+            self._occupancy[block_id] = bool(segment.occupied)
+            if isinstance(segment, TrackSwitch):
+                segment._update_connected_segments()
+                self._set_signal_code(block_id, 0, segment.previous_signal_state)
+                self._set_signal_code(block_id, 1, segment.straight_signal_state)
+                self._set_signal_code(block_id, 2, segment.diverging_signal_state)
+            self._touch(block_id)
+        self.routing_version += 1
+
+    def _changed_since(self, version: int) -> List[int]:
+        """Blocks stamped after `version`, newest first."""
+        changed = []
+        for block_id in reversed(self._segment_versions):
+            if self._segment_versions[block_id] <= version:
+                break
+            changed.append(block_id)
+        return changed
+
+    def pop_dirty_blocks(self) -> Set[int]:
+        """Return the blocks whose status changed since the last call.
+
+        Single-consumer shorthand for get_changes_since(); consumers that
+        share the network should keep their own version instead.
+
+        Returns:
+            Set of block IDs with changed status.
+        """
+        dirty = set(self._changed_since(self._dirty_version))
+        self._dirty_version = self.status_version
+        return dirty
+
+    def get_changes_since(self, version: int
+                          ) -> Tuple[int, Dict[int, Mapping[str, Any]]]:
+        """Get the status of segments changed after a status version.
+
+        Cost is proportional to the number of changed segments, so each
+        consumer can poll with the version it last saw.
+
+        Args:
+            version: status_version from the previous call (0 for all).
+        Returns:
+            Tuple of (current status_version, block ID -> read-only
+            segment status for blocks changed since `version`).
+        """
+        return self.status_version, {
+            block_id: self._frozen_segment_status(block_id)
+            for block_id in self._changed_since(version)
+        }
+
+    def get_snapshot(self) -> NetworkSnapshot:
+        """Get a read-only status snapshot of every segment.
+
+        The snapshot is cached and only the segments changed since the
+        previous one are re-read, so repeated calls between changes are
+        free.
+
+        Returns:
+            The NetworkSnapshot for the current status_version.
+        """
+        snapshot = self._snapshot
+        if (snapshot is not None and
+                snapshot.version == self.status_version and
+                snapshot.topology_version == self.topology_version):
+            return snapshot
+        if (snapshot is None or
+                snapshot.topology_version != self.topology_version):
+            segments = {block_id: self._frozen_segment_status(block_id)
+                        for block_id in self.segments}
+        else:
+            segments = dict(snapshot.segments)
+            for block_id in self._changed_since(snapshot.version):
+                segments[block_id] = self._frozen_segment_status(block_id)
+        self._snapshot = NetworkSnapshot(self.status_version,
+                                         self.topology_version,
+                                         MappingProxyType(segments))
+        return self._snapshot
+
+    def _frozen_segment_status(self, block_id: int) -> Mapping[str, Any]:
+        """Cached read-only get_segment_status() for the block's version."""
+        if self._status_cache_topology != self.topology_version:
+            self._status_cache.clear()
+            self._status_cache_topology = self.topology_version
+        version = self._segment_versions.get(block_id, 0)
+        cached = self._status_cache.get(block_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        status = self.get_segment_status(block_id)
+        status["failures"] = tuple(status["failures"])
+        frozen = MappingProxyType(status)
+        self._status_cache[block_id] = (version, frozen)
+        return frozen
 
     def connect_segments(self, seg1_block_id: int, seg2_block_id: int,
                          bidirectional: bool = False,
@@ -594,6 +993,10 @@ class TrackNetwork:
             )
         if segment1 is None and segment2 is None:
             raise ValueError("Both segment IDs not found in track network.")
+        self.topology_version += 1
+        for block_id in (seg1_block_id, seg2_block_id, diverging_seg_block_id):
+            if block_id in self.segments:
+                self._touch(block_id)
         
         if isinstance(segment1, TrackSwitch):
             if diverging_segment is None:
@@ -664,6 +1067,7 @@ class TrackNetwork:
             self.segments.get(diverging_id) if diverging_id is not None 
             else None)
 
+        self.topology_version += 1
         manipulated_segment.previous_segment = previous_segment
         if isinstance(manipulated_segment, TrackSwitch):
             manipulated_segment.straight_segment = straight_segment
@@ -679,218 +1083,61 @@ class TrackNetwork:
     def load_track_layout(self, layout_file: str) -> None: 
         """Load track layout from file.
         
+        The CSV is validated and compiled once; later loads of the same
+        file contents come from the compiled image (see layout_cache).
+        
         Args:
             layout_file: Path to the track layout configuration file.
         """
         print("[TrackNetwork] Loading track layout from file:", layout_file)
         self.line_name = os.path.splitext(os.path.basename(layout_file))[0]
+        self.layout_file = os.path.abspath(layout_file)
+        rows = load_layout(layout_file).rows
 
         # First pass to create segments
-        with open(layout_file, mode='r') as file:
-            csvFile = csv.DictReader(file)
-            current_line = 0
-            for lines in csvFile:
-                if not lines["Type"].strip() and not lines["block_id"].strip():
-                    current_line += 1
-                    continue
-                if lines["block_id"] in self.segments:
-                    raise ValueError(
-                        f"Block ID {lines['block_id']} already exists in "
-                        "network.")
-                if ("Type" not in lines or 
-                        not re.match("^[a-zA-Z]+$", lines["Type"])):
-                    raise ValueError(
-                        f"Invalid 'Type' field in layout file at row "
-                        f"{current_line}.")
-                if ("block_id" not in lines or 
-                        not re.match("^[0-9]+$", lines["block_id"])):
-                    raise ValueError(
-                        f"Invalid 'block_id' field in layout file at row "
-                        f"{current_line}.")
-                if ("length" not in lines or 
-                        not re.match("^[0-9.-]+$", lines["length"])):
-                    raise ValueError(
-                        f"Invalid 'length' field in layout file at row "
-                        f"{current_line}.")
-                if ("speed_limit" not in lines or 
-                        not re.match("^[0-9.-]+$", lines["speed_limit"])):
-                    raise ValueError(
-                        f"Invalid 'speed_limit' field in layout file at row "
-                        f"{current_line}.")
-                if ("grade" not in lines or 
-                        not re.match("^[0-9.-]+$", lines["grade"])):
-                    raise ValueError(
-                        f"Invalid 'grade' field in layout file at row "
-                        f"{current_line}.")
-                if ("elevation" not in lines or 
-                        not re.match("^[0-9.-]+$", lines["elevation"])):
-                    raise ValueError(
-                        f"Invalid 'elevation' field in layout file at row "
-                        f"{current_line}.")
-                if ("underground" not in lines or 
-                        not re.match("^(TRUE|FALSE|true|false)$", 
-                                   lines["underground"])):
-                
-                    raise ValueError(
-                        f"Invalid 'underground' field in layout file at row "
-                        f"{current_line}.")
-                if ("direction" not in lines or 
-                        not re.match("^(FORWARD|BACKWARD|BIDIRECTIONAL)$", 
-                                   lines["direction"], re.IGNORECASE)):
-                    raise ValueError(
-                        f"Invalid 'direction' field in layout file at row "
-                        f"{current_line}.")
-
-                match lines["Type"]:
-                    case "TrackSegment":
-                        segment = TrackSegment(
-                            block_id=int(lines["block_id"]),
-                            length=float(lines["length"]),
-                            speed_limit=float(lines["speed_limit"]),
-                            grade=float(lines["grade"]),
-                            elevation=float(lines["elevation"]),
-                            underground=lines["underground"].lower() == "true",
-                            direction=Direction(lines["direction"].lower())
-                        )
-                        if "beacon_data" in lines and lines["beacon_data"].strip():
-                            segment.set_beacon_data(lines["beacon_data"])
-                        self.add_segment(segment)
-                    case "TrackSwitch":
-                        switch = TrackSwitch(
-                            block_id=int(lines["block_id"]),
-                            length=float(lines["length"]),
-                            speed_limit=float(lines["speed_limit"]),
-                            grade=float(lines["grade"]),
-                            elevation=float(lines["elevation"]),
-                            underground=lines["underground"].lower() == "true",
-                            direction=Direction(lines["direction"].lower())
-                        )
-                        if "beacon_data" in lines and lines["beacon_data"].strip():
-                            switch.set_beacon_data(lines["beacon_data"])
-                        self.add_segment(switch)
-                    case "LevelCrossing":
-                        crossing = LevelCrossing(
-                            block_id=int(lines["block_id"]),
-                            length=float(lines["length"]),
-                            speed_limit=float(lines["speed_limit"]),
-                            grade=float(lines["grade"]),
-                            elevation=float(lines["elevation"]),
-                            underground=lines["underground"].lower() == "true",
-                            direction=Direction(lines["direction"].lower())
-                        )
-                        if "beacon_data" in lines and lines["beacon_data"].strip():
-                            crossing.set_beacon_data(lines["beacon_data"])
-                        self.add_segment(crossing)
-                    case "Station":
-                        if ("station_name" not in lines or 
-                                not re.match(r"^[\w\s\.\'\-\u00C0-\u017F]+$", 
-                                           lines["station_name"])):
-                            raise ValueError(
-                                f"Invalid 'station_name' field in layout "
-                                f"file at row {current_line}.")
-                        if ("station_side" not in lines or 
-                                not re.match("^(left|right|both)$", 
-                                           lines["station_side"], 
-                                           re.IGNORECASE)):
-                            raise ValueError(
-                                f"Invalid 'station_side' field in layout "
-                                f"file at row {current_line}.")
-                        station = Station(
-                            block_id=int(lines["block_id"]),
-                            length=float(lines["length"]),
-                            speed_limit=float(lines["speed_limit"]),
-                            grade=float(lines["grade"]),
-                            elevation=float(lines["elevation"]),
-                            underground=lines["underground"].lower() == "true",
-                            direction=Direction(lines["direction"].lower()),
-                            station_name=lines["station_name"],
-                            station_side=StationSide(
-                                lines["station_side"].lower()))
-                        if "beacon_data" in lines and lines["beacon_data"].strip():
-                            station.set_beacon_data(lines["beacon_data"])
-                        self.add_segment(station)
-                    case _:
-                        raise ValueError(
-                            f"Unknown segment type {lines['Type']} at row "
-                            f"{current_line}.")
-                current_line += 1
+        for row in rows:
+            common = dict(
+                block_id=row.block_id,
+                length=row.length,
+                speed_limit=row.speed_limit,
+                grade=row.grade,
+                elevation=row.elevation,
+                underground=row.underground,
+                direction=Direction(row.direction))
+            match row.segment_type:
+                case "TrackSegment":
+                    segment = TrackSegment(**common)
+                case "TrackSwitch":
+                    segment = TrackSwitch(**common)
+                case "LevelCrossing":
+                    segment = LevelCrossing(**common)
+                case "Station":
+                    segment = Station(
+                        **common,
+                        station_name=row.station_name,
+                        station_side=StationSide(row.station_side))
+            if row.beacon_data:
+                segment.set_beacon_data(row.beacon_data)
+            self.add_segment(segment)
 
         # Second pass to set connections
-        current_line = 0
-        with open(layout_file, mode='r') as file:
-            csvFile = csv.DictReader(file)
-            for lines in csvFile:
-                if not lines["Type"].strip() and not lines["block_id"].strip():
-                    current_line += 1
-                    continue
-                if (lines["previous_segment"] is not None and 
-                        not re.match("(^[0-9]+$|^$)", 
-                                   lines["previous_segment"])):
-                    raise ValueError(
-                        f"Invalid 'previous_segment' field in layout file "
-                        f"at row {current_line}.")
-                if (lines["next_segment"] is not None and 
-                        not re.match("(^[0-9]+$|^$)", lines["next_segment"])):
-                    raise ValueError(
-                        f"Invalid 'next_segment' field in layout file at "
-                        f"row {current_line}.")
-                if (lines["straight_segment"] is not None and 
-                        not re.match("(^[0-9]+$|^$)", 
-                                   lines["straight_segment"])):
-                    raise ValueError(
-                        f"Invalid 'straight_segment' field in layout file "
-                        f"at row {current_line}.")
-                if (lines["diverging_segment"] is not None and 
-                        not re.match("(^[0-9]+$|^$)", 
-                                   lines["diverging_segment"])):
-                    raise ValueError(
-                        f"Invalid 'diverging_segment' field in layout file "
-                        f"at row {current_line}.")
-                # Validate previous_reverse and next_reverse fields
-                previous_reverse = False
-                next_reverse = False
-                
-                if "previous_reverse" in lines and lines["previous_reverse"].strip():
-                    if not re.match("^(TRUE|FALSE|true|false)$", 
-                                    lines["previous_reverse"]):
-                        raise ValueError(
-                            f"Invalid 'previous_reverse' field in layout file "
-                            f"at row {current_line}.")
-                    previous_reverse = lines["previous_reverse"].lower() == "true"
-                
-                if "next_reverse" in lines and lines["next_reverse"].strip():
-                    if not re.match("^(TRUE|FALSE|true|false)$", lines["next_reverse"]):
-                        raise ValueError(
-                            f"Invalid 'next_reverse' field in layout file "
-                            f"at row {current_line}.")
-                    next_reverse = lines["next_reverse"].lower() == "true"
-                match lines["Type"]:
-                    case "TrackSegment" | "LevelCrossing" | "Station":
-                        self._set_connections(
-                            int(lines["block_id"]), 
-                            (int(lines["previous_segment"]) 
-                             if lines["previous_segment"] else None), 
-                            (int(lines["next_segment"]) 
-                             if lines["next_segment"] else None), 
-                            None, 
-                            None,
-                            previous_reverse,
-                            next_reverse)
-                    case "TrackSwitch":
-                        self._set_connections(
-                            int(lines["block_id"]), 
-                            (int(lines["previous_segment"]) 
-                             if lines["previous_segment"] else None), 
-                            None, 
-                            (int(lines["straight_segment"]) 
-                             if lines["straight_segment"] else None), 
-                            (int(lines["diverging_segment"]) 
-                             if lines["diverging_segment"] else None))
-                    case _:
-                        raise ValueError(
-                            f"Unknown segment type {lines['Type']} at row "
-                            f"{current_line}.")
-                current_line += 1
+        for row in rows:
+            if row.segment_type == "TrackSwitch":
+                self._set_connections(
+                    row.block_id,
+                    row.previous_segment,
+                    None,
+                    row.straight_segment,
+                    row.diverging_segment)
+            else:
+                self._set_connections(
+                    row.block_id,
+                    row.previous_segment,
+                    row.next_segment,
+                    None,
+                    None,
+                    row.previous_reverse,
+                    row.next_reverse)
 
         for segment in self.segments.values():
             if isinstance(segment, TrackSwitch):
@@ -1143,18 +1390,13 @@ class TrackNetwork:
             between set range.)
         """
         segment = self.segments.get(block_id)
-        train = self.trains.get(train_id)
+        train = self.get_train(train_id)
         if segment is None:
             raise ValueError(f"Block ID {block_id} not found in track network.")
         if not isinstance(segment, Station):
             raise ValueError(f"Block ID {block_id} is not a station.")
         if train is None:
-            if isinstance(train_id, str):
-                train = self.trains.get(int(train_id))
-            elif isinstance(train_id, int):
-                train = self.trains.get(str(train_id))
-            if train is None:
-                raise ValueError(f"Train ID {train_id} not found in track network.")
+            raise ValueError(f"Train ID {train_id} not found in track network.")
         segment.passengers_boarding(train, count)
 
     def get_throughput(self, block_id: int) -> List[int]:
@@ -1181,18 +1423,13 @@ class TrackNetwork:
             count: Number of passengers exiting the train.
         """
         segment = self.segments.get(block_id)
-        train = self.trains.get(train_id)
+        train = self.get_train(train_id)
         if segment is None:
             raise ValueError(f"Block ID {block_id} not found in track network.")
         if not isinstance(segment, Station):
             raise ValueError(f"Block ID {block_id} is not a station.")
         if train is None:
-            if isinstance(train_id, str):
-                train = self.trains.get(int(train_id))
-            elif isinstance(train_id, int):
-                train = self.trains.get(str(train_id))
-            if train is None:
-                raise ValueError(f"Train ID {train_id} not found in track network.")
+            raise ValueError(f"Train ID {train_id} not found in track network.")
         segment.passengers_exiting(train, count)
     
     def set_switch_position(self, block_id: int, position: int) -> None:
@@ -1228,14 +1465,29 @@ class TrackNetwork:
         """
         self.time = new_time
         if new_time.second % 30 == 0:
-            for segment in self.segments.values():
+            for station in self.stations():
                 try:
-                    segment.sell_tickets()
+                    station.sell_tickets()
                 except Exception as e:
                     continue
         if new_time.second % 5 == 0:
             self.temperature_sim()
 
+    def on_sim_step(self, current_time: datetime, dt: float) -> None:
+        """Fixed-step scheduler hook (PHYSICS phase).
+        
+        Ticket sales and the temperature model key off whole seconds, so
+        with sub-second steps they only run on the step that lands on one.
+        
+        Args:
+            current_time: Current simulation time from the global clock.
+            dt: Simulated seconds since the previous step.
+        """
+        if current_time.microsecond == 0:
+            self.set_time(current_time)
+        else:
+            self.time = current_time
+
     def manual_set_time(self, year: int, month: int, day: int,
                         hour: int, minute: int, second: int) -> None:
         """Manually set the current time in the track network.
@@ -1326,14 +1578,9 @@ class TrackNetwork:
         Returns:
             Dictionary containing train status information.
         """
-        train = self.trains.get(train_id)
+        train = self.get_train(train_id)
         if train is None:
-            if isinstance(train_id, str):
-                train = self.trains.get(int(train_id))
-            elif isinstance(train_id, int):
-                train = self.trains.get(str(train_id))
-            if train is None:
-                raise ValueError(f"Train ID {train_id} not found in track network.")
+            raise ValueError(f"Train ID {train_id} not found in track network.")
         
         train_status = {
             "train_id": train.train_id,
@@ -1355,40 +1602,11 @@ class TrackNetwork:
         Returns:
             Dictionary containing status information relevant to wayside operations.
         """
-
-        segment = self.segments.get(block_id)
-        if segment is None:
+        if block_id not in self.segments:
             raise ValueError(f"Block ID {block_id} not found in track network.")
-        
-        segment_status = {
-            "block_id": segment.block_id,
-            "type": type(segment).__name__,
-            "length": segment.length,
-            "speed_limit": segment.speed_limit,
-            "occupied": segment.occupied,
-            "beacon_data": segment.beacon_data,
-            "active_command": segment.active_command,
-            "closed": segment.closed,
-            "next_segment": (
-                segment.next_segment.block_id
-                if segment.next_segment else None
-            ),
-            "previous_segment": (
-                segment.previous_segment.block_id
-                if segment.previous_segment else None
-            ),
-        }
-
-        if isinstance(segment, LevelCrossing):
-            segment_status["gate_status"] = segment.gate_status
-        
-        if isinstance(segment, TrackSwitch):
-            segment_status["current_position"] = segment.current_position
-            segment_status["previous_signal_state"] = segment.previous_signal_state
-            segment_status["straight_signal_state"] = segment.straight_signal_state
-            segment_status["diverging_signal_state"] = segment.diverging_signal_state
-
-        return segment_status
+        status = self._frozen_segment_status(block_id)
+        return {key: status[key] for key in _WAYSIDE_STATUS_KEYS
+                if key in status}
 
     def get_wayside_status(self) -> Dict[str, Any]:
         """Get complete wayside status.
@@ -1413,27 +1631,38 @@ class TrackNetwork:
             Dictionary containing comprehensive network status information.
         """
 
-        current_time = (self.time if self.time is not None else 
-                        datetime(2000, 1, 1, 0, 0, 0))
-
         network_status = {
             "segments": {
-                block_id: self.get_segment_status(block_id)
-                for block_id in self.segments
+                block_id: {**status, "failures": list(status["failures"])}
+                for block_id, status in self.get_snapshot().segments.items()
             },
             "trains": {
                 train_id: self.get_train_status(train_id)
                 for train_id in self.trains
             },
             "line_name": self.line_name,
+            **self.get_environment_status(),
+            "failure_log": self.get_failure_log()
+        }
+        return network_status
+
+    def get_environment_status(self) -> Dict[str, Any]:
+        """Get the network-wide fields of get_network_status().
+
+        Cheap enough to call every tick, unlike the per-segment status.
+
+        Returns:
+            Dictionary with the time, temperatures and heater state.
+        """
+        current_time = (self.time if self.time is not None else 
+                        datetime(2000, 1, 1, 0, 0, 0))
+        return {
             "time": current_time,
             "environmental_temperature": self.environmental_temperature,
             "rail_temperature": self.rail_temperature,
             "heater_threshold": self.heater_threshold,
             "heaters_active": self.heaters_active,
-            "failure_log": self.get_failure_log()
         }
-        return network_status
     
     def add_train(self, train: 'Train') -> None:
         """Add a train to the network for tracking purposes.
@@ -1441,11 +1670,13 @@ class TrackNetwork:
         Args:
             train: The Train object to add to the network.
         """
-        if train.train_id in self.trains:
+        if self.get_train(train.train_id) is not None:
             raise ValueError(
                 f"Train ID {train.train_id} already exists in network.")
         self.trains[train.train_id] = train
+        self._train_keys[str(train.train_id)] = train.train_id
         train.network = self
+        self.update_train_location(train)
 
     def connect_train(self, train_id: int, block_id: int, 
                       displacement: float) -> None:
@@ -1459,24 +1690,176 @@ class TrackNetwork:
         if block_id not in self.segments:
             raise ValueError(f"Block ID {block_id} not found in track network.")
         
-        train = self.trains.get(train_id)
+        train = self.get_train(train_id)
         if train is None:
-            if isinstance(train_id, str):
-                train = self.trains.get(int(train_id))
-            elif isinstance(train_id, int):
-                train = self.trains.get(str(train_id))
-            if train is None:
-                raise ValueError(f"Train ID {train_id} not found in track network.")
+            raise ValueError(f"Train ID {train_id} not found in track network.")
         train.current_segment = self.segments[block_id]
         train.segment_displacement_m = displacement
         train.network = self
+        self.update_train_location(train)
         print(f"[TrackNetwork] Connected Train {train_id} to Block {block_id} "
               f"at displacement {displacement} m on network {self.line_name}.")
         train.current_segment.set_occupancy(True)
 
+    def remove_train(self, train_id: Any) -> None:
+        """Remove a train from the network and stop simulating it.
+
+        Args:
+            train_id: ID of the train to remove.
+        """
+        train = self.get_train(train_id)
+        if train is None:
+            raise ValueError(f"Train ID {train_id} not found in track network.")
+        key = train.train_id
+        self.trains.pop(key, None)
+        self._train_keys.pop(str(key), None)
+        self._unindex_train(key)
+        detach = getattr(train, "detach", None)
+        if detach is not None:
+            detach()
+
     def clear_trains(self) -> None:
         """Remove all trains from the network."""
         self.trains.clear()
+        self._train_keys.clear()
+        self._trains_by_block.clear()
+        self._train_blocks.clear()
+
+    # ---- train registry and spatial index ----
+    def get_train(self, train_id: Any) -> Optional['Train']:
+        """Look up a train by ID, accepting 5 and "5" alike.
+
+        Args:
+            train_id: The train's ID, as given or as a string/int.
+        Returns:
+            The Train, or None if no train has that ID.
+        """
+        train = self.trains.get(train_id)
+        if train is None:
+            key = self._train_keys.get(str(train_id))
+            if key is not None:
+                train = self.trains.get(key)
+        return train
+
+    def update_train_location(self, train: 'Train') -> None:
+        """Re-index a train after its current_segment changed.
+
+        Called by connect_train() and by Train when it crosses into the
+        next block; anything else that moves a train must call it too.
+
+        Args:
+            train: A train registered on this network.
+        """
+        key = train.train_id
+        seg = train.current_segment
+        block_id = seg.block_id if seg is not None else None
+        if self._train_blocks.get(key) == block_id:
+            return
+        self._unindex_train(key)
+        if block_id is not None:
+            self._train_blocks[key] = block_id
+            self._trains_by_block.setdefault(block_id, set()).add(key)
+
+    def reindex_trains(self) -> None:
+        """Rebuild the train registry and spatial index from scratch.
+
+        For code that sets train.current_segment directly (e.g. restoring
+        a checkpoint).
+        """
+        self._train_keys = {str(key): key for key in self.trains}
+        self._trains_by_block.clear()
+        self._train_blocks.clear()
+        for train in self.trains.values():
+            self.update_train_location(train)
+
+    def _unindex_train(self, key: Any) -> None:
+        block_id = self._train_blocks.pop(key, None)
+        if block_id is None:
+            return
+        keys = self._trains_by_block.get(block_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._trains_by_block[block_id]
+
+    def get_train_block(self, train_id: Any) -> Optional[int]:
+        """Block ID the train is on, or None if unknown or not placed."""
+        train = self.get_train(train_id)
+        if train is None:
+            return None
+        return self._train_blocks.get(train.train_id)
+
+    def trains_on_block(self, block_id: int) -> List['Train']:
+        """Trains currently on a block."""
+        keys = self._trains_by_block.get(block_id)
+        if not keys:
+            return []
+        return [self.trains[key] for key in keys if key in self.trains]
+
+    def upstream_blocks(self, block_id: int, hops: int) -> Dict[int, int]:
+        """Blocks from which `block_id` is reachable within `hops` blocks.
+
+        Follows next_segment and both legs of every switch, whatever their
+        current position, so the result only depends on the layout and is
+        cached until topology_version changes.
+
+        Args:
+            block_id: The block to look upstream of.
+            hops: Maximum distance in blocks.
+        Returns:
+            Upstream block ID -> distance in blocks (1..hops).
+        """
+        if self._upstream_topology != self.topology_version:
+            self._predecessors = None
+            self._upstream_cache = {}
+            self._upstream_topology = self.topology_version
+        cached = self._upstream_cache.get((block_id, hops))
+        if cached is not None:
+            return cached
+
+        if self._predecessors is None:
+            predecessors: Dict[int, List[int]] = {}
+            for seg in self.segments.values():
+                targets = {seg.next_segment}
+                if isinstance(seg, TrackSwitch):
+                    targets.update((seg.straight_segment,
+                                    seg.diverging_segment))
+                for target in targets:
+                    if target is not None and target is not seg:
+                        predecessors.setdefault(target.block_id, []).append(
+                            seg.block_id)
+            self._predecessors = predecessors
+
+        distances: Dict[int, int] = {}
+        frontier = [block_id]
+        for distance in range(1, hops + 1):
+            next_frontier = []
+            for current in frontier:
+                for upstream in self._predecessors.get(current, ()):
+                    if upstream != block_id and upstream not in distances:
+                        distances[upstream] = distance
+                        next_frontier.append(upstream)
+            frontier = next_frontier
+        self._upstream_cache[(block_id, hops)] = distances
+        return distances
+
+    def trains_upstream(self, block_id: int, hops: int = 1
+                        ) -> List[Tuple[int, 'Train']]:
+        """Trains within `hops` blocks upstream of a block, nearest first.
+
+        Args:
+            block_id: The block to look upstream of.
+            hops: Maximum distance in blocks.
+        Returns:
+            (distance in blocks, Train) pairs.
+        """
+        found = []
+        by_block = self._trains_by_block
+        for upstream, distance in self.upstream_blocks(block_id, hops).items():
+            for key in by_block.get(upstream, ()):
+                found.append((distance, self.trains[key]))
+        found.sort(key=lambda pair: pair[0])
+        return found
 
     def gti(self, train_id: int) -> None:    #DEBUG
         """ (Get Train Info) Retrieve information about a specific train.
@@ -1484,14 +1867,9 @@ class TrackNetwork:
         Args:
             train_id: ID of the train to look up.
         """
-        train = self.trains.get(train_id)
+        train = self.get_train(train_id)
         if train is None:
-            if isinstance(train_id, str):
-                train = self.trains.get(int(train_id))
-            elif isinstance(train_id, int):
-                train = self.trains.get(str(train_id))
-            if train is None:
-                raise ValueError(f"Train ID {train_id} not found in track network.")
+            raise ValueError(f"Train ID {train_id} not found in track network.")
         current_segment = (train.current_segment.block_id 
                            if train.current_segment else 'None')
         self.out = (f"[TrackNetwork] Train Info: Train ID: {train.train_id}, "
@@ -1507,14 +1885,9 @@ class TrackNetwork:
             train_id: ID of the train to move.
             distance: Distance in meters to move the train.
         """
-        train = self.trains.get(train_id)
+        train = self.get_train(train_id)
         if train is None:
-            if isinstance(train_id, str):
-                train = self.trains.get(int(train_id))
-            elif isinstance(train_id, int):
-                train = self.trains.get(str(train_id))
-            if train is None:
-                raise ValueError(f"Train ID {train_id} not found in track network.")
+            raise ValueError(f"Train ID {train_id} not found in track network.")
         success = train.mto(distance)
         self.out = (f"[TrackNetwork] Moved Train {train_id} by {distance} m: "
                     f"{'Success' if success else 'Blocked'}.")
@@ -20,6 +20,7 @@ from track_model_backend import (
     Station,
     StationSide,
     TrackFailureType,
+    TrackEventType,
     Direction
 )
 
@@ -911,5 +912,242 @@ def test_network_passengers_boarding_invalid() -> None:
     with pytest.raises(ValueError):
         network.passengers_boarding(1, -5, 10)
 
+def test_subscribe_receives_only_actual_changes() -> None:
+    network = TrackNetwork()
+    network.add_segment(TrackSegment(1, 100, 20, 0, 0, False, Direction.FORWARD))
+    network.add_segment(TrackSwitch(2, 100, 20, 0, 0, False, Direction.FORWARD))
+    network.add_segment(LevelCrossing(3, 100, 20, 0, 0, False, Direction.FORWARD))
+    events = []
+    network.subscribe(events.append)
+
+    network.segments[1].set_occupancy(True)
+    network.segments[1].set_occupancy(True)
+    network.segments[2].set_switch_position(1)
+    network.segments[2].set_signal_state(1, SignalState.GREEN)
+    network.segments[2].set_signal_state(1, SignalState.GREEN)
+    network.segments[3].set_gate_status(True)
+
+    assert [(e.kind, e.block_id, e.value) for e in events] == [
+        (TrackEventType.OCCUPANCY, 1, True),
+        (TrackEventType.SWITCH, 2, 1),
+        (TrackEventType.SIGNAL, 2, (1, SignalState.GREEN)),
+        (TrackEventType.GATE, 3, True),
+    ]
+
+    events.clear()
+    network.set_track_failure(1, TrackFailureType.BROKEN_RAIL)
+    network.segments[1].set_occupancy(False)
+    network.clear_track_failure(1, TrackFailureType.BROKEN_RAIL)
+    assert [(e.kind, e.value) for e in events] == [
+        (TrackEventType.FAILURE, (TrackFailureType.BROKEN_RAIL, True)),
+        (TrackEventType.FAILURE, (TrackFailureType.BROKEN_RAIL, False)),
+        (TrackEventType.OCCUPANCY, False),
+    ]
+
+    network.unsubscribe(events.append)
+    events.clear()
+    network.segments[1].set_occupancy(True)
+    assert events == []
+
+def test_subscribe_kind_filter() -> None:
+    network = TrackNetwork()
+    network.add_segment(TrackSwitch(1, 100, 20, 0, 0, False, Direction.FORWARD))
+    events = []
+    network.subscribe(events.append, kinds={TrackEventType.OCCUPANCY})
+
+    network.segments[1].set_switch_position(1)
+    network.segments[1].set_occupancy(True)
+
+    assert [e.kind for e in events] == [TrackEventType.OCCUPANCY]
+
+def test_pop_dirty_blocks() -> None:
+    network = TrackNetwork()
+    network.add_segment(TrackSegment(1, 100, 20, 0, 0, False, Direction.FORWARD))
+    network.add_segment(Station(2, 300, 69, 0, 0, False, Direction.FORWARD,
+                                "test", StationSide.BOTH))
+    network.add_segment(TrackSegment(3, 100, 20, 0, 0, False, Direction.FORWARD))
+    network.pop_dirty_blocks()
+
+    network.segments[1].set_occupancy(True)
+    network.segments[2].sell_tickets(5)
+    network.segments[3].set_beacon_data("hello")
+    assert network.pop_dirty_blocks() == {1, 2, 3}
+    assert network.pop_dirty_blocks() == set()
+
+    # unchanged values don't mark the block dirty
+    network.segments[1].set_occupancy(True)
+    assert network.pop_dirty_blocks() == set()
+
+    network.close_block(3)
+    assert network.pop_dirty_blocks() == {3}
+
+def test_get_changes_since() -> None:
+    network = TrackNetwork()
+    network.add_segment(TrackSegment(1, 100, 20, 0, 0, False, Direction.FORWARD))
+    network.add_segment(TrackSwitch(2, 100, 20, 0, 0, False, Direction.FORWARD))
+    version, changes = network.get_changes_since(0)
+    assert set(changes) == {1, 2}
+
+    network.segments[1].set_occupancy(True)
+    network.segments[1].set_occupancy(True)
+    new_version, changes = network.get_changes_since(version)
+    assert new_version > version
+    assert list(changes) == [1]
+    assert changes[1]["occupied"] == True
+    with pytest.raises(TypeError):
+        changes[1]["occupied"] = False
+
+    assert network.get_changes_since(new_version) == (new_version, {})
+
+def test_get_snapshot() -> None:
+    network = TrackNetwork()
+    network.add_segment(TrackSegment(1, 100, 20, 0, 0, False, Direction.FORWARD))
+    network.add_segment(TrackSegment(2, 100, 20, 0, 0, False, Direction.FORWARD))
+    snapshot = network.get_snapshot()
+    assert network.get_snapshot() is snapshot
+
+    network.set_track_failure(2, TrackFailureType.POWER_FAILURE)
+    updated = network.get_snapshot()
+    assert updated is not snapshot
+    assert updated.version == network.status_version
+    # unchanged segments are shared between snapshots
+    assert updated.segments[1] is snapshot.segments[1]
+    assert updated.segments[2]["failures"] == (TrackFailureType.POWER_FAILURE,)
+    assert snapshot.segments[2]["failures"] == ()
+    assert network.get_network_status()["segments"][2]["failures"] == [
+        TrackFailureType.POWER_FAILURE]
+
+def test_packed_occupancy_and_signals() -> None:
+    from track_model_backend import SIGNAL_CODES
+    from universal.block_bits import BlockBits, iter_bits
+    network = TrackNetwork()
+    for i in (1, 2, 3):
+        network.add_segment(TrackSegment(i, 100, 20, 0, 0, False, Direction.FORWARD))
+    network.add_segment(TrackSwitch(4, 100, 20, 0, 0, False, Direction.FORWARD))
+    view = network.occupancy_view()
+    before = BlockBits(view)
+
+    network.set_occupancy(1, True)
+    network.set_occupancy(3, True)
+    network.set_track_failure(2, TrackFailureType.BROKEN_RAIL)
+    network.set_occupancy(1, False)
+    assert view[2] is True and view[1] is False
+    assert dict(view) == {b: seg.occupied for b, seg in network.segments.items()}
+    assert list(iter_bits(view.changed(before))) == [2, 3]
+    with pytest.raises(TypeError):
+        view[1] = True
+
+    codes = network.signal_codes()
+    assert SIGNAL_CODES[codes[3 * 4 + 1]] == SignalState.RED
+    network.set_signal_state(4, 1, SignalState.GREEN)
+    assert SIGNAL_CODES[network.signal_codes()[3 * 4 + 1]] == SignalState.GREEN
+    assert network.signal_codes()[3 * 1] == 0
+    with pytest.raises(TypeError):
+        codes[0] = 1
+
+def test_segment_table_columns() -> None:
+    network = TrackNetwork()
+    network.add_segment(TrackSegment(1, 100, 20, 0.5, 1, True, Direction.FORWARD))
+    network.add_segment(TrackSwitch(2, 50, 15, 0, 2, False, Direction.FORWARD))
+    network.add_segment(Station(3, 80, 10, 0, 3, False, Direction.FORWARD,
+                                "Station B", StationSide.LEFT))
+    network.add_segment(TrackSegment(4, 70, 20, 0, 4, False, Direction.FORWARD))
+    network.connect_segments(1, 2)
+    network.connect_segments(2, 3, diverging_seg_block_id=4)
+    with pytest.raises(AttributeError):
+        network.segments[1].not_a_field = True
+
+    table = network.segment_table()
+    assert list(table.block_ids) == [1, 2, 3, 4]
+    assert table.total_length() == 300
+    assert table.flags[table.row(1)] & 1 and not table.flags[table.row(2)]
+    assert [table.block_ids[r] for r in table.iter_path(table.row(1))] == [1, 2, 3]
+    assert network.stations() == [network.segments[3]]
+    assert network.segment_table() is table
+
+    network.set_switch_position(2, 1)
+    table = network.segment_table()
+    assert [table.block_ids[r] for r in table.iter_path(table.row(1))] == [1, 2, 4]
+
+def test_generated_layout_loads(tmp_path) -> None:
+    from trackModel.layout_generator import write_layout
+    path = write_layout(str(tmp_path / "synthetic.csv"), 500, seed=3)
+    network = TrackNetwork()
+    network.load_track_layout(path)
+    assert len(network.segments) == 500
+    switches = [s for s in network.segments.values() if isinstance(s, TrackSwitch)]
+    assert switches and network.stations()
+    assert any(isinstance(s, LevelCrossing) for s in network.segments.values())
+
+    # every switch's siding (3 blocks) rejoins the main line 4 blocks on
+    for switch in switches:
+        block = switch.diverging_segment
+        for _ in range(3):
+            block = block.next_segment
+        assert block.block_id == switch.block_id + 4
+
+def test_layout_cache_matches_csv(tmp_path) -> None:
+    from trackModel import layout_cache
+    csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "green_line.csv")
+    parsed = layout_cache.load_layout(csv_path, use_cache=False)
+    layout_cache.clear_memory_cache()
+    compiled = layout_cache.load_layout(csv_path, cache_dir=str(tmp_path))
+    cached = list(tmp_path.glob("green_line.*.layout"))
+    assert len(cached) == 1
+    layout_cache.clear_memory_cache()
+    warm = layout_cache.load_layout(csv_path, cache_dir=str(tmp_path))
+    assert parsed.rows == compiled.rows == warm.rows
+    assert warm.section_names()[1] == "A1"
+
+    # a corrupt image is recompiled instead of trusted
+    cached[0].write_bytes(b"TLAY garbage")
+    layout_cache.clear_memory_cache()
+    assert layout_cache.load_layout(csv_path, cache_dir=str(tmp_path)).rows == parsed.rows
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text(open(csv_path).read().replace("FALSE", "maybe", 1))
+    with pytest.raises(ValueError):
+        layout_cache.load_layout(str(bad), cache_dir=str(tmp_path))
+
+def test_repeated_command_published_once() -> None:
+    network = TrackNetwork()
+    network.add_segment(TrackSegment(1, 100, 20, 0, 0, False, Direction.FORWARD))
+    events = []
+    network.subscribe(events.append, {TrackEventType.COMMAND})
+
+    network.segments[1].broadcast_train_command(10, 200)
+    network.segments[1].broadcast_train_command(10, 200)
+    network.segments[1].broadcast_train_command(12, 200)
+    assert [e.value for e in events] == [TrainCommand(10, 200), TrainCommand(12, 200)]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+def test_train_index_and_registry() -> None:
+    network = TrackNetwork()
+    for block_id in range(1, 6):
+        network.add_segment(TrackSegment(block_id, 100, 20, 0, 0, False,
+                                         Direction.FORWARD))
+    for block_id in range(1, 5):
+        network.connect_segments(block_id, block_id + 1)
+    train = Train(7)
+    network.add_train(train)
+    network.connect_train("7", 2, 90)
+
+    assert network.get_train("7") is train and network.get_train(7) is train
+    with pytest.raises(ValueError):
+        network.add_train(Train("7"))
+    assert network.get_train_block(7) == 2
+    assert network.trains_on_block(2) == [train]
+    assert network.upstream_blocks(4, 2) == {3: 1, 2: 2}
+    assert network.trains_upstream(4, 1) == []
+    assert network.trains_upstream(4, 2) == [(2, train)]
+
+    train.mto(20)   # crosses into block 3
+    assert network.get_train_block(7) == 3
+    assert network.trains_on_block(2) == []
+    assert network.trains_upstream(4, 1) == [(1, train)]
+
+    network.remove_train("7")
+    assert network.get_train(7) is None
+    assert network.trains_on_block(3) == []
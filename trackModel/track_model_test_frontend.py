@@ -12,7 +12,8 @@ from universal.universal import (
     ConversionFunctions
 )
 
-from universal.global_clock import clock
+from universal.global_clock import SimPhase, clock
+from universal.refresh_bus import refresh_bus
 
 from track_model_backend import (
     TrackNetwork, 
@@ -23,11 +24,15 @@ from track_model_backend import (
     TrackFailureType,
     StationSide
 )
+from track_status_model import (
+    FailureLogModel, SegmentTableModel, StatusRowTracker,
+    failure_row, station_row, train_row,
+)
 from typing import List, Dict, Optional
 
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QTextEdit, 
-    QLabel, QPushButton, QTableWidget, QTableWidgetItem, 
+    QLabel, QPushButton, QTableWidget, QTableWidgetItem, QTableView, 
     QHeaderView, QTabWidget, QLineEdit, QHBoxLayout, 
     QComboBox, QCheckBox
 )
@@ -63,9 +68,11 @@ class NetworkStatusUI(QWidget):
         # display initial network status for the active network
         self.refresh_status()
 
-        clock.register_listener(self.track_network1.set_time)
-        clock.register_listener(self.track_network2.set_time)
-        clock.register_listener(self.auto_refresh_status)
+        clock.register_phase(SimPhase.PHYSICS, self.track_network1.on_sim_step)
+        clock.register_phase(SimPhase.PHYSICS, self.track_network2.on_sim_step)
+        # Repaint from the refresh bus rather than inside the clock tick
+        refresh_bus.start()
+        clock.register_listener(refresh_bus.listener(self.auto_refresh_status))
         
     def init_ui(self):
         self.setWindowTitle("Track Model - Test Network Status")
@@ -104,8 +111,15 @@ class NetworkStatusUI(QWidget):
         self.tab_widget = QTabWidget()
         
         # create tables for each category
-        self.segment_table = QTableWidget()
+        self.segment_table = QTableView()
         self.segment_table.setFont(QFont("Arial", 9))
+        self.segment_model = SegmentTableModel(parent=self)
+        self.segment_table.setModel(self.segment_model)
+        self.segment_table.verticalHeader().setVisible(False)
+        # rows the station / current-failure / train tables last showed
+        self.failure_rows = StatusRowTracker(failure_row)
+        self.station_rows = StatusRowTracker(station_row)
+        self.train_rows = StatusRowTracker(train_row)
         
         # create segment info widget with editing controls
         self.segment_info_widget = self.create_segment_info_widget()
@@ -113,8 +127,11 @@ class NetworkStatusUI(QWidget):
         # create track info widget with controls
         self.track_info_widget = self.create_track_info_widget()
         
-        self.failure_table = QTableWidget()
+        self.failure_table = QTableView()
         self.failure_table.setFont(QFont("Arial", 10))
+        self.failure_model = FailureLogModel(parent=self)
+        self.failure_table.setModel(self.failure_model)
+        self.failure_table.verticalHeader().setVisible(False)
         
         self.station_table = QTableWidget()
         self.station_table.setFont(QFont("Arial", 10))
@@ -678,7 +695,10 @@ class NetworkStatusUI(QWidget):
         try:
             # get and display network status
             self.status_display.append("Refreshing network status...")
+            # rebuild every segment row; clock ticks only redo changed blocks
+            self.segment_model.set_network(self.track_network)
             network_status = self.track_network.get_network_status()
+            self.sync_row_trackers()
             
             # display in table format
             self.populate_status_table(network_status)
@@ -691,19 +711,45 @@ class NetworkStatusUI(QWidget):
     def auto_refresh_status(self, current_time=None):
         """Automatically refresh the network status display"""
         try:
-            # get and display network status
-            network_status = self.track_network.get_network_status()
-            
-            # display in table format
-            self.populate_status_table(network_status)
-        
+            # only the blocks that changed since the last tick are redrawn
+            network = self.track_network
+            changed = self.segment_model.refresh()
+            segments = self.segment_model.segment_statuses()
+
+            self.populate_environment_info(network.get_environment_status())
+            if changed is None:
+                self.populate_segment_dropdown(segments)
+            # the small tables are only redrawn when one of their rows changed
+            if self.failure_rows.update(segments, changed):
+                self.populate_current_failures_table(self.failure_rows.rows())
+            if self.station_rows.update(segments, changed):
+                self.populate_station_table(self.station_rows.rows())
+            self.populate_failure_table(network.get_failure_log())
+            trains = self.train_statuses()
+            if self.train_rows.update(
+                    trains, set(trains).union(self.train_rows.rows())):
+                self.populate_train_table(self.train_rows.rows())
+
         except Exception as e:
             self.status_display.append(f"Error refreshing status: {str(e)}")
-        
+
     def load_and_display(self):
         """legacy method aiped - calls refresh_status"""
         self.refresh_status() 
 
+    def train_statuses(self):
+        """get_train_status() of every train on the active network."""
+        network = self.track_network
+        return {train_id: network.get_train_status(train_id)
+                for train_id in network.trains}
+
+    def sync_row_trackers(self):
+        """Match the row trackers to a full redraw of the status tables."""
+        segments = self.segment_model.segment_statuses()
+        self.failure_rows.update(segments, None)
+        self.station_rows.update(segments, None)
+        self.train_rows.update(self.train_statuses(), None)
+
     def populate_status_table(self, network_status):
         """populate the status tables with network data"""
         if not network_status:
@@ -712,48 +758,12 @@ class NetworkStatusUI(QWidget):
         
         # assuming network_status is a dictionary
         if isinstance(network_status, dict):
-            # update time display if available
-            if 'time' in network_status:
-                time_obj = network_status['time']
-                # format as MM/DD/YY HH:MM
-                formatted_time = time_obj.strftime("%m/%d/%y %H:%M:%S")
-                self.time_label.setText(f"Time: {formatted_time}")
-            
-            # populate segments table
+            self.populate_environment_info(network_status)
+            
+            # populate the segment dropdown for failure injection
             if 'segments' in network_status:
-                self.populate_segments_table(network_status['segments'])
-                # also populate the segment dropdown for failure injection
                 self.populate_segment_dropdown(network_status['segments'])
             
-            # populate track info table
-            track_info = {}
-            if 'environmental_temperature' in network_status:
-                # convert temperature from Celsius to Fahrenheit
-                temp_celsius = network_status['environmental_temperature']
-                temp_fahrenheit = ConversionFunctions.celsius_to_fahrenheit(
-                    temp_celsius
-                )
-                track_info['Environmental Temperature (°F)'] = f"{temp_fahrenheit:.1f}"
-            if 'heater_threshold' in network_status:
-                # convert threshold temperature from Celsius to Fahrenheit
-                threshold_celsius = network_status['heater_threshold']
-                threshold_fahrenheit = ConversionFunctions.celsius_to_fahrenheit(
-                    threshold_celsius
-                )
-                track_info['Heater Threshold (°F)'] = (
-                    f"{threshold_fahrenheit:.1f}"
-                )
-            if 'heaters_active' in network_status:
-                track_info['Heaters Active'] = network_status['heaters_active']
-            if 'rail_temperature' in network_status:
-                # convert rail temperature from Celsius to Fahrenheit
-                rail_temp_celsius = network_status['rail_temperature']
-                rail_temp_fahrenheit = ConversionFunctions.celsius_to_fahrenheit(
-                    rail_temp_celsius
-                )
-                track_info['Rail Temperature (°F)'] = f"{rail_temp_fahrenheit:.1f}"
-            self.populate_track_info_table(track_info)
-            
             # populate current failures table
             if 'segments' in network_status:
                 self.populate_current_failures_table(network_status['segments'])
@@ -770,342 +780,47 @@ class NetworkStatusUI(QWidget):
             if 'trains' in network_status:
                 self.populate_train_table(network_status['trains'])
         else:
-            # if it's not a dict, display as string in first tab
-            self.segment_table.setRowCount(1)
-            self.segment_table.setColumnCount(1)
-            self.segment_table.setHorizontalHeaderLabels(["Network Status"])
-            self.segment_table.setItem(
-                0, 0, QTableWidgetItem(str(network_status))
-            )
-    
-    def populate_dict_as_table(
-        self, table_widget, data_dict, 
-        id_column_name="ID", details_column_name="Details"
-    ):
-        """Helper function to populate a table with dictionary data.
-        
-        Handles nested structures. Only updates cells that have changed.
-        """
-        if not data_dict:
-            # If no data, clear the table
-            table_widget.setRowCount(0)
-            table_widget.setColumnCount(0)
-            return
-        
-        # attributes to exclude from segment info
-        excluded_segment_attributes = {
-            'diverging_segment', 'failures', 'closed',
-            'passengers_boarded_total', 'passengers_exited_total', 
-            'passengers_waiting', 'station_side', 'straight_segment', 
-            'tickets_sold_total', 'station_name', 'underground'
-        }
-        
-        # custom column order for segment info
-        segment_column_order = [
-            'block_id', 'type', 'occupied', 'prev_sig', 'str_sig', 'div_sig', 'speed_limit', 'length', 'grade', 
-            'elevation', 'direction', 'cmd_speed', 'cmd_auth', 'prev_seg', 'next_seg', 
-            'current_pos', 'gate_status', 'beacon_data',
-        ]
-        
-        # column aliases for display
-        column_aliases = {
-            'previous_signal_state': 'prev_sig',
-            'straight_signal_state': 'str_sig',
-            'diverging_signal_state': 'div_sig',
-            'previous_segment': 'prev_seg',
-            'next_segment': 'next_seg',
-            'current_position': 'current_pos',
-            'commanded_speed': 'cmd_speed',
-            'commanded_authority': 'cmd_auth',
-        }
-        
-        # check if this is being called for segments (based on table widget 
-        # or column name)
-        is_segment_table = ((table_widget == self.segment_table) or 
-                           ("Segment" in id_column_name))
-        
-        # count total rows needed - one row per key in data_dict
-        total_rows = len(data_dict)
-        
-        if total_rows == 0:
-            return
-        
-        # pre-process data to split active_command into separate fields
-        processed_data = {}
-        for key, value in data_dict.items():
-            if isinstance(value, dict):
-                new_value = value.copy()
-                # split active_command into commanded_speed and commanded_authority
-                if 'active_command' in new_value and new_value['active_command'] is not None:
-                    cmd = new_value['active_command']
-                    if hasattr(cmd, 'commanded_speed'):
-                        new_value['commanded_speed'] = cmd.commanded_speed
-                    else:
-                        new_value['commanded_speed'] = None
-                    if hasattr(cmd, 'authority'):
-                        new_value['commanded_authority'] = cmd.authority
-                    else:
-                        new_value['commanded_authority'] = None
-                    # remove the original active_command
-                    del new_value['active_command']
-                else:
-                    new_value['commanded_speed'] = None
-                    new_value['commanded_authority'] = None
-                    if 'active_command' in new_value:
-                        del new_value['active_command']
-                processed_data[key] = new_value
-            else:
-                processed_data[key] = value
-        
-        # use processed data instead of original
-        data_dict = processed_data
-            
-        # determine columns based on data structure
-        all_keys = set()
-        for key, value in data_dict.items():
-            if isinstance(value, dict):
-                for sub_key in value.keys():
-                    # filter out excluded attributes for segment tables
-                    if not (is_segment_table and 
-                           sub_key in excluded_segment_attributes):
-                        all_keys.add(sub_key)
-        
-        if all_keys:
-            # create columns for nested structure
-            if is_segment_table:
-                # use custom ordering for segments
-                ordered_columns = []
-                # first add the columns in the specified order
-                for col in segment_column_order:
-                    # check both original name and alias
-                    original_col = next((k for k, v in column_aliases.items() if v == col), col)
-                    if col in all_keys or original_col in all_keys:
-                        ordered_columns.append(col)
-                        all_keys.discard(col)
-                        all_keys.discard(original_col)
-                # add any remaining columns at the end
-                ordered_columns.extend(sorted(list(all_keys)))
-                columns = ordered_columns
-            else:
-                # default behavior for other tables
-                columns = [id_column_name] + sorted(list(all_keys))
-            
-            # Check if we need to resize the table or if columns match
-            current_col_count = table_widget.columnCount()
-            current_row_count = table_widget.rowCount()
-            needs_restructure = (current_col_count != len(columns) or 
-                               current_row_count != total_rows)
-            
-            if needs_restructure:
-                # only restructure if necessary
-                table_widget.setColumnCount(len(columns))
-                table_widget.setHorizontalHeaderLabels(columns)
-                table_widget.setRowCount(total_rows)
-            
-            # populate rows (yes this is disgusting, deal)
-            row = 0
-            for key, value in data_dict.items():
-                if isinstance(value, dict):
-                    if is_segment_table:
-                        # for segments, don't add ID column
-                        for col_idx, col_name in enumerate(columns):
-                            # check if this is an alias, if so use the original name for data lookup
-                            original_col_name = next((k for k, v in column_aliases.items() if v == col_name), col_name)
-                            
-                            if original_col_name in value:
-                                # apply unit conversions and formatting for 
-                                # segment display
-                                cell_value = value[original_col_name]
-                                item = None
-                                
-                                if (original_col_name == 'length' and 
-                                   isinstance(cell_value, (int, float))):
-                                    # convert length from meters to yards
-                                    yards_value = ConversionFunctions.meters_to_yards(
-                                        cell_value
-                                    )
-                                    display_value = f"{yards_value:.2f} yds"
-                                    item = QTableWidgetItem(display_value)
-                                elif original_col_name == 'speed_limit' and isinstance(cell_value, (int, float)):
-                                    # convert speed from m/s to mph
-                                    mph_value = ConversionFunctions.mps_to_mph(cell_value)
-                                    display_value = f"{mph_value:.1f} mph"
-                                    item = QTableWidgetItem(display_value)
-                                elif (original_col_name == 'grade' and 
-                                      isinstance(cell_value, (int, float))):
-                                    # convert grade from decimal to percentage
-                                    display_value = f"{cell_value:.2f} %"
-                                    item = QTableWidgetItem(display_value)
-                                elif (original_col_name == 'elevation' and 
-                                      isinstance(cell_value, (int, float))):
-                                    # convert elevation from meters to feet
-                                    yards_value = (
-                                        ConversionFunctions.meters_to_yards(
-                                            cell_value)/3)
-                                    display_value = f"{yards_value:.2f} ft"
-                                    item = QTableWidgetItem(display_value)
-                                elif original_col_name == 'direction':
-                                    # convert direction to user-friendly display with arrows
-                                    direction_str = str(cell_value).upper()
-                                    
-                                    if direction_str in ['DIRECTION.BIDIRECTIONAL']:
-                                        display_value = "↔️ Bidirectional"
-                                        color = QColor(230, 230, 255)  # light purple
-                                    elif direction_str in ['DIRECTION.FORWARD']:
-                                        display_value = "➡️ Forward"
-                                        color = QColor(200, 255, 200)  # light green
-                                    elif direction_str in ['DIRECTION.BACKWARD']:
-                                        display_value = "⬅️ Backward"
-                                        color = QColor(255, 220, 200)  # light red
-                                    else:
-                                        display_value = str(cell_value)
-                                    item = QTableWidgetItem(display_value)
-                                    item.setBackground(color)
-                                elif original_col_name in ['previous_signal_state', 'straight_signal_state', 'diverging_signal_state']:
-                                    if hasattr(cell_value, 'name'):
-                                        signal_name = cell_value.name
-                                    else:
-                                        signal_name = str(cell_value)
-                                    
-                                    if signal_name == 'RED' or str(cell_value) == 'SignalState.RED':
-                                        display_value = "🔴 Red"
-                                        color = QColor(255, 200, 200)  # light red background
-                                    elif signal_name == 'YELLOW' or str(cell_value) == 'SignalState.YELLOW':
-                                        display_value = "🟡 Yellow"
-                                        color = QColor(255, 255, 200)  # light yellow background
-                                    elif signal_name == 'GREEN' or str(cell_value) == 'SignalState.GREEN':
-                                        display_value = "🟢 Green"
-                                        color = QColor(200, 255, 200)  # light green background
-                                    elif signal_name == 'SUPERGREEN' or str(cell_value) == 'SignalState.SUPERGREEN':
-                                        display_value = "🟢 Super Green"
-                                        color = QColor(150, 255, 150)  # brighter green background
-                                    else:
-                                        display_value = str(cell_value)
-                                        color = QColor(240, 240, 240)  # light gray background
-                                    
-                                    item = QTableWidgetItem(display_value)
-                                    item.setBackground(color)
-                                elif original_col_name == 'occupied':
-                                    if isinstance(cell_value, bool):
-                                        if cell_value:
-                                            display_value = "🟢 Occupied"
-                                            color = QColor(200, 255, 200)  # light green background
-                                        else:
-                                            display_value = "🔴 Unoccupied"
-                                            color = QColor(255, 200, 200)  # light red background
-                                    else:
-                                        # handle string representations
-                                        str_value = str(cell_value).lower()
-                                        if str_value in ['true', '1', 'occupied']:
-                                            display_value = "🟢 Occupied"
-                                            color = QColor(200, 255, 200)  # light green background
-                                        else:
-                                            display_value = "🔴 Unoccupied"
-                                            color = QColor(255, 200, 200)  # light red background
-                                    
-                                    item = QTableWidgetItem(display_value)
-                                    item.setBackground(color)
-                                elif original_col_name == 'closed':
-                                    if isinstance(cell_value, bool):
-                                        if cell_value:
-                                            display_value = "🔴 Closed"
-                                            color = QColor(255, 200, 200)  # red background
-                                        else:
-                                            display_value = "🟢 Open"
-                                            color = QColor(230, 255, 230)  # very light green background
-                                    else:
-                                        # handle string representations
-                                        str_value = str(cell_value).lower()
-                                        if str_value in ['true', '1', 'closed']:
-                                            display_value = "🔴 Closed"
-                                            color = QColor(255, 200, 200)  # red background
-                                        else:
-                                            display_value = "🟢 Open"
-                                            color = QColor(230, 255, 230)  # very light green background
-                                    
-                                    item = QTableWidgetItem(display_value)
-                                    item.setBackground(color)
-                                elif original_col_name == 'commanded_speed':
-                                    # convert speed from m/s to mph
-                                    if cell_value is not None and isinstance(cell_value, (int, float)):
-                                        mph_value = ConversionFunctions.mps_to_mph(cell_value)
-                                        display_value = f"{mph_value:.1f} mph"
-                                    else:
-                                        display_value = "None"
-                                    item = QTableWidgetItem(display_value)
-                                elif original_col_name == 'commanded_authority':
-                                    # convert authority from meters to yards
-                                    if cell_value is not None and isinstance(cell_value, (int, float)):
-                                        yards_value = ConversionFunctions.meters_to_yards(cell_value)
-                                        display_value = f"{yards_value:.2f} yds"
-                                    else:
-                                        display_value = "None"
-                                    item = QTableWidgetItem(display_value)
-                                else:
-                                    display_value = str(cell_value)
-                                    item = QTableWidgetItem(display_value)
-                                
-                                # only update if the value has changed
-                                existing_item = table_widget.item(row, col_idx)
-                                if existing_item is None or existing_item.text() != display_value:
-                                    table_widget.setItem(row, col_idx, item)
-                            else:
-                                # only clear if the cell has content
-                                existing_item = table_widget.item(row, col_idx)
-                                if existing_item is not None and existing_item.text() != "":
-                                    table_widget.setItem(row, col_idx, QTableWidgetItem(""))
-                    else:
-                        # for other tables, add ID column
-                        existing_id = table_widget.item(row, 0)
-                        if existing_id is None or existing_id.text() != str(key):
-                            table_widget.setItem(row, 0, QTableWidgetItem(str(key)))
-                        
-                        for col_idx, col_name in enumerate(columns[1:], 1):
-                            if col_name in value:
-                                new_value = str(value[col_name])
-                                existing_item = table_widget.item(row, col_idx)
-                                if existing_item is None or existing_item.text() != new_value:
-                                    table_widget.setItem(row, col_idx, QTableWidgetItem(new_value))
-                            else:
-                                existing_item = table_widget.item(row, col_idx)
-                                if existing_item is not None and existing_item.text() != "":
-                                    table_widget.setItem(row, col_idx, QTableWidgetItem(""))
-                    row += 1
-                else:
-                    table_widget.setItem(row, 0, QTableWidgetItem(str(key)))
-                    table_widget.setItem(row, 1, QTableWidgetItem(str(value)))
-                    row += 1
-        else:
-            table_widget.setColumnCount(2)
-            table_widget.setHorizontalHeaderLabels([id_column_name, details_column_name])
-            table_widget.setRowCount(len(data_dict))
-            
-            row = 0
-            for key, value in data_dict.items():
-                table_widget.setItem(row, 0, QTableWidgetItem(str(key)))
-                table_widget.setItem(row, 1, QTableWidgetItem(str(value)))
-                row += 1
-        
-        table_widget.resizeColumnsToContents()
-    
-    def populate_segments_table(self, segments_data):
-        """Populate the segments table"""
-        if not segments_data:
-            return
-            
-        if isinstance(segments_data, dict):
-            self.populate_dict_as_table(self.segment_table, segments_data, "Segment ID", "Properties")
-            # hide row numbers for segment table
-            self.segment_table.verticalHeader().setVisible(False)
-        else:
-            # if it's a list or other format
-            self.segment_table.setRowCount(1)
-            self.segment_table.setColumnCount(1)
-            self.segment_table.setHorizontalHeaderLabels(["Segments"])
-            self.segment_table.setItem(0, 0, QTableWidgetItem(str(segments_data)))
-            # hide row numbers for segment table
-            self.segment_table.verticalHeader().setVisible(False)
+            self.status_display.append(
+                f"Unexpected network status: {network_status}")
     
+    def populate_environment_info(self, network_status):
+        """Update the time label and the track info table"""
+        # update time display if available
+        if 'time' in network_status:
+            time_obj = network_status['time']
+            # format as MM/DD/YY HH:MM
+            formatted_time = time_obj.strftime("%m/%d/%y %H:%M:%S")
+            self.time_label.setText(f"Time: {formatted_time}")
+
+        # populate track info table
+        track_info = {}
+        if 'environmental_temperature' in network_status:
+            # convert temperature from Celsius to Fahrenheit
+            temp_celsius = network_status['environmental_temperature']
+            temp_fahrenheit = ConversionFunctions.celsius_to_fahrenheit(
+                temp_celsius
+            )
+            track_info['Environmental Temperature (°F)'] = f"{temp_fahrenheit:.1f}"
+        if 'heater_threshold' in network_status:
+            # convert threshold temperature from Celsius to Fahrenheit
+            threshold_celsius = network_status['heater_threshold']
+            threshold_fahrenheit = ConversionFunctions.celsius_to_fahrenheit(
+                threshold_celsius
+            )
+            track_info['Heater Threshold (°F)'] = (
+                f"{threshold_fahrenheit:.1f}"
+            )
+        if 'heaters_active' in network_status:
+            track_info['Heaters Active'] = network_status['heaters_active']
+        if 'rail_temperature' in network_status:
+            # convert rail temperature from Celsius to Fahrenheit
+            rail_temp_celsius = network_status['rail_temperature']
+            rail_temp_fahrenheit = ConversionFunctions.celsius_to_fahrenheit(
+                rail_temp_celsius
+            )
+            track_info['Rail Temperature (°F)'] = f"{rail_temp_fahrenheit:.1f}"
+        self.populate_track_info_table(track_info)
+
     def populate_track_info_table(self, track_info):
         """Populate the track info table"""
         if not track_info:
@@ -1760,7 +1475,7 @@ class NetworkStatusUI(QWidget):
     
     def populate_current_failures_table(self, segments_data):
         """Populate the current failures table with segments that have active failures"""
-        if not segments_data:
+        if segments_data is None:
             return
         
         # collect segments with failures
@@ -1819,36 +1534,14 @@ class NetworkStatusUI(QWidget):
     
     def populate_failure_table(self, failure_data):
         """Populate the failure log table"""
-        if not failure_data:
+        if not isinstance(failure_data, list):
             return
-            
-        if isinstance(failure_data, dict):
-            self.populate_dict_as_table(self.failure_table, failure_data, "Failure ID", "Properties")
-        elif isinstance(failure_data, list):
-            # convert list to dict format for better table display
-            if failure_data and isinstance(failure_data[0], dict):
-                # if list contains dictionaries, convert to indexed dict
-                dict_data = {f"Failure_{i}": failure for i, failure in enumerate(failure_data)}
-                self.populate_dict_as_table(self.failure_table, dict_data, "Failure ID", "Properties")
-            else:
-                # simple list display
-                self.failure_table.setRowCount(len(failure_data))
-                self.failure_table.setColumnCount(1)
-                self.failure_table.setHorizontalHeaderLabels(["Failures"])
-                
-                for row, failure in enumerate(failure_data):
-                    self.failure_table.setItem(row, 0, QTableWidgetItem(str(failure)))
-        else:
-            self.failure_table.setRowCount(1)
-            self.failure_table.setColumnCount(1)
-            self.failure_table.setHorizontalHeaderLabels(["Failures"])
-            self.failure_table.setItem(0, 0, QTableWidgetItem(str(failure_data)))
-            
-        self.failure_table.resizeColumnsToContents()
+        if self.failure_model.sync(failure_data):
+            self.failure_table.resizeColumnsToContents()
 
     def populate_station_table(self, segments_data):
         """Populate the station info table with station-specific data"""
-        if not segments_data:
+        if segments_data is None:
             return
         
         # filter segments to only include those with stations
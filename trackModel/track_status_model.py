@@ -0,0 +1,388 @@
+"""
+Qt table models for the Track Model status views.
+
+NetworkStatusUI used to rebuild every segment row from get_network_status()
+on each clock tick. These models keep the formatted rows between refreshes
+and only recompute the blocks TrackNetwork reports as changed since the
+status version they last saw, emitting dataChanged for the rows whose text
+or colour actually changed. StatusRowTracker does the same bookkeeping for
+the smaller station, current-failure and train tables.
+"""
+from typing import (Any, Callable, Dict, Hashable, Iterable, List, Mapping,
+                    Optional, Set, Tuple)
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+
+from universal.universal import ConversionFunctions
+
+# display order of the Segment Info columns
+SEGMENT_COLUMNS = [
+    'block_id', 'type', 'occupied', 'prev_sig', 'str_sig', 'div_sig',
+    'speed_limit', 'length', 'grade', 'elevation', 'direction',
+    'cmd_speed', 'cmd_auth', 'prev_seg', 'next_seg', 'current_pos',
+    'gate_status', 'beacon_data',
+]
+
+# display column -> get_segment_status() key, where they differ
+COLUMN_SOURCES = {
+    'prev_sig': 'previous_signal_state',
+    'str_sig': 'straight_signal_state',
+    'div_sig': 'diverging_signal_state',
+    'prev_seg': 'previous_segment',
+    'next_seg': 'next_segment',
+    'current_pos': 'current_position',
+    'cmd_speed': 'commanded_speed',
+    'cmd_auth': 'commanded_authority',
+}
+
+# (text, background RGB or None)
+Cell = Tuple[str, Optional[Tuple[int, int, int]]]
+
+_SIGNAL_CELLS = {
+    'RED': ("🔴 Red", (255, 200, 200)),
+    'YELLOW': ("🟡 Yellow", (255, 255, 200)),
+    'GREEN': ("🟢 Green", (200, 255, 200)),
+    'SUPERGREEN': ("🟢 Super Green", (150, 255, 150)),
+}
+
+_DIRECTION_CELLS = {
+    'DIRECTION.BIDIRECTIONAL': ("↔️ Bidirectional", (230, 230, 255)),
+    'DIRECTION.FORWARD': ("➡️ Forward", (200, 255, 200)),
+    'DIRECTION.BACKWARD': ("⬅️ Backward", (255, 220, 200)),
+}
+
+
+def _with_command(status: Mapping[str, Any]) -> Dict[str, Any]:
+    """Split active_command into commanded_speed / commanded_authority."""
+    status = dict(status)
+    cmd = status.pop('active_command', None)
+    status['commanded_speed'] = getattr(cmd, 'commanded_speed', None)
+    status['commanded_authority'] = getattr(cmd, 'authority', None)
+    return status
+
+
+def format_segment_cell(key: str, value: Any) -> Cell:
+    """Format one get_segment_status() value for the Segment Info table.
+
+        Args:
+            key: The get_segment_status() key (not the display alias).
+            value: The raw value.
+        Returns:
+            The display text and background colour.
+    """
+    is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if key == 'length' and is_number:
+        return f"{ConversionFunctions.meters_to_yards(value):.2f} yds", None
+    if key == 'speed_limit' and is_number:
+        return f"{ConversionFunctions.mps_to_mph(value):.1f} mph", None
+    if key == 'grade' and is_number:
+        return f"{value:.2f} %", None
+    if key == 'elevation' and is_number:
+        return f"{ConversionFunctions.meters_to_yards(value) / 3:.2f} ft", None
+    if key == 'direction':
+        return _DIRECTION_CELLS.get(str(value).upper(), (str(value), None))
+    if key in ('previous_signal_state', 'straight_signal_state',
+               'diverging_signal_state'):
+        name = getattr(value, 'name', str(value).split('.')[-1])
+        return _SIGNAL_CELLS.get(name, (str(value), (240, 240, 240)))
+    if key == 'commanded_speed':
+        if is_number:
+            return f"{ConversionFunctions.mps_to_mph(value):.1f} mph", None
+        return "None", None
+    if key == 'commanded_authority':
+        if is_number:
+            return f"{ConversionFunctions.meters_to_yards(value):.2f} yds", None
+        return "None", None
+    if key == 'occupied':
+        if str(value).lower() in ('true', '1', 'occupied'):
+            return "🟢 Occupied", (200, 255, 200)
+        return "🔴 Unoccupied", (255, 200, 200)
+    return str(value), None
+
+
+# get_segment_status() keys shown in the station table
+STATION_KEYS = (
+    'block_id', 'station_name', 'station_side', 'tickets_sold_total',
+    'passengers_waiting', 'passengers_boarded_total',
+    'passengers_exited_total',
+)
+
+
+def station_row(status: Mapping[str, Any]) -> Optional[Tuple]:
+    """Station table values of a segment, or None if it has no station."""
+    if not status.get('station_name'):
+        return None
+    return tuple(status.get(key, '') for key in STATION_KEYS)
+
+
+def failure_row(status: Mapping[str, Any]) -> Optional[Tuple]:
+    """Active failures of a segment, or None if it has none."""
+    return tuple(status.get('failures') or ()) or None
+
+
+def train_row(status: Mapping[str, Any]) -> Optional[Tuple]:
+    """Train table values from get_train_status()."""
+    return (status.get('current_segment'), status.get('segment_displacement'))
+
+
+class StatusRowTracker:
+    """Rows a status table last showed, updated from changed keys only.
+
+    `row_of(status)` gives the values a status contributes to the table,
+    or None if it isn't shown (e.g. a block without a station). update()
+    re-derives only the keys it is given and reports whether any shown
+    row differs, so the table is redrawn only then.
+    """
+
+    def __init__(self, row_of: Callable[[Mapping[str, Any]], Optional[Tuple]]):
+        self._row_of = row_of
+        self._values: Dict[Hashable, Tuple] = {}
+        self._statuses: Dict[Hashable, Mapping[str, Any]] = {}
+
+    def update(self, statuses: Mapping[Hashable, Mapping[str, Any]],
+               changed: Optional[Iterable[Hashable]]) -> bool:
+        """Re-derive the rows for `changed` keys.
+
+            Args:
+                statuses: Key -> latest status; keys missing from it are
+                    dropped from the table.
+                changed: Keys whose status may have changed, or None to
+                    rebuild from every status.
+            Returns:
+                True if the shown rows changed.
+        """
+        dirty = False
+        if changed is None:
+            dirty = bool(self._values)
+            self._values.clear()
+            self._statuses.clear()
+            changed = statuses.keys()
+        for key in changed:
+            status = statuses.get(key)
+            values = self._row_of(status) if status is not None else None
+            if values is None:
+                if self._values.pop(key, None) is not None:
+                    del self._statuses[key]
+                    dirty = True
+                continue
+            self._statuses[key] = status
+            if self._values.get(key) != values:
+                self._values[key] = values
+                dirty = True
+        return dirty
+
+    def rows(self) -> Dict[Hashable, Mapping[str, Any]]:
+        """Statuses of the shown rows, in key order."""
+        return {key: self._statuses[key]
+                for key in sorted(self._statuses, key=_row_order)}
+
+
+def _row_order(key: Hashable) -> Tuple:
+    # block IDs numerically, anything else (train IDs) by text after them
+    if isinstance(key, int):
+        return 0, key, ''
+    return 1, 0, str(key)
+
+
+class SegmentTableModel(QAbstractTableModel):
+    """Segment Info rows for one TrackNetwork, refreshed per changed block."""
+
+    def __init__(self, network=None, parent=None):
+        """Initialize the model.
+
+            Args:
+                network: The TrackNetwork to display (optional).
+                parent: Parent QObject (optional).
+        """
+        super().__init__(parent)
+        self._network = None
+        self._topology = None
+        self._version = 0
+        self._columns: List[str] = []
+        self._block_ids: List[int] = []
+        self._row_of: Dict[int, int] = {}
+        self._statuses: Dict[int, Dict[str, Any]] = {}
+        self._rows: List[List[Cell]] = []
+        if network is not None:
+            self.set_network(network)
+
+    # ---- Qt model interface ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        text, colour = self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.BackgroundRole and colour is not None:
+            return QColor(*colour)
+        return None
+
+    def headerData(self, section, orientation,
+                   role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._columns[section]
+        return str(self._block_ids[section])
+
+    # ---- updates ----
+    def set_network(self, network) -> None:
+        """Show a (possibly different) network, rebuilding every row.
+
+            Args:
+                network: The TrackNetwork to display.
+        """
+        self.beginResetModel()
+        self._network = network
+        self._topology = self._topology_key()
+        if network is not None:
+            snapshot = network.get_snapshot()
+            self._version = snapshot.version
+            self._statuses = {bid: _with_command(status)
+                              for bid, status in snapshot.segments.items()}
+        else:
+            self._version = 0
+            self._statuses = {}
+        self._block_ids = list(self._statuses)
+        self._row_of = {bid: row for row, bid in enumerate(self._block_ids)}
+        present = set()
+        for status in self._statuses.values():
+            present.update(status)
+        self._columns = [col for col in SEGMENT_COLUMNS
+                         if COLUMN_SOURCES.get(col, col) in present]
+        self._rows = [self._format_row(self._statuses[bid])
+                      for bid in self._block_ids]
+        self.endResetModel()
+
+    def refresh(self) -> Optional[Set[int]]:
+        """Bring the model up to date with the network.
+
+        Rebuilds everything if segments were added or connected since the
+        last reset, otherwise only recomputes the segments changed since
+        the status version the model last saw.
+
+            Returns:
+                The block IDs whose status changed, or None if the model was
+                rebuilt from scratch.
+        """
+        if self._network is None:
+            return set()
+        if self._topology != self._topology_key():
+            self.set_network(self._network)
+            return None
+        self._version, changes = self._network.get_changes_since(
+            self._version)
+        self.update_rows(changes)
+        return set(changes)
+
+    def update_rows(self, changes: Mapping[int, Mapping[str, Any]]) -> int:
+        """Replace the given rows and notify views of the ones that changed.
+
+            Args:
+                changes: Block ID -> new get_segment_status() mapping.
+            Returns:
+                Number of rows whose display changed.
+        """
+        changed = 0
+        last_col = len(self._columns) - 1
+        for bid, status in changes.items():
+            row = self._row_of.get(bid)
+            if row is None:
+                continue
+            status = _with_command(status)
+            self._statuses[bid] = status
+            cells = self._format_row(status)
+            if cells == self._rows[row]:
+                continue
+            self._rows[row] = cells
+            changed += 1
+            self.dataChanged.emit(self.index(row, 0),
+                                  self.index(row, last_col))
+        return changed
+
+    def segment_statuses(self) -> Dict[int, Dict[str, Any]]:
+        """Latest get_segment_status() dicts, keyed by block ID.
+
+        active_command is already split into commanded_speed and
+        commanded_authority. Lets the other status tables reuse the rows
+        computed here instead of querying every segment again.
+        """
+        return self._statuses
+
+    def _format_row(self, status: Dict[str, Any]) -> List[Cell]:
+        row = []
+        for col in self._columns:
+            key = COLUMN_SOURCES.get(col, col)
+            row.append(format_segment_cell(key, status[key])
+                       if key in status else ("", None))
+        return row
+
+    def _topology_key(self):
+        if self._network is None:
+            return None
+        return (getattr(self._network, 'topology_version', 0),
+                len(self._network.segments))
+
+
+class FailureLogModel(QAbstractTableModel):
+    """Append-only view of TrackNetwork.failure_log."""
+
+    COLUMNS = ["Failure ID", "active", "block_id", "failure_type", "timestamp"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source: Optional[list] = None
+        self._rows: List[List[str]] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation,
+                   role=Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole and
+                orientation == Qt.Orientation.Horizontal):
+            return self.COLUMNS[section]
+        return None
+
+    def sync(self, failure_log: list) -> int:
+        """Append entries added to the log since the last call.
+
+        The log is only ever appended to, so a different list (network
+        switch) or a shorter one resets the view.
+
+            Args:
+                failure_log: TrackNetwork.get_failure_log().
+            Returns:
+                Number of rows appended.
+        """
+        if failure_log is not self._source or len(failure_log) < len(self._rows):
+            self.beginResetModel()
+            self._source = failure_log
+            self._rows = []
+            self.endResetModel()
+        start = len(self._rows)
+        if len(failure_log) == start:
+            return 0
+        self.beginInsertRows(QModelIndex(), start, len(failure_log) - 1)
+        for i in range(start, len(failure_log)):
+            entry = failure_log[i]
+            self._rows.append([f"Failure_{i}"] + [
+                str(entry.get(col, "")) for col in self.COLUMNS[1:]
+            ])
+        self.endInsertRows()
+        return len(failure_log) - start
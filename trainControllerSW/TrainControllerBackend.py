@@ -40,10 +40,11 @@ except (ImportError, ModuleNotFoundError):
 
 # Try to import global clock
 try:
-    from global_clock import clock
+    from global_clock import clock, SimPhase
 except (ImportError, ModuleNotFoundError):
     # Fallback: Create a simple clock
     import datetime
+    SimPhase = None
     
     class SimpleClock:
         def __init__(self):
@@ -137,10 +138,13 @@ class TrainControllerBackend:
         self.status_log = []
         
         # Register with global clock
-        clock.register_listener(self.on_clock_tick)
+        if SimPhase is not None:
+            clock.register_phase(SimPhase.CONTROL, self.on_clock_tick)
+        else:
+            clock.register_listener(self.on_clock_tick)
         
-    def on_clock_tick(self, current_time):
-        """Called by global clock each tick."""
+    def on_clock_tick(self, current_time, dt=None):
+        """Called by global clock each tick (CONTROL phase)."""
         self.calculate_power()
         
     def set_automatic_mode(self, auto):
@@ -36,6 +36,12 @@ except (ImportError, ModuleNotFoundError):
     # Use the one from Backend
     from TrainControllerBackend import clock
 
+# Import shared UI refresh bus (falls back to repainting on the timer)
+try:
+    from universal.refresh_bus import refresh_bus
+except (ImportError, ModuleNotFoundError):
+    refresh_bus = None
+
 
 class TrainControllerUI(QMainWindow):
     """Main Train Controller UI window."""
@@ -45,9 +51,13 @@ class TrainControllerUI(QMainWindow):
         self.backend = TrainControllerBackend()
         self.init_ui()
         
-        # Update timer (50ms = 20Hz)
+        # Update timer (50ms = 20Hz); repaints go through the refresh bus
         self.timer = QTimer()
-        self.timer.timeout.connect(self.update_display)
+        if refresh_bus is not None:
+            refresh_bus.start()
+            self.timer.timeout.connect(refresh_bus.listener(self.update_display))
+        else:
+            self.timer.timeout.connect(self.update_display)
         self.timer.timeout.connect(self.tick_clock)
         self.timer.start(50)
         
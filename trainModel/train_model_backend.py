@@ -4,17 +4,36 @@ import logging
 import math
 import os
 import sys
+from array import array
 from datetime import datetime
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from universal.global_clock import clock
+from universal.global_clock import SimPhase, clock
 from universal.universal import TrainCommand
 
 logger = logging.getLogger(__name__)
 
 
+class _FleetColumn:
+    """Backend attribute stored as one row of a FleetPhysics column."""
+
+    def __init__(self, cast: Callable) -> None:
+        self.cast = cast
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return self.cast(getattr(obj._fleet, self.name)[obj._row])
+
+    def __set__(self, obj, value) -> None:
+        getattr(obj._fleet, self.name)[obj._row] = value
+
+
 class TrainModelBackend:
     """Backend for train physics simulation and state management.
     
@@ -47,12 +66,36 @@ class TrainModelBackend:
     PASSENGER_MASS_KG = 70.0  # Average weight
     CAPACITY = 272  # Maximum passenger capacity
     
-    def __init__(self, line_name: Optional[str] = None) -> None:
+    # Physics state lives in the shared FleetPhysics columns; these
+    # attributes are views onto this train's row.
+    mass_kg = _FleetColumn(float)
+    num_cars = _FleetColumn(int)
+    passenger_count = _FleetColumn(int)
+    velocity = _FleetColumn(float)
+    acceleration = _FleetColumn(float)
+    position = _FleetColumn(float)
+    power_kw = _FleetColumn(float)
+    grade_percent = _FleetColumn(float)
+    authority_m = _FleetColumn(float)
+    service_brake = _FleetColumn(bool)
+    emergency_brake = _FleetColumn(bool)
+    engine_failure = _FleetColumn(bool)
+    brake_failure = _FleetColumn(bool)
+    signal_pickup_failure = _FleetColumn(bool)
+    block_occupied = _FleetColumn(bool)
+    
+    def __init__(self, line_name: Optional[str] = None,
+                 fleet: Optional["FleetPhysics"] = None) -> None:
         """Initialize train model backend.
         
         Args:
             line_name: Name of the line this train operates on. Defaults to "-".
+            fleet: Fleet engine holding this train's physics row. Defaults
+                to the shared clock-driven fleet.
         """
+        self._fleet = fleet if fleet is not None else fleet_physics
+        self._row = self._fleet.add(self)
+        
         self.line_name = line_name or "-"
         self.train_id: str = "T1"
         
@@ -110,33 +153,44 @@ class TrainModelBackend:
         # Integrator time bases
         self._last_clock_time: Optional[datetime] = None
         
-        # Register with global clock
-        clock.register_listener(self._on_clock_tick)
+        # The fleet engine steps this train from its PHYSICS phase callback
         self._clock_driven: bool = True
         self.time: datetime = datetime(2000, 1, 1, 0, 0, 0)
     
     def _on_clock_tick(self, now: datetime) -> None:
         """Clock listener callback for time synchronization.
         
+        Derives dt from the previous call; kept for callers that drive the
+        backend with bare timestamps instead of the fixed-step scheduler.
+        
         Args:
             now: Current simulation time from global clock.
         """
-        self.time = now
-        
         if self._last_clock_time is None:
+            self.time = now
             self._last_clock_time = now
             return
         
         dt_s = (now - self._last_clock_time).total_seconds()
-        self._last_clock_time = now
+        self._on_physics_step(now, dt_s)
+    
+    def _on_physics_step(self, now: datetime, dt_s: float) -> None:
+        """Integrate this train alone over dt_s seconds.
         
-        # Substep big dt in chunks of DT_MAX to keep physics stable
-        remaining = max(0.0, float(dt_s))
-        while remaining > 1e-6:
-            step = min(self.DT_MAX, remaining)
-            self._step_dt(step)
-            remaining -= step
+        The shared fleet engine steps every train at once from the clock;
+        this entry point serves callers driving a single backend.
         
+        Args:
+            now: Current simulation time from global clock.
+            dt_s: Simulated time since the previous step in seconds.
+        """
+        self._fleet.integrate((self._row,), dt_s)
+        self._after_step(now)
+    
+    def _after_step(self, now: datetime) -> None:
+        """Record the step time and notify observers."""
+        self.time = now
+        self._last_clock_time = now
         self._notify_listeners()
     
     def add_listener(self, callback: Callable[[], None]) -> None:
@@ -227,104 +281,39 @@ class TrainModelBackend:
         """
         if dt <= 0.0:
             return
+        self._fleet.step_rows((self._row,), dt)
+    
+    def _update_cabin_temperature(self, dt: float) -> None:
+        """Move cabin temperature toward the setpoint over dt seconds.
         
-        # Compute mass
-        passenger_mass = self.passenger_count * self.PASSENGER_MASS_KG
-        mass = max(1.0, (self.mass_kg * self.num_cars) + passenger_mass)
-        v_old = self.velocity
-        
-        if (self.engine_failure or self.signal_pickup_failure or
-            self.brake_failure):
-            self.emergency_brake = True
-            logger.warning("FAILURE DETECTED - Emergency brake activated!")
-        
-        # Tractive force from power
-        if self.engine_failure:
-            power_w = 0.0
-        else:
-            power_w = max(0.0, self.power_kw) * 1000.0
-        
-        v_eff = max(self.V_EPS, abs(v_old))
-        f_tractive = power_w / v_eff  # N
-        
-        # Traction-limit accel
-        f_tractive = min(f_tractive, mass * self.MAX_ACCEL)
-        
-        # If brakes applied, engine power shouldn't accelerate the train
-        if self.service_brake or self.emergency_brake:
-            f_tractive = 0.0
-        
-        # Resistive forces
-        f_grade = mass * self.GRAVITY * (self.grade_percent / 100.0)
-        f_drag = (0.5 * self.AIR_DENSITY * self.FRONTAL_AREA *
-                  self.DRAG_COEFF * v_old * abs(v_old))
-        f_roll = self.ROLLING_C * mass * self.GRAVITY
-        
-        resist = f_drag + f_roll + f_grade
-        
-        # Net force / base acceleration
-        a_base = (f_tractive - resist) / mass  # m/s^2
+        Args:
+            dt: Time step in seconds.
+        """
+        temp_diff = self.temperature_setpoint - self.actual_temperature
         
-        # Braking caps
-        if self.emergency_brake:
-            a_target = min(self.MAX_EBRAKE, a_base)
-        elif self.service_brake:
-            a_target = min(self.MAX_DECEL, a_base)
-        else:
-            a_target = max(-10.0, min(self.MAX_ACCEL, a_base))
-        
-        if (not self.emergency_brake and not self.service_brake and
-            self.authority_m > 0.0):
-            service_a = abs(self.MAX_DECEL)
-            if service_a > 0.0:
-                stopping_dist = (v_old ** 2) / (2.0 * service_a)
-                if self.authority_m <= stopping_dist and v_old > 0.1:
-                    a_target = min(a_target, self.MAX_DECEL)
-        
-        # Integrate (semi-implicit / Euler)
-        v_new = v_old + a_target * dt
-        if v_new < 0.0:
-            v_new = 0.0
-            a_target = 0.0
-        
-        # Position integrates velocity
-        self.position += 0.5 * (v_old + v_new) * dt
-        
-        # Authority decreases as distance is consumed
-        self.authority_m = max(0.0, self.authority_m - 0.5 * (v_old + v_new) * dt)
-        
-        # Commit
-        self.velocity = v_new
-        self.acceleration = a_target
-        self.block_occupied = self.velocity > 0.01
-        
-        # Cabin temperature update
-        if dt > 0.0:
-            temp_diff = self.temperature_setpoint - self.actual_temperature
+        if abs(temp_diff) > 0.1:
+            base_rate = 0.05 / 60.0  # 0.05°C per minute
+            hvac_rate = 0.5 / 60.0  # 0.5°C per minute
             
-            if abs(temp_diff) > 0.1:
-                base_rate = 0.05 / 60.0  # 0.05°C per minute
-                hvac_rate = 0.5 / 60.0  # 0.5°C per minute
-                
-                if temp_diff > 0:  # Need to heat
-                    rate = hvac_rate if self.heating else base_rate
-                    d_t = min(rate * dt, temp_diff)
-                else:  # Need to cool
-                    rate = hvac_rate if self.air_conditioning else base_rate
-                    d_t = max(-rate * dt, temp_diff)
-                
-                self.actual_temperature += d_t
-                
-                # Debug log
-                if abs(temp_diff) > 0.2:
-                    logger.debug(
-                        "Temp control: setpoint=%.1f°C, actual=%.1f°C, "
-                        "heating=%s, AC=%s",
-                        self.temperature_setpoint,
-                        self.actual_temperature,
-                        self.heating,
-                        self.air_conditioning
-                    )
+            if temp_diff > 0:  # Need to heat
+                rate = hvac_rate if self.heating else base_rate
+                d_t = min(rate * dt, temp_diff)
+            else:  # Need to cool
+                rate = hvac_rate if self.air_conditioning else base_rate
+                d_t = max(-rate * dt, temp_diff)
+            
+            self.actual_temperature += d_t
+            
+            # Debug log
+            if abs(temp_diff) > 0.2:
+                logger.debug(
+                    "Temp control: setpoint=%.1f°C, actual=%.1f°C, "
+                    "heating=%s, AC=%s",
+                    self.temperature_setpoint,
+                    self.actual_temperature,
+                    self.heating,
+                    self.air_conditioning
+                )
     
     def board_passengers(self, n: int) -> int:
         """Increase passengers up to capacity.
@@ -469,6 +458,219 @@ class TrainModelBackend:
         self._notify_listeners()
 
 
+class FleetPhysics:
+    """Struct-of-arrays physics engine stepping every train at once.
+    
+    Each TrainModelBackend owns one row; its dynamics attributes are views
+    onto the columns below. A single PHYSICS phase callback integrates the
+    whole fleet per clock step instead of one callback per train.
+    
+    Attributes:
+        backends: Backend owning each row.
+    """
+    
+    _FLOAT_COLUMNS = (
+        "mass_kg", "num_cars", "passenger_count", "velocity", "acceleration",
+        "position", "power_kw", "grade_percent", "authority_m",
+    )
+    _FLAG_COLUMNS = (
+        "service_brake", "emergency_brake", "engine_failure", "brake_failure",
+        "signal_pickup_failure", "block_occupied",
+    )
+    
+    def __init__(self) -> None:
+        """Initialize an empty fleet."""
+        for name in self._FLOAT_COLUMNS:
+            setattr(self, name, array("d"))
+        for name in self._FLAG_COLUMNS:
+            setattr(self, name, array("b"))
+        self.backends: List[TrainModelBackend] = []
+    
+    def __len__(self) -> int:
+        return len(self.backends)
+    
+    def add(self, backend: TrainModelBackend) -> int:
+        """Allocate a zeroed row for a backend.
+        
+        Args:
+            backend: Backend that will own the row.
+            
+        Returns:
+            Row index of the backend.
+        """
+        for name in self._FLOAT_COLUMNS:
+            getattr(self, name).append(0.0)
+        for name in self._FLAG_COLUMNS:
+            getattr(self, name).append(0)
+        self.backends.append(backend)
+        return len(self.backends) - 1
+    
+    def remove(self, backend: TrainModelBackend) -> None:
+        """Free a backend's row.
+        
+        The last row is moved into the freed slot, so the moved backend's
+        row index changes.
+        
+        Args:
+            backend: Backend whose row to free.
+        """
+        row = backend._row
+        last = len(self.backends) - 1
+        if row > last or self.backends[row] is not backend:
+            raise ValueError("backend does not own a row in this fleet")
+        for name in self._FLOAT_COLUMNS + self._FLAG_COLUMNS:
+            column = getattr(self, name)
+            column[row] = column[last]
+            column.pop()
+        moved = self.backends.pop()
+        if moved is not backend:
+            self.backends[row] = moved
+            moved._row = row
+    
+    def _on_physics_step(self, now: datetime, dt_s: float) -> None:
+        """Scheduler PHYSICS phase: integrate the whole fleet over dt_s.
+        
+        Args:
+            now: Current simulation time from global clock.
+            dt_s: Simulated time since the previous step in seconds.
+        """
+        if not self.backends:
+            return
+        self.integrate(range(len(self.backends)), dt_s)
+        for backend in self.backends:
+            backend._after_step(now)
+    
+    def integrate(self, rows: Sequence[int], dt_s: float) -> None:
+        """Integrate rows over dt_s in chunks of at most DT_MAX.
+        
+        Args:
+            rows: Row indices to step.
+            dt_s: Simulated time in seconds.
+        """
+        dt_max = TrainModelBackend.DT_MAX
+        steps = []
+        remaining = max(0.0, float(dt_s))
+        while remaining > 1e-6:
+            step = min(dt_max, remaining)
+            steps.append(step)
+            remaining -= step
+        if steps:
+            self._advance(rows, steps)
+    
+    def step_rows(self, rows: Sequence[int], dt: float) -> None:
+        """Advance the given rows by one physics step of dt seconds.
+        
+        Args:
+            rows: Row indices to step.
+            dt: Time step in seconds.
+        """
+        if dt > 0.0:
+            self._advance(rows, (dt,))
+    
+    def _advance(self, rows: Sequence[int], steps: Sequence[float]) -> None:
+        """Run the given physics steps on each row.
+        
+        Same force model and braking caps as a single train: tractive force
+        from power (traction-limited, cut while braking), grade, drag and
+        rolling resistance, then service/emergency caps and the authority
+        stopping-distance check. Rows are independent, so each row runs all
+        of its steps with its state held in locals.
+        
+        Args:
+            rows: Row indices to step.
+            steps: Consecutive time steps in seconds.
+        """
+        tm = TrainModelBackend
+        gravity = tm.GRAVITY
+        drag_k = 0.5 * tm.AIR_DENSITY * tm.FRONTAL_AREA * tm.DRAG_COEFF
+        rolling_c = tm.ROLLING_C
+        v_eps = tm.V_EPS
+        max_accel = tm.MAX_ACCEL
+        max_decel = tm.MAX_DECEL
+        max_ebrake = tm.MAX_EBRAKE
+        service_a = abs(max_decel)
+        pax_mass = tm.PASSENGER_MASS_KG
+        
+        mass_kg, num_cars, pax = self.mass_kg, self.num_cars, self.passenger_count
+        vel, acc, pos = self.velocity, self.acceleration, self.position
+        power, grade, auth = self.power_kw, self.grade_percent, self.authority_m
+        sbrake, ebrake = self.service_brake, self.emergency_brake
+        engine_f, brake_f, signal_f = (
+            self.engine_failure, self.brake_failure, self.signal_pickup_failure
+        )
+        occupied = self.block_occupied
+        backends = self.backends
+        
+        for r in rows:
+            # Inputs are constant for the whole call
+            mass = max(1.0, (mass_kg[r] * num_cars[r]) + pax[r] * pax_mass)
+            engine_failed = engine_f[r]
+            failed = engine_failed or signal_f[r] or brake_f[r]
+            power_w = 0.0 if engine_failed else max(0.0, power[r]) * 1000.0
+            traction_cap = mass * max_accel
+            f_grade = mass * gravity * (grade[r] / 100.0)
+            f_roll = rolling_c * mass * gravity
+            sb = sbrake[r]
+            eb = ebrake[r]
+            v = vel[r]
+            p = pos[r]
+            a_m = auth[r]
+            a_target = acc[r]
+            backend = backends[r]
+            
+            for dt in steps:
+                v_old = v
+                if failed:
+                    eb = 1
+                    logger.warning("FAILURE DETECTED - Emergency brake activated!")
+                
+                # If brakes applied, engine power shouldn't accelerate the train
+                if sb or eb:
+                    f_tractive = 0.0
+                else:
+                    f_tractive = min(power_w / max(v_eps, abs(v_old)), traction_cap)
+                
+                f_drag = drag_k * v_old * abs(v_old)
+                a_base = (f_tractive - (f_drag + f_roll + f_grade)) / mass
+                
+                # Braking caps
+                if eb:
+                    a_target = min(max_ebrake, a_base)
+                elif sb:
+                    a_target = min(max_decel, a_base)
+                else:
+                    a_target = max(-10.0, min(max_accel, a_base))
+                    if a_m > 0.0 and v_old > 0.1:
+                        if a_m <= (v_old ** 2) / (2.0 * service_a):
+                            a_target = min(a_target, max_decel)
+                
+                # Integrate (semi-implicit / Euler)
+                v = v_old + a_target * dt
+                if v < 0.0:
+                    v = 0.0
+                    a_target = 0.0
+                
+                travelled = 0.5 * (v_old + v) * dt
+                p += travelled
+                a_m = max(0.0, a_m - travelled)
+                
+                # Cabin temperature only needs work away from the setpoint
+                if abs(backend.temperature_setpoint - backend.actual_temperature) > 0.1:
+                    backend._update_cabin_temperature(dt)
+            
+            vel[r] = v
+            acc[r] = a_target
+            pos[r] = p
+            auth[r] = a_m
+            ebrake[r] = eb
+            occupied[r] = v > 0.01
+
+
+# Shared engine for every clock-driven train
+fleet_physics = FleetPhysics()
+clock.register_phase(SimPhase.PHYSICS, fleet_physics._on_physics_step)
+
+
 class Train:
     """Train wrapper that binds TrainModelBackend to Track Network.
     
@@ -501,14 +703,30 @@ class Train:
         
         self._prev_left_doors = False
         self._prev_right_doors = False
+        self._speed_limit_mps: float = float(self.tm.MAX_SPEED)
         
-        clock.register_listener(self._auto_tick)
+        clock.register_phase(SimPhase.SENSE, self._sense_track)
+        clock.register_phase(SimPhase.PHYSICS, self._move_step)
         self._last_tick_time: Optional[datetime] = None
     
+    def detach(self) -> None:
+        """Stop simulating this train.
+        
+        Unregisters it from the clock and frees its fleet physics row.
+        The train must not be stepped afterwards.
+        """
+        clock.unregister_phase(self._sense_track)
+        clock.unregister_phase(self._move_step)
+        fleet = self.tm._fleet
+        if self.tm in fleet.backends:
+            fleet.remove(self.tm)
+    
     def _auto_tick(self, current_time: datetime) -> None:
         """Automatic tick called by global clock.
         
         Pulls commands from Track Model and runs physics simulation.
+        Derives dt from the previous call; the fixed-step scheduler calls
+        _sense_track and _move_step directly instead.
         
         Args:
             current_time: Current simulation time from global clock.
@@ -518,11 +736,20 @@ class Train:
             return
         
         dt_s = (current_time - self._last_tick_time).total_seconds()
-        self._last_tick_time = current_time
         
         if dt_s <= 0.0:
             return
         
+        self._sense_track(current_time, dt_s)
+        self._move_step(current_time, dt_s)
+    
+    def _sense_track(self, current_time: datetime, dt_s: float) -> None:
+        """Scheduler SENSE phase: pull commands and track inputs.
+        
+        Args:
+            current_time: Current simulation time from global clock.
+            dt_s: Simulated time since the previous step in seconds.
+        """
         # Pull track inputs (grade, beacon, speed limit)
         trk = self._pull_track_inputs()
         
@@ -545,9 +772,22 @@ class Train:
             grade_percent=float(trk["grade_percent"]),
             beacon_info=trk["beacon_info"],
         )
+        self._speed_limit_mps = trk["speed_limit_mps"]
+    
+    def _move_step(self, current_time: datetime, dt_s: float) -> None:
+        """Scheduler PHYSICS phase: advance along the track by v * dt.
+        
+        Runs after the backend's own PHYSICS step, so it moves the train
+        with the freshly integrated velocity.
+        
+        Args:
+            current_time: Current simulation time from global clock.
+            dt_s: Simulated time since the previous step in seconds.
+        """
+        self._last_tick_time = current_time
         
         try:
-            limit = float(trk["speed_limit_mps"])
+            limit = float(self._speed_limit_mps)
             if self.tm.velocity > limit:
                 self.tm.velocity = limit
         except Exception:
@@ -760,6 +1000,10 @@ class Train:
             
             self.current_segment = next_seg
             self.segment_displacement_m = new_disp
+            # keep the network's block -> train index in step
+            update_index = getattr(self.network, "update_train_location", None)
+            if update_index is not None:
+                update_index(self)
             self._sync_backend_track_segment()
             logger.debug(
                 "Train %s moved forward to block %s",
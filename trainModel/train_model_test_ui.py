@@ -23,6 +23,8 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from universal.refresh_bus import refresh_bus
+
 if TYPE_CHECKING:
     from train_model_backend import TrainModelBackend
 
@@ -51,7 +53,8 @@ class TrainModelTestUI(QWidget):
         """
         super().__init__()
         self.backend = backend
-        self.backend.add_listener(self._sync_from_backend)
+        refresh_bus.start()
+        self.backend.add_listener(refresh_bus.listener(self._sync_from_backend))
         
         self._toggle_meta = {}
         self._is_syncing = False
@@ -28,6 +28,7 @@ from PyQt6.QtWidgets import (
 )
 
 from universal.global_clock import clock as global_clock
+from universal.refresh_bus import refresh_bus
 
 if TYPE_CHECKING:
     from train_model_backend import TrainModelBackend
@@ -110,7 +111,9 @@ class TrainModelUI(QWidget):
         """
         super().__init__()
         self.backend = backend
-        self.backend.add_listener(self.refresh_display)
+        # The backend notifies from the physics step; repaint once per frame.
+        refresh_bus.start()
+        self.backend.add_listener(refresh_bus.listener(self.refresh_display))
         
         self.setWindowTitle("Train Model")
         self.resize(1180, 680)
@@ -123,7 +126,9 @@ class TrainModelUI(QWidget):
         left_col = QVBoxLayout()
         
         self._ui_refresh_timer = QTimer(self)
-        self._ui_refresh_timer.timeout.connect(self.refresh_display)
+        self._ui_refresh_timer.timeout.connect(
+            refresh_bus.listener(self.refresh_display)
+        )
         self._ui_refresh_timer.start(200)
         
         # Banner (advertisement)
@@ -234,7 +239,8 @@ class TrainModelUI(QWidget):
         right_col.addWidget(self.clock_lbl)
         
         # Subscribe to global clock updates
-        global_clock.register_listener(self._update_clock_display)
+        # the clock may tick on the sim worker thread; repaint on the UI thread
+        global_clock.register_listener(refresh_bus.listener(self._refresh_clock_display))
         # Initialize immediately with current clock time
         try:
             current_time = global_clock.get_time()
@@ -322,6 +328,10 @@ class TrainModelUI(QWidget):
         )
         self._set_ad_pixmap()
     
+    def _refresh_clock_display(self) -> None:
+        """Show the clock's current time (refresh bus callback)."""
+        self._update_clock_display(global_clock.get_time())
+
     def _update_clock_display(self, current_time: datetime) -> None:
         """Update clock display with global clock time.
         
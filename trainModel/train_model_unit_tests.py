@@ -186,3 +186,62 @@ def test_headlights_toggle(backend):
     backend.set_inputs(headlights=False)
     assert backend.headlights is False
     assert backend.report_state()["headlights"] is False
+
+
+def test_physics_step_uses_explicit_dt(backend):
+    from datetime import datetime
+
+    backend.velocity = 0.0
+    backend.power_kw = 200.0
+    backend._on_physics_step(datetime(2000, 1, 1, 6, 0, 1), 1.0)
+
+    reference = TrainModelBackend(line_name="Green Line")
+    reference.power_kw = 200.0
+    step_for_time(reference, total_time_s=1.0, dt=reference.DT_MAX)
+
+    assert backend.velocity == pytest.approx(reference.velocity)
+    assert backend.position == pytest.approx(reference.position)
+
+
+def test_clock_runs_phases_in_order_with_rate_divisor():
+    from universal.global_clock import GlobalClock, SimPhase
+
+    sim_clock = GlobalClock()
+    sim_clock.set_substeps(4)
+    calls = []
+    sim_clock.register_phase(SimPhase.PUBLISH, lambda now, dt: calls.append(("publish", dt)))
+    sim_clock.register_phase(SimPhase.PHYSICS, lambda now, dt: calls.append(("physics", dt)))
+    sim_clock.register_phase(SimPhase.SENSE, lambda now, dt: calls.append(("sense", dt)), rate_divisor=4)
+
+    start = sim_clock.get_time()
+    sim_clock.tick()
+
+    assert (sim_clock.get_time() - start).total_seconds() == 1.0
+    assert calls.count(("physics", 0.25)) == 4
+    assert calls.count(("publish", 0.25)) == 4
+    assert calls.count(("sense", 1.0)) == 1
+    # the rate-divided SENSE callback runs on the 4th step, before that step's PHYSICS
+    assert calls[-3:] == [("sense", 1.0), ("physics", 0.25), ("publish", 0.25)]
+
+
+def test_fleet_step_matches_single_train_step():
+    from trainModel.train_model_backend import FleetPhysics
+
+    fleet = FleetPhysics()
+    fleet_trains = [TrainModelBackend(fleet=fleet) for _ in range(3)]
+    solo_trains = [TrainModelBackend() for _ in range(3)]
+    for i, (a, b) in enumerate(zip(fleet_trains, solo_trains)):
+        for tm in (a, b):
+            tm.power_kw = 100.0 * (i + 1)
+            tm.grade_percent = i - 1.0
+            tm.authority_m = 200.0
+        b.service_brake = a.service_brake = (i == 2)
+
+    fleet.integrate(range(len(fleet)), 3.0)
+    for tm in solo_trains:
+        step_for_time(tm, total_time_s=3.0, dt=tm.DT_MAX)
+
+    for a, b in zip(fleet_trains, solo_trains):
+        assert a.velocity == pytest.approx(b.velocity)
+        assert a.position == pytest.approx(b.position)
+        assert a.authority_m == pytest.approx(b.authority_m)
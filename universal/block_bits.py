@@ -0,0 +1,219 @@
+# universal/block_bits.py
+from typing import Iterator, Mapping, MutableMapping, Optional
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of the set bits in `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BlockBits(MutableMapping):
+    """Block ID -> bool map packed into two ints.
+
+    `known` has a bit per block that has a value and `bits` a bit per block
+    whose value is True, so it behaves like the Dict[int, bool] it replaces
+    (missing keys, len() counts known blocks) while "which blocks differ"
+    between two of them is one XOR. Block IDs must be non-negative ints.
+    """
+
+    __slots__ = ('known', 'bits')
+
+    def __init__(self, values: Optional[Mapping[int, bool]] = None):
+        self.known = 0
+        self.bits = 0
+        if values is not None:
+            self.update(values)
+
+    def __getitem__(self, block_id: int) -> bool:
+        mask = 1 << block_id
+        if not self.known & mask:
+            raise KeyError(block_id)
+        return bool(self.bits & mask)
+
+    def get(self, block_id, default=None):
+        mask = 1 << block_id
+        if not self.known & mask:
+            return default
+        return bool(self.bits & mask)
+
+    def __setitem__(self, block_id: int, value: bool) -> None:
+        mask = 1 << block_id
+        self.known |= mask
+        if value:
+            self.bits |= mask
+        else:
+            self.bits &= ~mask
+
+    def __delitem__(self, block_id: int) -> None:
+        mask = 1 << block_id
+        if not self.known & mask:
+            raise KeyError(block_id)
+        self.known &= ~mask
+        self.bits &= ~mask
+
+    def __contains__(self, block_id) -> bool:
+        return (isinstance(block_id, int) and block_id >= 0
+                and bool(self.known >> block_id & 1))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter_bits(self.known)
+
+    def __len__(self) -> int:
+        return self.known.bit_count()
+
+    def __repr__(self) -> str:
+        return f"BlockBits({dict(self.items())!r})"
+
+    def clear(self) -> None:
+        self.known = 0
+        self.bits = 0
+
+    def copy(self) -> 'BlockBits':
+        other = BlockBits()
+        other.assign(self)
+        return other
+
+    def assign(self, other: 'BlockBits') -> None:
+        """Make this a copy of `other` (O(1), no per-block work)."""
+        self.known = other.known
+        self.bits = other.bits
+
+    def store(self, mask: int, bits: int) -> None:
+        """Set every block in `mask` to its bit in `bits`."""
+        self.known |= mask
+        self.bits = (self.bits & ~mask) | (bits & mask)
+
+    def changed(self, other: 'BlockBits') -> int:
+        """Mask of blocks whose value differs from `other`.
+
+        A block known on only one side counts as changed.
+        """
+        return (self.bits ^ other.bits) | (self.known ^ other.known)
+
+    def true_blocks(self) -> Iterator[int]:
+        """Blocks whose value is True, lowest first."""
+        return iter_bits(self.bits)
+
+
+class BlockBitsView(Mapping):
+    """Read-only view of a BlockBits owned by someone else."""
+
+    __slots__ = ('_source',)
+
+    def __init__(self, source: BlockBits):
+        self._source = source
+
+    @property
+    def bits(self) -> int:
+        return self._source.bits
+
+    @property
+    def known(self) -> int:
+        return self._source.known
+
+    def __getitem__(self, block_id: int) -> bool:
+        return self._source[block_id]
+
+    def get(self, block_id, default=None):
+        return self._source.get(block_id, default)
+
+    def __contains__(self, block_id) -> bool:
+        return block_id in self._source
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._source)
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def __repr__(self) -> str:
+        return f"BlockBitsView({dict(self.items())!r})"
+
+    def changed(self, other: BlockBits) -> int:
+        return self._source.changed(other)
+
+    def true_blocks(self) -> Iterator[int]:
+        return self._source.true_blocks()
+
+
+class BlockBitsOverlay(Mapping):
+    """Live view of a BlockBits owned by someone else, plus local overrides.
+
+    Reads see `base` (limited to the blocks in `mask`) except for blocks
+    written here, which keep the written value until release() drops it.
+    Writing the value `base` already has drops the override instead, so
+    code that copies the source's values in never pins them. `known` and
+    `bits` are ints like BlockBits', so changed() against a BlockBits
+    snapshot is still one XOR.
+    """
+
+    __slots__ = ('_base', '_overrides', 'mask')
+
+    def __init__(self, base, mask: int = -1):
+        self._base = base
+        self._overrides = BlockBits()
+        self.mask = mask
+
+    @property
+    def known(self) -> int:
+        return (self._base.known & self.mask) | self._overrides.known
+
+    @property
+    def bits(self) -> int:
+        overrides = self._overrides
+        return ((self._base.bits & self.mask & ~overrides.known)
+                | overrides.bits)
+
+    @property
+    def overridden(self) -> int:
+        """Mask of blocks whose value was written here."""
+        return self._overrides.known
+
+    def __getitem__(self, block_id: int) -> bool:
+        value = self.get(block_id)
+        if value is None:
+            raise KeyError(block_id)
+        return value
+
+    def get(self, block_id, default=None):
+        value = self._overrides.get(block_id)
+        if value is not None:
+            return value
+        if not self.mask >> block_id & 1:
+            return default
+        return self._base.get(block_id, default)
+
+    def __setitem__(self, block_id: int, value: bool) -> None:
+        if (self.mask >> block_id & 1
+                and self._base.get(block_id) == bool(value)):
+            self._overrides.pop(block_id, None)
+        else:
+            self._overrides[block_id] = value
+
+    def release(self, mask: int) -> None:
+        """Drop the overrides of the blocks in `mask`."""
+        overrides = self._overrides
+        overrides.known &= ~mask
+        overrides.bits &= ~mask
+
+    def __contains__(self, block_id) -> bool:
+        return (isinstance(block_id, int) and block_id >= 0
+                and bool(self.known >> block_id & 1))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter_bits(self.known)
+
+    def __len__(self) -> int:
+        return self.known.bit_count()
+
+    def __repr__(self) -> str:
+        return f"BlockBitsOverlay({dict(self.items())!r})"
+
+    def changed(self, other: BlockBits) -> int:
+        return (self.bits ^ other.bits) | (self.known ^ other.known)
+
+    def true_blocks(self) -> Iterator[int]:
+        return iter_bits(self.bits)
@@ -0,0 +1,197 @@
+# universal/controller_registry.py
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class PollerPool:
+    """One scheduler thread that runs every wayside controller's polling.
+
+    Controllers used to start a daemon thread each for start_live_link()
+    (plus a guard-block thread on the HW side), so a two-line sim ran 8+
+    threads contending for the GIL over the same segments. Each of those
+    loops is now a task here: `callback()` runs every `interval` seconds,
+    one task at a time, on a single thread.
+
+    If `lock` is set (e.g. the TimeWarpEngine lock), it is held while a
+    task runs, so polls never interleave with a simulation step.
+
+    `stats()` reports how often each task ran and what it cost.
+    """
+
+    def __init__(self, name: str = "WaysidePoller"):
+        self.name = name
+        self.lock: Optional[Any] = None
+        self._cond = threading.Condition()
+        self._tasks: Dict[Callable[[], None], "_PollTask"] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, callback: Callable[[], None], interval: float,
+            name: Optional[str] = None):
+        """Run `callback()` every `interval` seconds, the first time one
+        interval from now.
+
+        Adding a callback that is already polled only updates its interval.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        with self._cond:
+            task = self._tasks.get(callback)
+            if task is None:
+                task = _PollTask(callback, float(interval),
+                                 name or getattr(callback, "__qualname__", "poll"))
+                self._tasks[callback] = task
+            else:
+                task.interval = float(interval)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name,
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def remove(self, callback: Callable[[], None]):
+        """Stop polling `callback`. Unknown callbacks are ignored."""
+        with self._cond:
+            self._tasks.pop(callback, None)
+            self._cond.notify()
+
+    def is_polling(self, callback: Callable[[], None]) -> bool:
+        with self._cond:
+            return callback in self._tasks
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-task calls, errors and poll cost (ms), keyed by task name."""
+        with self._cond:
+            tasks = list(self._tasks.values())
+        result: Dict[str, dict] = {}
+        for task in tasks:
+            name = task.name
+            n = 2
+            while name in result:       # e.g. two controllers on one line
+                name = f"{task.name} ({n})"
+                n += 1
+            result[name] = {
+                "interval_s": task.interval,
+                "calls": task.calls,
+                "errors": task.errors,
+                "mean_ms": task.total_s * 1000 / task.calls if task.calls else 0.0,
+                "max_ms": task.max_s * 1000,
+                "last_ms": task.last_s * 1000,
+            }
+        return result
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._tasks:
+                    self._cond.wait()
+                task = min(self._tasks.values(), key=lambda t: t.due)
+                delay = task.due - time.perf_counter()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                # next run one interval after this one; skip missed runs
+                task.due = max(task.due + task.interval,
+                               time.perf_counter())
+            self._poll(task)
+
+    def _poll(self, task: "_PollTask"):
+        start = time.perf_counter()
+        try:
+            if self.lock is not None:
+                with self.lock:
+                    task.callback()
+            else:
+                task.callback()
+        except Exception as e:
+            task.errors += 1
+            print(f"[PollerPool] {task.name} poll error: {e}")
+        elapsed = time.perf_counter() - start
+        task.calls += 1
+        task.total_s += elapsed
+        task.last_s = elapsed
+        task.max_s = max(task.max_s, elapsed)
+
+
+class _PollTask:
+    __slots__ = ("callback", "interval", "name", "due", "calls", "errors",
+                 "total_s", "max_s", "last_s")
+
+    def __init__(self, callback: Callable[[], None], interval: float, name: str):
+        self.callback = callback
+        self.interval = interval
+        self.name = name
+        # first run one interval out, so the caller finishes setting up
+        # (or stops the link) before the pool thread touches it
+        self.due = time.perf_counter() + interval
+        self.calls = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.last_s = 0.0
+
+
+class ControllerRegistry:
+    """One wayside controller per (network, line, kind).
+
+    main.py, the CTC TrackState and the wayside UIs all ask the registry
+    for a line's controllers instead of constructing their own, so each
+    line has exactly one SW and one HW controller and each is started
+    once. `kind` is "SW" or "HW"; `factory(network, line_name)` builds the
+    controller the first time (both backend classes take those
+    arguments).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (id(network), line, kind) -> (network, controller); the network
+        # is kept so its id can't be reused while the entry exists
+        self._controllers: Dict[Tuple[int, str, str], Tuple[Any, Any]] = {}
+
+    def get_or_create(self, network: Any, line_name: str, kind: str,
+                      factory: Callable[[Any, str], Any]) -> Any:
+        """The line's `kind` controller on `network`, built if missing."""
+        key = (id(network), line_name, kind)
+        with self._lock:
+            entry = self._controllers.get(key)
+            if entry is not None:
+                return entry[1]
+        controller = factory(network, line_name)
+        with self._lock:
+            # another thread may have built one meanwhile; first one wins
+            entry = self._controllers.setdefault(key, (network, controller))
+        return entry[1]
+
+    def get(self, network: Any, line_name: str, kind: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._controllers.get((id(network), line_name, kind))
+        return entry[1] if entry is not None else None
+
+    def controllers(self) -> List[Tuple[str, str, Any]]:
+        """(line_name, kind, controller) for every registered controller."""
+        with self._lock:
+            return [(line, kind, ctrl)
+                    for (_, line, kind), (_, ctrl) in self._controllers.items()]
+
+    def start(self, controller: Any, poll_interval: float = 1.0):
+        """Start `controller`'s live link unless it is already polling."""
+        if not poller.is_polling(controller._poll_track_model):
+            controller.start_live_link(poll_interval)
+
+    def release(self, network: Any) -> List[Any]:
+        """Stop and forget every controller on `network`."""
+        with self._lock:
+            keys = [k for k in self._controllers if k[0] == id(network)]
+            released = [self._controllers.pop(k)[1] for k in keys]
+        for controller in released:
+            controller.stop_live_link()
+        return released
+
+    def stats(self) -> Dict[str, dict]:
+        """Poll cost per controller task (see PollerPool.stats)."""
+        return poller.stats()
+
+
+# Shared singletons
+poller = PollerPool()
+controller_registry = ControllerRegistry()
@@ -1,6 +1,24 @@
 # universal/global_clock.py
 import datetime, time
-from typing import Callable, List
+from enum import IntEnum
+from typing import Callable, Dict, List, Tuple
+
+
+class SimPhase(IntEnum):
+    """Phases of one fixed simulation step, run in this order.
+
+    SENSE:    modules read inputs from the track (commands, grade, beacons).
+    CONTROL:  controllers compute outputs (e.g. train controller power).
+    ACTUATE:  outputs are applied to the plant.
+    PHYSICS:  the plant integrates forward by dt (trains, track environment).
+    PUBLISH:  state is pushed to observers.
+    """
+    SENSE = 0
+    CONTROL = 1
+    ACTUATE = 2
+    PHYSICS = 3
+    PUBLISH = 4
+
 
 class GlobalClock:
     """CTC-owned global simulation clock.
@@ -28,17 +46,28 @@ class GlobalClock:
         self.running = False
         self._listeners: List[Callable[[datetime.datetime], None]] = []
 
+        # Fixed-step scheduler: each tick is split into `substeps` steps and
+        # every step runs the phase callbacks in SimPhase order.
+        self.substeps = 1
+        self._step_count = 0
+        self._phases: Dict[SimPhase, List[Tuple[Callable[[datetime.datetime, float], None], int]]] = {
+            phase: [] for phase in SimPhase
+        }
+
     # ---- core time control ----
     def tick(self):
-        """Advance simulated time by (1 s × multiplier) and notify listeners."""
-        #delta = datetime.timedelta(seconds=self.tick_interval * self.time_multiplier)
-        #delta = datetime.timedelta(seconds=self.tick_interval)
-        delta = datetime.timedelta(seconds=1)
-
-        #delta = datetime.timedelta(seconds=self.tick_interval)
+        """Advance simulated time by one tick and notify listeners.
 
+        The tick (tick_interval seconds) is split into `substeps` fixed steps.
+        Each step runs every phase callback in SimPhase order with an explicit
+        dt; plain listeners are notified once at the end of the tick.
+        """
+        start = self.current_time
+        total = datetime.timedelta(seconds=self.tick_interval)
+        for i in range(1, self.substeps + 1):
+            self.current_time = start + total * i / self.substeps
+            self._run_phases()
 
-        self.current_time += delta
         for cb in self._listeners:
             try:
                 cb(self.current_time)
@@ -109,6 +138,56 @@ class GlobalClock:
         if callback not in self._listeners:
             self._listeners.append(callback)
 
+    # ---- fixed-step scheduler ----
+    @property
+    def step_seconds(self) -> float:
+        """Length of one fixed step in simulated seconds."""
+        return self.tick_interval / self.substeps
+
+    def set_substeps(self, substeps: int):
+        """Split every tick into `substeps` fixed steps (e.g. 4 → 0.25 s)."""
+        if substeps < 1:
+            raise ValueError("substeps must be >= 1")
+        self.substeps = int(substeps)
+
+    def register_phase(self, phase: SimPhase,
+                       callback: Callable[[datetime.datetime, float], None],
+                       rate_divisor: int = 1):
+        """Run `callback(current_time, dt)` in `phase` every `rate_divisor` steps.
+
+        Callbacks within a phase run in registration order. dt is always
+        rate_divisor × step_seconds, so a module with rate_divisor=4
+        receives 4 steps' worth of time per call. That includes the first
+        call, which lands on the next step number divisible by
+        rate_divisor and so may come sooner after registering.
+        """
+        if rate_divisor < 1:
+            raise ValueError("rate_divisor must be >= 1")
+        entries = self._phases[SimPhase(phase)]
+        if all(cb != callback for cb, _ in entries):
+            entries.append((callback, int(rate_divisor)))
+
+    def unregister_phase(self, callback: Callable[[datetime.datetime, float], None]):
+        """Remove `callback` from every phase it was registered in."""
+        for phase in SimPhase:
+            self._phases[phase] = [
+                (cb, divisor) for cb, divisor in self._phases[phase]
+                if cb != callback
+            ]
+
+    def _run_phases(self):
+        """Run one fixed step of the phase pipeline at current_time."""
+        self._step_count += 1
+        step_s = self.step_seconds
+        for phase in SimPhase:
+            for cb, divisor in list(self._phases[phase]):
+                if self._step_count % divisor:
+                    continue
+                try:
+                    cb(self.current_time, step_s * divisor)
+                except Exception as e:
+                    print(f"[GlobalClock] {phase.name.lower()} callback error: {e}")
+
     def __repr__(self):
         return self.get_time_string()
 
@@ -0,0 +1,374 @@
+# universal/plc_engine.py
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+# plc_logic(block_occupancies, switch_positions, light_signals,
+#           crossing_signals, previous_occupancies, stop)
+PLC_ARRAYS = ('block_occupancies', 'switch_positions', 'light_signals',
+              'crossing_signals', 'previous_occupancies', 'stop')
+
+Slot = Tuple[str, int]   # (array name, index)
+
+
+class _TracedList(list):
+    """List handed to plc_logic that reports which input slots it reads.
+
+    A slot only counts as an input read if the program hasn't written it
+    earlier in the same run. Anything that could resize the list, or read
+    it through a C-level method we can't see into, marks the run opaque.
+    """
+
+    __slots__ = ('_engine', '_offset', '_written')
+
+    def __init__(self, engine: 'PLCEngine', offset: int, values: Sequence[Any]):
+        super().__init__(values)
+        self._engine = engine
+        self._offset = offset
+        self._written: Set[int] = set()
+
+    # ---- reads ----
+    def _read(self, index: int):
+        if index not in self._written:
+            self._engine._log.append(self._offset + index)
+
+    def _read_all(self):
+        if self._engine._tracing:
+            for i in range(len(self)):
+                self._read(i)
+
+    def __getitem__(self, key):
+        if self._engine._tracing:
+            if isinstance(key, slice):
+                for i in range(*key.indices(len(self))):
+                    self._read(i)
+            else:
+                i = key if key >= 0 else key + len(self)
+                if 0 <= i < len(self):
+                    self._read(i)
+        return list.__getitem__(self, key)
+
+    def __iter__(self):
+        self._read_all()
+        return list.__iter__(self)
+
+    def __reversed__(self):
+        self._read_all()
+        return list.__reversed__(self)
+
+    def __contains__(self, value):
+        self._read_all()
+        return list.__contains__(self, value)
+
+    def index(self, *args):
+        self._read_all()
+        return list.index(self, *args)
+
+    def count(self, value):
+        self._read_all()
+        return list.count(self, value)
+
+    def copy(self):
+        self._read_all()
+        return list(list.__iter__(self))
+
+    def __eq__(self, other):
+        self._read_all()
+        return list.__eq__(self, other)
+
+    def __ne__(self, other):
+        self._read_all()
+        return list.__ne__(self, other)
+
+    def __add__(self, other):
+        self._read_all()
+        return list.__add__(self, other)
+
+    def __mul__(self, n):
+        self._read_all()
+        return list.__mul__(self, n)
+
+    __rmul__ = __mul__
+    __hash__ = None
+
+    # ---- writes ----
+    def _write(self, index: int):
+        self._written.add(index)
+        self._engine._writes[self._offset + index] = len(self._engine._log)
+
+    def __setitem__(self, key, value):
+        if self._engine._tracing:
+            if isinstance(key, slice):
+                indices = range(*key.indices(len(self)))
+                value = list(value)
+                if key.step not in (None, 1) or len(value) != len(indices):
+                    self._engine._opaque = True
+                for i in indices:
+                    self._write(i)
+            else:
+                i = key if key >= 0 else key + len(self)
+                if 0 <= i < len(self):
+                    self._write(i)
+        list.__setitem__(self, key, value)
+
+    def _resized(self, method, *args):
+        if self._engine._tracing:
+            self._engine._opaque = True
+        return method(self, *args)
+
+    def __delitem__(self, key):
+        return self._resized(list.__delitem__, key)
+
+    def __iadd__(self, other):
+        return self._resized(list.__iadd__, other)
+
+    def __imul__(self, n):
+        return self._resized(list.__imul__, n)
+
+    def append(self, value):
+        return self._resized(list.append, value)
+
+    def extend(self, values):
+        return self._resized(list.extend, values)
+
+    def insert(self, index, value):
+        return self._resized(list.insert, index, value)
+
+    def pop(self, *args):
+        return self._resized(list.pop, *args)
+
+    def remove(self, value):
+        return self._resized(list.remove, value)
+
+    def clear(self):
+        return self._resized(list.clear)
+
+    def sort(self, *args, **kwargs):
+        if self._engine._tracing:
+            self._engine._opaque = True
+        return list.sort(self, *args, **kwargs)
+
+    def reverse(self):
+        return self._resized(list.reverse)
+
+
+class _Path:
+    """Read set of one path through plc_logic, and how to check it.
+
+    `key(inputs)` takes the lengths of the input arrays and the values of
+    the watched slots, with one itemgetter call per array. Inputs with the
+    same key take the same path, and checking that costs O(watched slots)
+    in C, however large the territory.
+    """
+
+    __slots__ = ('watched', '_getters')
+
+    def __init__(self, watched: FrozenSet[int], offsets: Sequence[int],
+                 sizes: Sequence[int]):
+        self.watched = watched
+        flat = sorted(watched)
+        getters = []
+        for array, (offset, size) in enumerate(zip(offsets, sizes)):
+            lo = bisect_left(flat, offset)
+            hi = bisect_left(flat, offset + size, lo)
+            if lo < hi:
+                getters.append(
+                    (array, itemgetter(*(i - offset for i in flat[lo:hi]))))
+        self._getters = tuple(getters)
+
+    def key(self, inputs: Sequence[List[Any]]) -> Tuple[Any, ...]:
+        try:
+            return (tuple(map(len, inputs)),) + tuple(
+                get(inputs[array]) for array, get in self._getters)
+        except IndexError:      # an array shrank; can't be the same path
+            return ()
+
+
+class PLCEngine:
+    """Runs a wayside plc_logic() program over persistent input arrays.
+
+    The controller writes the current state into `inputs` (one list per
+    plc_logic argument, allocated once) and calls `run()`, which returns
+    the outputs. plc_logic always gets copies, so `inputs` keep what the
+    controller wrote.
+
+    A traced run also records which input slots the program read (its
+    path); if none of those changed by the next call, the program would
+    take the same path, so `run()` returns the previous outputs without
+    calling it. Slots of a returned array that the program didn't write
+    pass the input straight through, so they are watched too.
+
+    Tracing costs about TRACE_COST plain calls and only pays off through
+    the calls it lets `run()` skip. Other runs call plc_logic on plain
+    copies of the inputs. A miss is traced only if the last traced path
+    saved at least TRACE_COST calls. Otherwise the engine probes with one
+    traced run after PROBE_INTERVAL misses, doubling the interval (up to
+    MAX_PROBE_INTERVAL) while probes don't pay. The check for each
+    distinct path is built once and cached.
+
+    plc_logic must be a pure function of its six arguments (no clocks,
+    randomness or module-level state it mutates), which is what the PLC
+    files in this repo are. Programs that resize their arrays or mutate
+    them in ways the tracer can't follow are never traced again.
+    """
+
+    TRACE_COST = 8
+    PROBE_INTERVAL = 256
+    MAX_PROBE_INTERVAL = 8192
+    MAX_PATHS = 256
+
+    def __init__(self, plc_logic: Callable[..., Sequence[Sequence[Any]]],
+                 *initial_inputs: Sequence[Any]):
+        """Build the engine and its arrays.
+
+            Args:
+                plc_logic: The PLC program's plc_logic function.
+                *initial_inputs: Initial contents of the six plc_logic
+                    arguments, in call order. Their lengths fix `sizes`.
+        """
+        if len(initial_inputs) != len(PLC_ARRAYS):
+            raise ValueError(
+                f"plc_logic takes {len(PLC_ARRAYS)} arrays, "
+                f"got {len(initial_inputs)}")
+        self.plc_logic = plc_logic
+        self.inputs: Tuple[List[Any], ...] = tuple(
+            list(values) for values in initial_inputs)
+        self.sizes: Tuple[int, ...] = tuple(len(v) for v in self.inputs)
+        self.outputs: Tuple[Sequence[Any], ...] = ([], [], [], [])
+        self.runs = 0
+        self.traced = 0
+        self.skipped = 0
+
+        self._offsets: List[int] = []
+        total = 0
+        for size in self.sizes:
+            self._offsets.append(total)
+            total += size
+        # path of the last run and the key it was taken with (None once an
+        # untraced run may have taken another one)
+        self._path: Optional[_Path] = None
+        self._path_key: Tuple[Any, ...] = ()
+        self._paths: Dict[FrozenSet[int], _Path] = {}
+        self._saved = 0             # calls skipped on the last traced path
+        self._plain_misses = 0      # untraced runs since the last traced one
+        self._probe_interval = self.PROBE_INTERVAL
+        self._traceable = True
+        # log of the last traced run, for read_set() and dependencies()
+        self._reads: Optional[FrozenSet[int]] = None
+        self._log: List[int] = []
+        self._writes: Dict[int, int] = {}
+        self._tracing = False
+        self._opaque = False
+        self._work = tuple(_TracedList(self, offset, values)
+                           for offset, values in zip(self._offsets, self.inputs))
+
+    def invalidate(self) -> None:
+        """Forget the last run so the next `run()` calls plc_logic."""
+        self._path = None
+
+    def run(self) -> Tuple[Sequence[Any], ...]:
+        """Evaluate the program on the current `inputs`.
+
+            Returns:
+                (switch_positions, light_signals, crossing_signals, stop) as
+                plc_logic returned them; the same tuple as the last run's
+                when the run was skipped.
+        """
+        path = self._path
+        if path is not None and path.key(self.inputs) == self._path_key:
+            self.skipped += 1
+            self._saved += 1
+            return self.outputs
+
+        self.runs += 1
+        if self._trace_next():
+            # the work lists are refilled by the next traced run
+            result = self._run_traced()
+            self.outputs = tuple(list(values) for values in result)
+        else:
+            self._path = None
+            self._plain_misses += 1
+            self.outputs = tuple(
+                self.plc_logic(*(list(values) for values in self.inputs)))
+        return self.outputs
+
+    def _trace_next(self) -> bool:
+        if not self._traceable:
+            return False
+        if self.traced == 0 or self._saved >= self.TRACE_COST:
+            self._probe_interval = self.PROBE_INTERVAL
+            return True
+        if self._plain_misses >= self._probe_interval:
+            # back off while probes keep showing tracing doesn't pay
+            self._probe_interval = min(2 * self._probe_interval,
+                                       self.MAX_PROBE_INTERVAL)
+            return True
+        return False
+
+    def _run_traced(self) -> Sequence[Sequence[Any]]:
+        for work, values in zip(self._work, self.inputs):
+            work._written.clear()
+            list.__setitem__(work, slice(None), values)
+        self._log = []
+        self._writes = {}
+        self._opaque = False
+        self._tracing = True
+        try:
+            result = self.plc_logic(*self._work)
+        finally:
+            self._tracing = False
+        self.traced += 1
+        self._saved = 0
+        self._plain_misses = 0
+
+        if self._opaque:
+            self._traceable = False
+            self._path = None
+            self._reads = None
+            return result
+        self._reads = frozenset(self._log)
+        watched = self._reads | self._passthrough_slots(result)
+        path = self._paths.get(watched)
+        if path is None:
+            if len(self._paths) >= self.MAX_PATHS:
+                self._paths.clear()
+            path = self._paths[watched] = _Path(
+                watched, self._offsets, self.sizes)
+        self._path = path
+        self._path_key = path.key(self.inputs)
+        return result
+
+    def dependencies(self) -> Dict[Slot, FrozenSet[Slot]]:
+        """Input slots read before each output slot's final write.
+
+        Built on request from the last traced run, for inspection only;
+        empty if no run could be traced.
+        """
+        if self._reads is None:
+            return {}
+        log = self._log
+        return {self._slot(out): frozenset(self._slot(i) for i in log[:pos])
+                for out, pos in self._writes.items()}
+
+    def read_set(self) -> FrozenSet[Slot]:
+        """Every input slot the last traced run read."""
+        if self._reads is None:
+            return frozenset()
+        return frozenset(self._slot(i) for i in self._reads)
+
+    def _passthrough_slots(self, result: Sequence[Sequence[Any]]) -> Set[int]:
+        # an input array handed back as an output carries its unwritten
+        # slots through unchanged, so those behave like reads
+        slots: Set[int] = set()
+        for values in result:
+            for work in self._work:
+                if values is work:
+                    unwritten = set(range(len(work))) - work._written
+                    slots.update(work._offset + i for i in unwritten)
+        return slots
+
+    def _slot(self, flat: int) -> Slot:
+        for name, offset, size in zip(PLC_ARRAYS, self._offsets, self.sizes):
+            if flat < offset + size:
+                return name, flat - offset
+        raise IndexError(flat)
@@ -0,0 +1,86 @@
+# universal/refresh_bus.py
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class RefreshDispatcher:
+    """Coalesces UI refresh requests into one repaint per frame.
+
+    Backends notify listeners from whatever thread changed them (the
+    wayside polling threads, the clock, CTC pushes). Instead of redrawing
+    there, a UI marks its refresh callback dirty; the dispatcher runs each
+    dirty callback once per frame on the Qt thread, at most `max_fps`
+    times a second. Without Qt (tests, headless runs) callers can `flush()`
+    themselves.
+    """
+
+    def __init__(self, max_fps: float = 30.0):
+        self.max_fps = float(max_fps)
+        self._lock = threading.Lock()
+        self._dirty: Dict[Callable[[], None], None] = {}   # ordered set
+        self._listeners: Dict[Callable[[], None], Callable[[], None]] = {}
+        self._timer = None
+
+    # ---- producer side (any thread) ----
+    def mark_dirty(self, refresh: Callable[[], None]):
+        """Schedule `refresh()` for the next frame. Safe from any thread."""
+        with self._lock:
+            self._dirty[refresh] = None
+
+    def listener(self, refresh: Callable[[], None]) -> Callable[..., None]:
+        """Callback for `backend.add_listener` / `clock.register_listener`.
+
+        The returned wrapper ignores its arguments and marks `refresh` dirty.
+        The same wrapper is returned for the same refresh callable, so
+        backends that de-duplicate listeners keep working.
+        """
+        with self._lock:
+            wrapper = self._listeners.get(refresh)
+            if wrapper is None:
+                def wrapper(*_args, refresh=refresh):
+                    self.mark_dirty(refresh)
+                self._listeners[refresh] = wrapper
+            return wrapper
+
+    # ---- consumer side (UI thread) ----
+    def flush(self) -> int:
+        """Run every dirty refresh callback once. Returns how many ran."""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            pending: List[Callable[[], None]] = list(self._dirty)
+            self._dirty.clear()
+        for refresh in pending:
+            try:
+                refresh()
+            except Exception as e:
+                print(f"[RefreshBus] refresh error in {refresh!r}: {e}")
+        return len(pending)
+
+    def set_max_fps(self, max_fps: float):
+        """Change the repaint cap; applies to a running Qt timer immediately."""
+        if max_fps <= 0:
+            raise ValueError("max_fps must be > 0")
+        self.max_fps = float(max_fps)
+        if self._timer is not None:
+            self._timer.setInterval(self._interval_ms())
+
+    def start(self, parent: Optional[object] = None):
+        """Start the per-frame flush timer on the calling (Qt) thread.
+
+        Call once the QApplication exists; later calls are no-ops. PyQt6 is
+        imported here so headless users of the dispatcher don't need it.
+        """
+        if self._timer is not None:
+            return
+        from PyQt6.QtCore import QTimer
+        self._timer = QTimer(parent)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start(self._interval_ms())
+
+    def _interval_ms(self) -> int:
+        return max(1, int(round(1000.0 / self.max_fps)))
+
+
+# Shared singleton
+refresh_bus = RefreshDispatcher()
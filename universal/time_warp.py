@@ -0,0 +1,191 @@
+# universal/time_warp.py
+import threading
+import time
+from typing import Callable, List, Optional
+
+from universal.global_clock import GlobalClock, clock
+
+
+class TimeWarpEngine:
+    """Runs the simulation on a worker thread at a requested time warp.
+
+    Every wall-clock frame the engine works out how many fixed steps are
+    owed (warp × elapsed wall time ÷ tick_interval) and calls `step` that
+    many times, so sim time advances at the warp no matter how often the UI
+    repaints. The warp is read from `clock.time_multiplier` each frame, so
+    `clock.set_speed()` keeps working as the speed control.
+
+    Each step runs with `lock` held. Code on other threads that reads or
+    changes simulation state (UI refreshes, dispatch buttons) takes the
+    same lock; it is released between steps, so the UI waits at most one
+    step. Listeners added with `add_frame_listener` run on the worker
+    after every frame that stepped; hook them to the refresh bus rather
+    than touching widgets directly.
+
+    If steps take longer than the warp allows, at most
+    `max_steps_per_frame` are run per frame and the rest of the backlog is
+    dropped instead of snowballing. `achieved_warp` reports what was
+    actually reached over roughly the last second.
+    """
+
+    def __init__(self, step: Callable[[], object],
+                 sim_clock: Optional[GlobalClock] = None,
+                 frame_s: float = 1.0 / 60.0,
+                 max_steps_per_frame: int = 1000):
+        """Set up the engine; call start() to begin stepping.
+
+        Args:
+            step: Advances the simulation by one tick of
+                `sim_clock.tick_interval` seconds, e.g.
+                TrackState.tick_all_modules.
+            sim_clock: Clock providing the warp and tick length
+                (defaults to the shared clock).
+            frame_s: Wall-clock seconds per worker frame.
+            max_steps_per_frame: Cap on steps run in one frame.
+        """
+        if frame_s <= 0:
+            raise ValueError("frame_s must be > 0")
+        if max_steps_per_frame < 1:
+            raise ValueError("max_steps_per_frame must be >= 1")
+        self.step = step
+        self.clock = sim_clock if sim_clock is not None else clock
+        self.frame_s = float(frame_s)
+        self.max_steps_per_frame = int(max_steps_per_frame)
+        self.lock = threading.RLock()
+
+        self.steps = 0
+        self.sim_seconds = 0.0
+        self.dropped_sim_seconds = 0.0
+        self.achieved_warp = 0.0
+
+        self._owed = 0.0                # steps owed, fractional
+        self._window_wall = 0.0
+        self._window_sim = 0.0
+        self._paused = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._frame_listeners: List[Callable[[], None]] = []
+
+    # ---- control (any thread) ----
+    @property
+    def requested_warp(self) -> float:
+        return max(0.0, float(self.clock.time_multiplier))
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def set_warp(self, multiplier: float):
+        """Same as clock.set_speed(); takes effect on the next frame."""
+        self.clock.set_speed(multiplier)
+        self._wake.set()
+
+    def pause(self):
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        self._wake.set()
+
+    def add_frame_listener(self, callback: Callable[[], None]):
+        """Call `callback()` on the worker after every frame that stepped."""
+        if callback not in self._frame_listeners:
+            self._frame_listeners.append(callback)
+
+    def start(self):
+        """Start the worker thread. Later calls are no-ops."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="TimeWarpEngine",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the worker thread and wait for the current frame to finish."""
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        """Requested vs achieved warp and step counters."""
+        return {
+            "requested_warp": self.requested_warp,
+            "achieved_warp": self.achieved_warp,
+            "steps": self.steps,
+            "sim_seconds": self.sim_seconds,
+            "dropped_sim_seconds": self.dropped_sim_seconds,
+        }
+
+    # ---- worker ----
+    def run_frame(self, wall_dt: float) -> int:
+        """Advance the simulation for `wall_dt` seconds of wall time.
+
+        Called by the worker thread each frame; tests and headless runs can
+        call it directly instead of start().
+
+        Returns:
+            Number of steps run.
+        """
+        step_sim_s = self.clock.tick_interval
+        if self._paused or step_sim_s <= 0:
+            self._owed = 0.0
+            self._record(wall_dt, 0.0)
+            return 0
+
+        self._owed += wall_dt * self.requested_warp / step_sim_s
+        todo = min(int(self._owed), self.max_steps_per_frame)
+        self._owed -= todo
+        deadline = time.perf_counter() + max(wall_dt, self.frame_s)
+
+        done = 0
+        while done < todo:
+            with self.lock:
+                self.step()
+            done += 1
+            if time.perf_counter() > deadline:
+                break
+
+        backlog = self._owed + (todo - done)
+        if backlog >= 1.0:
+            # fell behind: drop whole steps instead of carrying them forward
+            lost = int(backlog)
+            self.dropped_sim_seconds += lost * step_sim_s
+            backlog -= lost
+        self._owed = backlog
+
+        self.steps += done
+        self.sim_seconds += done * step_sim_s
+        self._record(wall_dt, done * step_sim_s)
+        if done:
+            for cb in list(self._frame_listeners):
+                try:
+                    cb()
+                except Exception as e:
+                    print(f"[TimeWarp] frame listener error: {e}")
+        return done
+
+    def _record(self, wall_dt: float, sim_dt: float):
+        self._window_wall += wall_dt
+        self._window_sim += sim_dt
+        if self._window_wall >= 1.0:
+            self.achieved_warp = self._window_sim / self._window_wall
+            self._window_wall = 0.0
+            self._window_sim = 0.0
+
+    def _run(self):
+        last = time.perf_counter()
+        while self._running:
+            now = time.perf_counter()
+            try:
+                self.run_frame(now - last)
+            except Exception as e:
+                print(f"[TimeWarp] step error: {e}")
+            last = now
+            spare = self.frame_s - (time.perf_counter() - now)
+            if spare > 0:
+                self._wake.wait(spare)
+                self._wake.clear()